@@ -0,0 +1,589 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from praf.config.defaults import Defaults
+from praf.domain import (
+    COMPILED_LIBRARY,
+    INDICATOR_LIBRARY,
+    Activity,
+    CompiledLibrary,
+    Context,
+    ProjectStage,
+    RiskPattern,
+    UserRisk,
+    activity_domain_weights,
+    compile_library,
+    suggest_pattern_from_text,
+    suggest_patterns,
+)
+from praf.domain.risk_patterns import PATTERN_KEYWORDS
+from praf.engine.aggregator import aggregate_scores, aggregate_scores_batch
+from praf.engine.classifier import classify_domains
+from praf.engine.explainability import explain, explain_batch
+from praf.engine.guidance import STAGES, generate_guidance, generate_guidance_batch, register_columns
+from praf.engine.scorer import build_batch_inputs, score_indicators, score_indicators_batch
+from praf.io.reports import build_report
+from praf.io.store import score_records
+
+
+BENCH_FORMAT = "praf.bench/v1"
+
+# Scales per preset. "full" is the complete matrix; "quick" keeps every case
+# but drops the largest scale so a run takes seconds, not minutes.
+PRESETS: Dict[str, Dict[str, Tuple[int, ...]]] = {
+    "quick": {"assessments": (1, 1_000), "indicators": (12, 1_000), "risks": (10, 1_000)},
+    "full": {"assessments": (1, 1_000, 100_000), "indicators": (12, 1_000, 10_000), "risks": (10, 1_000, 100_000)},
+}
+
+# Allowed relative change before a metric counts as a regression.
+DEFAULT_TOLERANCES: Dict[str, float] = {"throughput": 0.10, "p99_ms": 0.50, "peak_bytes": 0.25}
+
+# Cases timed fewer times than this on either side have no meaningful p99
+# (it is one of the few slowest samples), so their p99 is not compared.
+MIN_OPS_FOR_P99 = 100
+
+# Peak memory differences below this are allocator noise, never a regression.
+MEMORY_NOISE_BYTES = 64 * 1024
+
+# Batch inputs hold at most this many cells (assessments x indicators).
+_MAX_CELLS = 1_000_000
+
+# Large inputs repeat a pool of distinct assessments and texts instead of
+# building every one, which keeps setup time and memory bounded.
+_POOL = 1_000
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """One benchmark: ``setup()`` builds the inputs untimed and returns the callable to time.
+
+    Each call of that callable processes ``items`` assessments, risks or texts.
+    """
+
+    name: str
+    stage: str
+    params: Mapping[str, int]
+    items: int
+    setup: Callable[[], Callable[[], Any]]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{','.join(f'{k}={v}' for k, v in self.params.items())}]"
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    key: str
+    name: str
+    stage: str
+    params: Dict[str, int]
+    items: int
+    ops: int
+    throughput: float
+    latency_ms: Dict[str, float]
+    peak_bytes: int
+
+    @classmethod
+    def from_json(cls, raw: Mapping[str, Any]) -> "BenchResult":
+        return cls(**{k: raw[k] for k in cls.__dataclass_fields__})
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+    tolerance: float
+
+    @property
+    def change(self) -> float:
+        """Relative change, positive when the metric got worse."""
+        if self.metric == "throughput":
+            return 1.0 - self.current / self.baseline
+        return self.current / self.baseline - 1.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.key}: {self.metric} {self.baseline:.4g} -> {self.current:.4g} "
+            f"({self.change:+.1%}, tolerance {self.tolerance:.0%})"
+        )
+
+
+@dataclass(frozen=True)
+class BenchReport:
+    results: List[BenchResult]
+    preset: str
+    environment: Dict[str, str] = field(default_factory=dict)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "format": BENCH_FORMAT,
+            "preset": self.preset,
+            "environment": self.environment,
+            "results": [asdict(r) for r in self.results],
+        }
+
+    @classmethod
+    def from_json(cls, raw: Mapping[str, Any]) -> "BenchReport":
+        if raw.get("format") != BENCH_FORMAT:
+            raise ValueError(f"not a {BENCH_FORMAT} result file")
+        return cls(
+            results=[BenchResult.from_json(r) for r in raw["results"]],
+            preset=raw.get("preset", ""),
+            environment=dict(raw.get("environment", {})),
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "BenchReport":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_json(json.load(f))
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+# -- inputs -------------------------------------------------------------------
+
+
+_LIBRARIES: Dict[int, CompiledLibrary] = {len(INDICATOR_LIBRARY): COMPILED_LIBRARY}
+
+
+def synthetic_library(n_indicators: int) -> CompiledLibrary:
+    """The default library for 12 indicators, otherwise its indicators cycled under new ids."""
+    lib = _LIBRARIES.get(n_indicators)
+    if lib is None:
+        base = list(INDICATOR_LIBRARY.values())
+        indicators = {}
+        for n in range(n_indicators):
+            indicator_id = f"S{n:05d}"
+            indicators[indicator_id] = replace(base[n % len(base)], indicator_id=indicator_id)
+        lib = _LIBRARIES[n_indicators] = compile_library(indicators)
+    return lib
+
+
+_ANSWERS = {"yes_no": ("yes", "no", "partial"), "low_med_high": ("low", "medium", "high"), "scale_1_5": (1, 2, 3, 4, 5)}
+
+
+def _assessment_dicts(lib: CompiledLibrary, n: int, seed: int = 0) -> List[Tuple[Dict[str, Any], ...]]:
+    """``n`` input tuples ``(responses, likelihood, impact, detectability)`` drawn from a pool of distinct ones."""
+    rng = np.random.default_rng(seed)
+    pool = []
+    for _ in range(min(n, _POOL)):
+        responses = {}
+        for entry in lib.entries:
+            answers = _ANSWERS.get(entry.answer_type, _ANSWERS["scale_1_5"])
+            responses[entry.indicator_id] = answers[int(rng.integers(len(answers)))]
+        lid = [dict(zip(lib.indicator_ids, rng.integers(1, 6, len(lib)).tolist())) for _ in range(3)]
+        pool.append((responses, *lid))
+    return [pool[k % len(pool)] for k in range(n)]
+
+
+def _batch_arrays(lib: CompiledLibrary, n: int, seed: int = 0) -> Tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(seed)
+    return tuple(rng.integers(1, 6, (n, len(lib))).astype(np.float64) for _ in range(4))
+
+
+def _register(n: int, seed: int = 0) -> List[UserRisk]:
+    rng = np.random.default_rng(seed)
+    patterns = list(RiskPattern) + [None]
+    lid = rng.integers(1, 6, (n, 3)).tolist()
+    choice = rng.integers(len(patterns), size=n).tolist()
+    return [
+        UserRisk(risk_id=f"R{k}", description="", owner="", likelihood=l, impact=i, detectability=d, pattern=patterns[p])
+        for k, ((l, i, d), p) in enumerate(zip(lid, choice))
+    ]
+
+
+def _texts(n: int, seed: int = 0) -> List[str]:
+    """Risk descriptions mixing pattern keywords with filler words, as free text tends to."""
+    rng = np.random.default_rng(seed)
+    keywords = [k for _, group in PATTERN_KEYWORDS for k in group]
+    filler = ("the", "team", "expects", "delays", "because", "of", "unclear", "scope", "and", "limited", "budget")
+    pool = []
+    for _ in range(min(n, _POOL)):
+        words = [filler[int(i)] for i in rng.integers(len(filler), size=int(rng.integers(6, 20)))]
+        if rng.random() < 0.8:
+            words.insert(int(rng.integers(len(words))), keywords[int(rng.integers(len(keywords)))])
+        pool.append(" ".join(words).capitalize())
+    return [pool[k % len(pool)] for k in range(n)]
+
+
+def _batch_shapes(scales: Mapping[str, Sequence[int]]) -> List[Tuple[int, int]]:
+    """``(assessments, indicators)`` pairs for the vectorised stages, capped at ``_MAX_CELLS``."""
+    shapes = [(n, len(INDICATOR_LIBRARY)) for n in scales["assessments"] if n > 1]
+    shapes += [(min(1_000, _MAX_CELLS // k), k) for k in scales["indicators"] if k > len(INDICATOR_LIBRARY)]
+    return shapes
+
+
+# -- cases --------------------------------------------------------------------
+
+
+def _scalar_cases(k: int) -> Iterator[BenchCase]:
+    """Single-assessment stages on a ``k``-indicator library."""
+    params = {"assessments": 1, "indicators": k}
+    weights = activity_domain_weights(Activity.PRODUCT_DESIGN)
+    defaults = Defaults()
+
+    def scored():
+        lib = synthetic_library(k)
+        inputs = _assessment_dicts(lib, 1)[0]
+        return lib, inputs, score_indicators(*inputs, weights, library=lib)
+
+    def score():
+        lib, inputs, _ = scored()
+        return lambda: score_indicators(*inputs, weights, library=lib)
+
+    def aggregate():
+        lib, _, result = scored()
+        return lambda: aggregate_scores(result.indicator_details, result.local_scores, library=lib)
+
+    def explain_one():
+        lib, _, result = scored()
+        aggregated = aggregate_scores(result.indicator_details, result.local_scores, library=lib)
+        classes = classify_domains(aggregated.domain_scores, defaults.low_threshold, defaults.high_threshold)
+        return lambda: explain(classes, result.indicator_details, result.local_scores, top_n=5, library=lib)
+
+    yield BenchCase("score_indicators", "score", params, 1, score)
+    yield BenchCase("aggregate_scores", "aggregate", params, 1, aggregate)
+    yield BenchCase("explain", "explain", params, 1, explain_one)
+
+
+def _batch_cases(n: int, k: int) -> Iterator[BenchCase]:
+    """Vectorised stages over ``n`` assessments on a ``k``-indicator library."""
+    params = {"assessments": n, "indicators": k}
+    weights = activity_domain_weights(Activity.PRODUCT_DESIGN)
+    defaults = Defaults()
+
+    def scored():
+        lib = synthetic_library(k)
+        arrays = _batch_arrays(lib, n)
+        return lib, arrays, score_indicators_batch(*arrays, weights, library=lib)
+
+    def encode():
+        lib = synthetic_library(k)
+        sections = list(zip(*_assessment_dicts(lib, n)))
+        return lambda: build_batch_inputs(*sections, library=lib)
+
+    def score():
+        lib, arrays, _ = scored()
+        return lambda: score_indicators_batch(*arrays, weights, library=lib)
+
+    def aggregate():
+        lib, _, result = scored()
+        return lambda: aggregate_scores_batch(result, library=lib)
+
+    def explain_many():
+        lib, _, result = scored()
+        return lambda: explain_batch(result.contributions, top_n=5, library=lib)
+
+    def pipeline():
+        lib, arrays, _ = scored()
+        activities, stages = [Activity.PRODUCT_DESIGN] * n, [ProjectStage.DESIGN] * n
+
+        def run():
+            result = score_indicators_batch(*arrays, weights, library=lib)
+            return score_records(result, activities, stages, defaults.low_threshold, defaults.high_threshold, library=lib)
+
+        return run
+
+    # Wide libraries would need millions of per-answer dict entries to encode.
+    if n * k <= _MAX_CELLS // 4 or k == len(INDICATOR_LIBRARY):
+        yield BenchCase("build_batch_inputs", "encode", params, n, encode)
+    yield BenchCase("score_indicators_batch", "score", params, n, score)
+    yield BenchCase("aggregate_scores_batch", "aggregate", params, n, aggregate)
+    yield BenchCase("explain_batch", "explain", params, n, explain_many)
+    yield BenchCase("batch_pipeline", "pipeline", params, n, pipeline)
+
+
+def _guidance_cases(n: int) -> Iterator[BenchCase]:
+    params = {"risks": n}
+    ctx = Context(Activity.PRODUCT_DESIGN, ProjectStage.DESIGN)
+
+    def scalar():
+        risks = _register(n)
+        return lambda: generate_guidance(ctx, risks)
+
+    def batch():
+        columns = register_columns(_register(n))
+        stage = np.int16(STAGES.index(ctx.stage))
+        return lambda: generate_guidance_batch(*columns, stage)
+
+    yield BenchCase("generate_guidance", "guidance", params, n, scalar)
+    yield BenchCase("generate_guidance_batch", "guidance", params, n, batch)
+
+
+def _pattern_cases(n: int) -> Iterator[BenchCase]:
+    params = {"texts": n}
+
+    def one_by_one():
+        texts = _texts(n)
+        return lambda: [suggest_pattern_from_text(t) for t in texts]
+
+    def batch():
+        texts = _texts(n)
+        return lambda: suggest_patterns(texts)
+
+    yield BenchCase("suggest_pattern_from_text", "patterns", params, n, one_by_one)
+    yield BenchCase("suggest_patterns", "patterns", params, n, batch)
+
+
+def _cli_cases(n: int) -> Iterator[BenchCase]:
+    """The ``praf`` report path: one ``build_report``, and ``praf batch`` over ``n`` JSONL lines."""
+    from praf.cli.batch import iter_results
+
+    defaults = Defaults()
+    params = {"assessments": n}
+
+    def report():
+        inputs = _assessment_dicts(COMPILED_LIBRARY, 1)[0]
+        ctx = Context(Activity.PRODUCT_DESIGN, ProjectStage.DESIGN)
+        return lambda: build_report(ctx, *inputs, defaults=defaults)
+
+    def batch():
+        activities, stages = list(Activity), list(ProjectStage)
+        lines = []
+        for k, (responses, likelihood, impact, detectability) in enumerate(_assessment_dicts(COMPILED_LIBRARY, min(n, _POOL))):
+            payload = {
+                "context": {"activity": activities[k % len(activities)].value, "stage": stages[k % len(stages)].value},
+                "responses": responses,
+                "likelihood": likelihood,
+                "impact": impact,
+                "detectability": detectability,
+            }
+            lines.append(json.dumps(payload))
+        numbered = [(k + 1, lines[k % len(lines)]) for k in range(n)]
+        return lambda: sum(1 for _ in iter_results(numbered, defaults))
+
+    if n == 1:
+        yield BenchCase("build_report", "pipeline", params, 1, report)
+    yield BenchCase("cli_batch", "pipeline", params, n, batch)
+
+
+def build_cases(preset: str = "quick") -> List[BenchCase]:
+    try:
+        scales = PRESETS[preset]
+    except KeyError:
+        raise ValueError(f"unknown preset {preset!r}; choose from {sorted(PRESETS)}") from None
+    cases: List[BenchCase] = []
+    for k in scales["indicators"]:
+        cases.extend(_scalar_cases(k))
+    for n, k in _batch_shapes(scales):
+        cases.extend(_batch_cases(n, k))
+    for n in scales["risks"]:
+        cases.extend(_guidance_cases(n))
+        cases.extend(_pattern_cases(n))
+    for n in scales["assessments"]:
+        cases.extend(_cli_cases(n))
+    return cases
+
+
+# -- measurement --------------------------------------------------------------
+
+
+def _peak_bytes(run: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return int(peak)
+
+
+def measure(
+    case: BenchCase,
+    min_time: float = 0.5,
+    min_ops: int = 5,
+    max_ops: int = 100_000,
+    max_time: Optional[float] = None,
+) -> BenchResult:
+    """Time ``case`` until ``min_time`` seconds and ``min_ops`` calls are reached.
+
+    Once the calls total more than ``max_time`` (default ``10 * min_time``,
+    at least one second) the loop ends early, so the largest scales are
+    timed once or twice. The ``tracemalloc`` pass that records peak memory
+    runs first and doubles as the warm-up; timing runs without tracing.
+    """
+    run = case.setup()
+    peak = _peak_bytes(run)
+    limit = max_time if max_time is not None else max(10 * min_time, 1.0)
+    times: List[float] = []
+    total = 0.0
+    while len(times) < max_ops and (total < min_time or len(times) < min_ops) and (total < limit or not times):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        times.append(elapsed)
+        total += elapsed
+    samples = np.array(times) * 1e3
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99]).tolist()
+    return BenchResult(
+        key=case.key,
+        name=case.name,
+        stage=case.stage,
+        params=dict(case.params),
+        items=case.items,
+        ops=len(times),
+        throughput=case.items * len(times) / total if total > 0 else float("inf"),
+        latency_ms={"p50": p50, "p90": p90, "p99": p99},
+        peak_bytes=peak,
+    )
+
+
+def run_benchmarks(
+    preset: str = "quick",
+    select: Optional[Sequence[str]] = None,
+    min_time: float = 0.5,
+    min_ops: int = 5,
+    progress: Optional[Callable[[BenchResult], None]] = None,
+) -> BenchReport:
+    """Measure every case of ``preset`` whose key contains one of ``select`` (all when omitted)."""
+    results = []
+    for case in build_cases(preset):
+        if select and not any(s in case.key for s in select):
+            continue
+        result = measure(case, min_time=min_time, min_ops=min_ops)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return BenchReport(results=results, preset=preset, environment=environment())
+
+
+def compare(
+    current: BenchReport,
+    baseline: BenchReport,
+    tolerances: Optional[Mapping[str, float]] = None,
+) -> List[Regression]:
+    """Cases that got worse than ``baseline`` by more than their tolerance.
+
+    ``tolerances`` maps ``throughput``, ``p99_ms`` and ``peak_bytes`` to the
+    allowed relative change and overrides ``DEFAULT_TOLERANCES``; cases
+    missing from either report are skipped, and so is the p99 check of cases
+    with fewer than ``MIN_OPS_FOR_P99`` timed runs on either side.
+    """
+    limits = dict(DEFAULT_TOLERANCES)
+    if tolerances:
+        unknown = set(tolerances).difference(limits)
+        if unknown:
+            raise ValueError(f"unknown tolerance metric(s): {', '.join(sorted(unknown))}")
+        limits.update(tolerances)
+    previous = {r.key: r for r in baseline.results}
+    regressions: List[Regression] = []
+    for result in current.results:
+        base = previous.get(result.key)
+        if base is None:
+            continue
+        tol = limits["throughput"]
+        if result.throughput < base.throughput * (1.0 - tol):
+            regressions.append(Regression(result.key, "throughput", base.throughput, result.throughput, tol))
+        tol = limits["p99_ms"]
+        sampled = min(result.ops, base.ops) >= MIN_OPS_FOR_P99
+        if sampled and result.latency_ms["p99"] > base.latency_ms["p99"] * (1.0 + tol):
+            regressions.append(Regression(result.key, "p99_ms", base.latency_ms["p99"], result.latency_ms["p99"], tol))
+        tol = limits["peak_bytes"]
+        if result.peak_bytes > base.peak_bytes * (1.0 + tol) and result.peak_bytes - base.peak_bytes > MEMORY_NOISE_BYTES:
+            regressions.append(Regression(result.key, "peak_bytes", base.peak_bytes, result.peak_bytes, tol))
+    return regressions
+
+
+# -- CLI ----------------------------------------------------------------------
+
+
+def format_result(result: BenchResult) -> str:
+    return (
+        f"{result.key:<64} {result.throughput:>14,.0f} items/s  "
+        f"p50 {result.latency_ms['p50']:>10.3f} ms  p99 {result.latency_ms['p99']:>10.3f} ms  "
+        f"peak {result.peak_bytes / 1024:>10,.0f} KiB"
+    )
+
+
+def _tolerance(text: str) -> Tuple[str, float]:
+    metric, sep, value = text.partition("=")
+    if not sep or metric not in DEFAULT_TOLERANCES:
+        raise argparse.ArgumentTypeError(f"expected METRIC=FRACTION with METRIC in {', '.join(DEFAULT_TOLERANCES)}")
+    try:
+        return metric, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a number") from None
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="praf bench",
+        description="Benchmark every engine stage and the CLI pipeline; optionally compare against a baseline.",
+    )
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick", help="scales to run (default: quick)")
+    parser.add_argument(
+        "--filter",
+        action="append",
+        metavar="TEXT",
+        help="only run cases whose key contains TEXT, e.g. 'explain' or 'indicators=1000'; repeatable",
+    )
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to time each case for (default: 0.5)")
+    parser.add_argument("--output", metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved with --output")
+    parser.add_argument(
+        "--tolerance",
+        action="append",
+        type=_tolerance,
+        metavar="METRIC=FRACTION",
+        help="allowed relative regression per metric (defaults: "
+        + ", ".join(f"{k}={v}" for k, v in DEFAULT_TOLERANCES.items())
+        + "); repeatable",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.min_time < 0:
+        parser.error("--min-time must be >= 0")
+    baseline = BenchReport.load(args.baseline) if args.baseline else None
+
+    report = run_benchmarks(
+        args.preset,
+        select=args.filter,
+        min_time=args.min_time,
+        progress=lambda r: print(format_result(r), flush=True),
+    )
+    if args.output:
+        report.save(args.output)
+    if baseline is None:
+        return 0
+
+    regressions = compare(report, baseline, dict(args.tolerance or ()))
+    for regression in regressions:
+        sys.stderr.write(f"praf bench: regression in {regression}\n")
+    compared = len({r.key for r in baseline.results}.intersection(r.key for r in report.results))
+    sys.stderr.write(f"praf bench: {compared} case(s) compared, {len(regressions)} regression(s)\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import IO, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from praf.cli.report import report_from_payload
+from praf.config.defaults import Defaults
+from praf.io.cache import CacheStats, ResultCache, cached_report_json, open_disk_tier
+from praf.io.exporters import ReportStreamWriter
+from praf.io.loaders import decode_assessment
+from praf.io.reports import REPORT_BUILDERS
+
+
+def iter_lines(stream: IO[str]) -> Iterator[Tuple[int, str]]:
+    """Yield ``(line_number, line)`` for every non-blank line, one at a time."""
+    for line_no, line in enumerate(stream, start=1):
+        if line.strip():
+            yield line_no, line
+
+
+def process_line(
+    line_no: int,
+    line: str,
+    defaults: Defaults,
+    schema: str = "v1",
+    cache: Optional[ResultCache] = None,
+) -> Tuple[bool, str]:
+    """Score one JSONL record and return ``(ok, compact_json)``.
+
+    A record that cannot be decoded or scored produces an error object
+    (``{"line": n, "error": "..."}``) instead of raising, so one bad record
+    never aborts the run. With ``cache`` reports of previously seen
+    assessments are served from the result cache.
+    """
+    try:
+        payload = json.loads(line)
+        if cache is not None:
+            assessment = decode_assessment(payload)
+            text = cached_report_json(cache, assessment.context, *assessment.sections(), defaults, schema=schema)
+            return True, text
+        report = report_from_payload(payload, defaults, schema=schema)
+    except Exception as exc:
+        return False, json.dumps({"line": line_no, "error": f"{type(exc).__name__}: {exc}"}, ensure_ascii=False)
+    return True, json.dumps(report, ensure_ascii=False, separators=(",", ":"))
+
+
+def process_chunk(
+    chunk: List[Tuple[int, str]],
+    defaults: Defaults,
+    schema: str = "v1",
+    cache_path: Optional[str] = None,
+) -> Tuple[List[Tuple[bool, str]], Optional[CacheStats]]:
+    """Score a chunk in a worker process; with ``cache_path`` also return the chunk's cache lookups.
+
+    The worker opens the disk tier for the chunk only and closes it again, so
+    no connection outlives the task.
+    """
+    if cache_path is None:
+        return [process_line(line_no, line, defaults, schema) for line_no, line in chunk], None
+    with ResultCache(disk=open_disk_tier(cache_path)) as cache:
+        results = [process_line(line_no, line, defaults, schema, cache) for line_no, line in chunk]
+        return results, cache.stats
+
+
+def iter_chunks(lines: Iterable[Tuple[int, str]], chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    it = iter(lines)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_results(
+    lines: Iterable[Tuple[int, str]],
+    defaults: Defaults,
+    workers: int = 1,
+    chunk_size: int = 256,
+    schema: str = "v1",
+    cache: Optional[ResultCache] = None,
+) -> Iterator[Tuple[bool, str]]:
+    """Score ``lines`` and yield results in input order.
+
+    With ``workers > 1`` chunks of ``chunk_size`` records are scored in a
+    process pool. At most ``2 * workers`` chunks are in flight at once, so
+    reading the input stays lazy and memory is bounded by the chunk size, not
+    the input size. Workers share ``cache`` through its disk tier, which it
+    therefore needs; their hits and misses are added to ``cache.stats``.
+    """
+    if workers <= 1:
+        for line_no, line in lines:
+            yield process_line(line_no, line, defaults, schema, cache)
+        return
+
+    cache_path = None
+    if cache is not None:
+        cache_path = getattr(cache.disk, "path", None)
+        if cache_path is None:
+            raise ValueError("a cache shared with worker processes needs a disk tier")
+
+    def collect(future: Future) -> List[Tuple[bool, str]]:
+        results, stats = future.result()
+        if stats is not None:
+            cache.add_stats(stats)
+        return results
+
+    score = partial(process_chunk, defaults=defaults, schema=schema, cache_path=cache_path)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in iter_chunks(lines, chunk_size):
+            pending.append(pool.submit(score, chunk))
+            if len(pending) >= 2 * workers:
+                yield from collect(pending.popleft())
+        while pending:
+            yield from collect(pending.popleft())
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="praf batch",
+        description="Score newline-delimited assessments and stream one compact report per line.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL input file, or '-' for stdin (default)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes; 0 uses every core (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="records per worker task (default: 256)")
+    parser.add_argument(
+        "--schema",
+        choices=sorted(REPORT_BUILDERS),
+        default="v1",
+        help="report schema; v2 references the indicator library by fingerprint instead of embedding it (default: v1)",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PATH",
+        help="write NDJSON to PATH instead of stdout, gzip-compressed if it ends in .gz (default: stdout)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="reuse reports of unchanged assessments; a directory, or a .sqlite/.db file (default: off)",
+    )
+    return parser
+
+
+def run_batch(argv: Optional[List[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be >= 0")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be >= 1")
+    workers = args.workers or os.cpu_count() or 1
+    defaults = Defaults()
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = sys.stdout if args.output is None else ReportStreamWriter(args.output)
+    cache = ResultCache(disk=open_disk_tier(args.cache)) if args.cache is not None else None
+    processed = 0
+    failed = 0
+    started = time.perf_counter()
+    try:
+        results = iter_results(
+            iter_lines(source),
+            defaults,
+            workers=workers,
+            chunk_size=args.chunk_size,
+            schema=args.schema,
+            cache=cache,
+        )
+        for ok, text in results:
+            out.write(text)
+            if out is sys.stdout:
+                out.write("\n")
+            processed += 1
+            if not ok:
+                failed += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        if cache is not None:
+            cache.close()
+    sys.stdout.flush()
+
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    summary = f"praf batch: {processed} assessments ({failed} failed) in {elapsed:.2f}s, {rate:.0f}/s, {workers} worker(s)"
+    if cache is not None:
+        stats = cache.stats
+        summary += f", cache {stats.hits} hit(s) / {stats.misses} miss(es)"
+    sys.stderr.write(summary + "\n")
+    return 1 if failed else 0
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+from praf.domain import Context
+from praf.io.loaders import decode_assessment, decode_context
+from praf.io.reports import REPORT_BUILDERS
+from praf.config.defaults import Defaults
+
+
+def context_from_payload(payload: Mapping[str, Any]) -> Context:
+    return decode_context(payload.get("context"))
+
+
+def report_from_payload(payload: Mapping[str, Any], defaults: Defaults, schema: str = "v1") -> Dict[str, Any]:
+    """Build a report from one decoded assessment (``context`` plus the four input sections)."""
+    assessment = decode_assessment(payload)
+    return REPORT_BUILDERS[schema](assessment.context, *assessment.sections(), defaults=defaults)
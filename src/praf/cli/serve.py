@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from praf.config.defaults import Defaults
+from praf.domain import COMPILED_LIBRARY, Activity, CompiledLibrary, Context
+from praf.domain.domains import activity_domain_weights
+from praf.domain.risk_patterns import RiskPattern, UserRisk, suggest_patterns
+from praf.engine.classifier import RiskLevel
+from praf.engine.codec import AnswerCodec
+from praf.engine.guidance import (
+    GATES,
+    GUIDANCE_RATIONALE,
+    PATTERNS,
+    PRIORITIES,
+    STAGES,
+    generate_guidance_batch,
+    register_columns,
+)
+from praf.engine.rules import Decision
+from praf.engine.scorer import score_encoded
+from praf.io.loaders import AssessmentInput, decode_assessment, decode_context
+from praf.io.store import score_records
+
+
+LEVELS: Tuple[RiskLevel, ...] = tuple(RiskLevel)
+DECISIONS: Tuple[Decision, ...] = tuple(Decision)
+
+ENDPOINTS = ("/score", "/guidance", "/suggest-pattern")
+MAX_BODY_BYTES = 16 << 20
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class MicroBatcher:
+    """Coalesce concurrent ``submit`` calls into batches for ``fn``.
+
+    A batch is closed once it holds ``max_batch`` items or ``max_wait``
+    seconds after its first item arrived, whichever comes first. ``fn``
+    takes the list of items and returns one result per item; it runs in
+    ``executor`` so the event loop keeps accepting requests meanwhile.
+    Batches run one at a time: while one is scored the next one fills up,
+    so batches grow with load instead of piling up. If ``fn`` raises, the
+    batch is retried one item at a time, so a bad item fails alone.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch: int = 64,
+        max_wait: float = 0.002,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must be >= 0")
+        self.fn = fn
+        self.max_batch = int(max_batch)
+        self.max_wait = float(max_wait)
+        self.executor = executor
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        queue = self._queue
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            self.batches += 1
+            self.items += len(items)
+            self.largest = max(self.largest, len(items))
+            try:
+                results = await loop.run_in_executor(self.executor, self.fn, items)
+            except Exception as exc:
+                if len(batch) == 1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(exc)
+                    continue
+                await self._run_one_by_one(batch)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _run_one_by_one(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Retry a failed batch item by item, so only the items that fail get the error."""
+        loop = asyncio.get_running_loop()
+        for item, future in batch:
+            try:
+                (result,) = await loop.run_in_executor(self.executor, self.fn, [item])
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": self.items / self.batches if self.batches else 0.0,
+            "max_batch": self.largest,
+        }
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _decode_risks(payload: Mapping[str, Any]) -> Tuple[Context, List[UserRisk]]:
+    ctx = decode_context(payload.get("context"))
+    raw = payload.get("risks", [])
+    if not isinstance(raw, list) or not all(isinstance(r, Mapping) for r in raw):
+        raise ValueError("'risks' must be a list of JSON objects")
+    risks = [
+        UserRisk(
+            risk_id=str(r.get("risk_id", "")),
+            description=str(r.get("description", "")),
+            owner=str(r.get("owner", "")),
+            likelihood=int(r["likelihood"]),
+            impact=int(r["impact"]),
+            detectability=int(r["detectability"]),
+            pattern=RiskPattern(r["pattern"]) if r.get("pattern") is not None else None,
+        )
+        for r in raw
+    ]
+    return ctx, risks
+
+
+def _decode_texts(payload: Mapping[str, Any]) -> Tuple[bool, List[Optional[str]]]:
+    if "texts" in payload:
+        texts = payload["texts"]
+        if not isinstance(texts, list):
+            raise ValueError("'texts' must be a list of strings")
+    else:
+        texts = [payload.get("text")]
+    for text in texts:
+        if text is not None and not isinstance(text, str):
+            raise ValueError(f"texts must be strings, got {type(text).__name__}")
+    return "texts" in payload, texts
+
+
+class ScoringService:
+    """Local HTTP/1.1 JSON service over the scoring pipeline.
+
+    ``POST /score`` takes one assessment (the ``praf`` input format) and
+    returns its report summary: context, decisions, domain scores and top
+    contributors, identical to the same fields of ``build_report``.
+    ``POST /guidance`` takes ``{"context", "risks": [...]}`` and returns the
+    ``generate_guidance`` summary; ``POST /suggest-pattern`` takes
+    ``{"text": ...}`` or ``{"texts": [...]}``. ``GET /stats`` reports
+    p50/p99 latency per endpoint and batch sizes.
+
+    Each endpoint has its own ``MicroBatcher``: requests arriving together are
+    decoded on the event loop and scored as one vectorised batch in a worker
+    thread. The compiled library, per-activity domain weights and domain
+    order are prepared once, at construction.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_batch: int = 64,
+        max_wait: float = 0.002,
+        defaults: Optional[Defaults] = None,
+        library: Optional[CompiledLibrary] = None,
+        top_n: int = 5,
+        latency_window: int = 10_000,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.defaults = defaults if defaults is not None else Defaults()
+        self.library = library if library is not None else COMPILED_LIBRARY
+        self.top_n = top_n
+        lib = self.library
+        self._weights = {a: lib.domain_weight_vector(activity_domain_weights(a)) for a in Activity}
+        # Domains in first-appearance order, the order build_report lists them in.
+        self._domain_order = [(lib.domains[j], j) for j in dict.fromkeys(int(j) for j in lib.domain_index)]
+        self._executor = ThreadPoolExecutor(max_workers=len(ENDPOINTS), thread_name_prefix="praf-serve")
+        self.batchers = {
+            "/score": MicroBatcher(self._score_batch, max_batch, max_wait, self._executor),
+            "/guidance": MicroBatcher(self._guidance_batch, max_batch, max_wait, self._executor),
+            "/suggest-pattern": MicroBatcher(self._suggest_batch, max_batch, max_wait, self._executor),
+        }
+        self._decoders: Dict[str, Callable[[Any], Any]] = {
+            "/score": lambda payload: decode_assessment(payload, library=lib),
+            "/guidance": _decode_risks,
+            "/suggest-pattern": _decode_texts,
+        }
+        self._latencies: Dict[str, Deque[float]] = {path: deque(maxlen=latency_window) for path in ENDPOINTS}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # -- engine side, runs in a worker thread ---------------------------------
+
+    def _score_batch(self, items: List[AssessmentInput]) -> List[Dict[str, Any]]:
+        lib = self.library
+        encoded = AnswerCodec(lib).encode(
+            [a.responses for a in items],
+            [a.likelihood for a in items],
+            [a.impact for a in items],
+            [a.detectability for a in items],
+        )
+        weights = np.stack([self._weights[a.context.activity] for a in items])
+        records = score_records(
+            score_encoded(encoded, weights, library=lib),
+            [a.context.activity for a in items],
+            [a.context.stage for a in items],
+            self.defaults.low_threshold,
+            self.defaults.high_threshold,
+            top_n=self.top_n,
+            library=lib,
+        )
+        return [self._summary(a.context, record) for a, record in zip(items, records)]
+
+    def _summary(self, ctx: Context, record: np.void) -> Dict[str, Any]:
+        ids = self.library.indicator_ids
+        levels = record["domain_levels"]
+        domains = [(d, j) for d, j in self._domain_order if levels[j] >= 0]
+        return {
+            "context": {"activity": ctx.activity.value, "stage": ctx.stage.value},
+            "overall_decision": DECISIONS[record["decision"]].value,
+            "per_domain_decision": {d.value: DECISIONS[levels[j]].value for d, j in domains},
+            "domain_scores": {
+                d.value: {"score": float(record["domain_scores"][j]), "level": LEVELS[levels[j]].value} for d, j in domains
+            },
+            "top_contributors_by_domain": {
+                d.value: [
+                    [ids[p], float(c)]
+                    for p, c in zip(record["top_positions"][j], record["top_contributions"][j])
+                    if p >= 0
+                ]
+                for d, j in domains
+            },
+        }
+
+    def _guidance_batch(self, items: List[Tuple[Context, List[UserRisk]]]) -> List[Dict[str, Any]]:
+        stage_index = {s: code for code, s in enumerate(STAGES)}
+        risks = [r for _, group in items for r in group]
+        groups_of_rows = np.repeat(np.arange(len(items), dtype=np.intp), [len(group) for _, group in items])
+        stages = np.array([stage_index[ctx.stage] for ctx, _ in items], dtype=np.int16)
+        batch = generate_guidance_batch(
+            *register_columns(risks),
+            stages[groups_of_rows],
+            context_index=groups_of_rows,
+            n_contexts=len(items),
+        )
+        groups: List[List[int]] = [[] for _ in items]
+        for row, g in enumerate(groups_of_rows.tolist()):
+            if batch.priority_codes[row] >= 0:
+                groups[g].append(row)
+        summaries = []
+        for g, members in enumerate(groups):
+            members.sort(key=lambda row: batch.priority_codes[row])  # stable, as generate_guidance
+            summaries.append(
+                {
+                    "overall_gate_guidance": GATES[batch.overall_gate_codes[g]].value,
+                    "rationale": GUIDANCE_RATIONALE,
+                    "items": [
+                        {
+                            "risk_id": risks[row].risk_id,
+                            "pattern": PATTERNS[batch.pattern_codes[row]].value,
+                            "priority": PRIORITIES[batch.priority_codes[row]],
+                            "gate_guidance": GATES[batch.gate_codes[row]].value,
+                            "why": batch.why(row),
+                            "recommended_actions": list(batch.actions(row)),
+                            "expected_evidence": list(batch.evidence(row)),
+                        }
+                        for row in members
+                    ],
+                }
+            )
+        return summaries
+
+    def _suggest_batch(self, items: List[Tuple[bool, List[Optional[str]]]]) -> List[Any]:
+        texts = [text for _, group in items for text in group]
+        found = iter(suggest_patterns(texts, with_keywords=True))
+        results = []
+        for many, group in items:
+            suggestions = [{"pattern": s.pattern.value, "keywords": list(s.keywords)} for s in (next(found) for _ in group)]
+            results.append({"suggestions": suggestions} if many else suggestions[0])
+        return results
+
+    # -- HTTP side, runs on the event loop ------------------------------------
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/stats":
+            if method != "GET":
+                raise _HTTPError(405, "use GET")
+            return 200, self.stats()
+        if path == "/health":
+            return 200, {"status": "ok", "library": self.library.fingerprint}
+        if path not in self.batchers:
+            raise _HTTPError(404, f"no endpoint {path}")
+        if method != "POST":
+            raise _HTTPError(405, "use POST")
+        try:
+            item = self._decoders[path](json.loads(body))
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            raise _HTTPError(400, f"{type(exc).__name__}: {exc}") from None
+        return 200, await self.batchers[path].submit(item)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                path = target.split("?", 1)[0]
+                started = time.perf_counter()
+                if length > MAX_BODY_BYTES:
+                    status, result = 413, {"error": f"body exceeds {MAX_BODY_BYTES} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, result = await self._dispatch(method, path, body)
+                    except _HTTPError as exc:
+                        status, result = exc.status, {"error": str(exc)}
+                    except Exception as exc:
+                        status, result = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+                payload = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                        f"Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if path in self._latencies:
+                    self._latencies[path].append(time.perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per endpoint: request count, p50/p99 latency (ms, over the latency window) and batch sizes."""
+        endpoints: Dict[str, Any] = {}
+        for path in ENDPOINTS:
+            samples = np.array(self._latencies[path], dtype=np.float64) * 1e3
+            p50, p99 = np.percentile(samples, [50, 99]).tolist() if samples.size else (None, None)
+            endpoints[path] = {"requests": int(samples.size), "p50_ms": p50, "p99_ms": p99, **self.batchers[path].stats()}
+        return {"endpoints": endpoints}
+
+    async def start(self) -> int:
+        """Bind and start accepting connections; returns the bound port (useful with ``port=0``)."""
+        for batcher in self.batchers.values():
+            batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for batcher in self.batchers.values():
+            await batcher.close()
+        self._executor.shutdown(wait=True)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="praf serve",
+        description="Serve /score, /guidance and /suggest-pattern over HTTP, micro-batching concurrent requests.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to bind; 0 picks a free one (default: 8080)")
+    parser.add_argument("--max-batch", type=int, default=64, help="largest micro-batch per endpoint (default: 64)")
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=2.0,
+        help="longest a request waits for its micro-batch to fill, in milliseconds (default: 2)",
+    )
+    return parser
+
+
+def run_serve(argv: Optional[List[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.max_batch < 1:
+        parser.error("--max-batch must be >= 1")
+    if args.max_wait_ms < 0:
+        parser.error("--max-wait-ms must be >= 0")
+    service = ScoringService(args.host, args.port, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1e3)
+
+    async def serve() -> None:
+        port = await service.start()
+        sys.stderr.write(f"praf serve: listening on http://{args.host}:{port}\n")
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    for path, s in service.stats()["endpoints"].items():
+        if s["requests"]:
+            sys.stderr.write(
+                f"praf serve: {path} {s['requests']} request(s), p50 {s['p50_ms']:.2f} ms, p99 {s['p99_ms']:.2f} ms, "
+                f"mean batch {s['mean_batch']:.1f}\n"
+            )
+    return 0
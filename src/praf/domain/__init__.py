@@ -3,7 +3,8 @@ from .domains import RiskDomain, activity_domain_weights
 from .natures import RiskNature, nature_weight_modifier
 from .categories import RiskCategory, DOMAIN_TO_CATEGORIES
 from .indicators import Indicator, INDICATOR_LIBRARY, Polarity
-from .risk_patterns import RiskPattern, UserRisk, suggest_pattern_from_text
+from .risk_patterns import RiskPattern, UserRisk, PatternSuggestion, suggest_pattern_from_text, suggest_patterns
+from .compiled import CompiledLibrary, COMPILED_LIBRARY, compile_library
 
 
 __all__ = [
@@ -22,5 +23,10 @@ __all__ = [
     "RiskPattern",
     "UserRisk",
     "suggest_pattern_from_text",
+    "PatternSuggestion",
+    "suggest_patterns",
+    "CompiledLibrary",
+    "COMPILED_LIBRARY",
+    "compile_library",
 
 ]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+import numpy as np
+
+from praf.config.schemas import AllowedAnswerType
+from .activities import Activity
+from .categories import RiskCategory
+from .domains import RiskDomain, activity_domain_weights
+from .indicators import INDICATOR_LIBRARY, Indicator, Polarity
+from .natures import nature_weight_modifier
+
+
+@dataclass(frozen=True)
+class CompiledIndicator:
+    """Scalar view of one indicator with every derived value resolved up front."""
+
+    indicator_id: str
+    position: int
+    indicator: Indicator
+    domain: RiskDomain
+    category: RiskCategory
+    answer_type: str
+    invert_response: bool
+    nature_weight: float
+    base_weight: float
+    weight_ex_domain: float
+    metadata: Mapping[str, str]
+
+
+@dataclass(frozen=True)
+class CompiledLibrary:
+    """Immutable, array-backed form of an indicator library.
+
+    Built once from an ``{indicator_id: Indicator}`` mapping. Every array has
+    one entry per indicator in library order (``indicator_ids``):
+
+    - ``weight_ex_domain``: ``nature_weight * base_weight`` (float64)
+    - ``invert_response``: True for ``RISK_WHEN_ABSENT`` indicators
+    - ``answer_type_code``: index into ``answer_types`` (uint8)
+    - ``domain_index``: index into ``domains`` (``RiskDomain`` order)
+    - ``category_index``: index into ``categories`` (``RiskCategory`` order)
+
+    ``entries`` carries the same data as plain Python scalars for the
+    per-assessment code paths. ``fingerprint`` is a SHA-256 over everything
+    that affects a score: the indicator metadata, the nature and indicator
+    weights and the activity domain-weight table.
+    """
+
+    indicator_ids: Tuple[str, ...]
+    position: Mapping[str, int]
+    entries: Tuple[CompiledIndicator, ...]
+    domains: Tuple[RiskDomain, ...]
+    categories: Tuple[RiskCategory, ...]
+    answer_types: Tuple[AllowedAnswerType, ...]
+    weight_ex_domain: np.ndarray
+    invert_response: np.ndarray
+    answer_type_code: np.ndarray
+    domain_index: np.ndarray
+    category_index: np.ndarray
+    domain_of: Mapping[str, RiskDomain]
+    fingerprint: str
+
+    def __len__(self) -> int:
+        return len(self.indicator_ids)
+
+    def domain_weight_vector(self, domain_weights: Mapping[RiskDomain, float]) -> np.ndarray:
+        """Return ``domain_weights`` as a vector in ``domains`` order (missing = 1.0)."""
+        return np.array([float(domain_weights.get(d, 1.0)) for d in self.domains], dtype=np.float64)
+
+
+def _frozen(values: list, dtype: type) -> np.ndarray:
+    arr = np.array(values, dtype=dtype)
+    arr.setflags(write=False)
+    return arr
+
+
+def _fingerprint(entries: list) -> str:
+    payload = {
+        "indicators": [
+            [
+                e.indicator_id,
+                e.answer_type,
+                e.metadata["domain"],
+                e.metadata["category"],
+                e.metadata["nature"],
+                e.metadata["polarity"],
+                e.nature_weight,
+                e.base_weight,
+            ]
+            for e in entries
+        ],
+        "activity_domain_weights": {
+            a.value: {d.value: w for d, w in activity_domain_weights(a).items()} for a in Activity
+        },
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def compile_library(library: Mapping[str, Indicator]) -> CompiledLibrary:
+    domains = tuple(RiskDomain)
+    categories = tuple(RiskCategory)
+    answer_types = tuple(AllowedAnswerType)
+
+    entries = []
+    for position, (indicator_id, indicator) in enumerate(library.items()):
+        nw = float(nature_weight_modifier(indicator.nature))
+        iw = float(indicator.base_weight)
+        metadata = {
+            "domain": indicator.domain.value,
+            "category": indicator.category.value,
+            "nature": indicator.nature.value,
+            "polarity": indicator.polarity.value,
+        }
+        entries.append(
+            CompiledIndicator(
+                indicator_id=indicator_id,
+                position=position,
+                indicator=indicator,
+                domain=indicator.domain,
+                category=indicator.category,
+                answer_type=indicator.answer_type.value,
+                invert_response=indicator.polarity == Polarity.RISK_WHEN_ABSENT,
+                nature_weight=nw,
+                base_weight=iw,
+                weight_ex_domain=nw * iw,
+                metadata=MappingProxyType(metadata),
+            )
+        )
+
+    position: Dict[str, int] = {e.indicator_id: e.position for e in entries}
+    domain_of: Dict[str, RiskDomain] = {e.indicator_id: e.domain for e in entries}
+
+    return CompiledLibrary(
+        indicator_ids=tuple(e.indicator_id for e in entries),
+        position=MappingProxyType(position),
+        entries=tuple(entries),
+        domains=domains,
+        categories=categories,
+        answer_types=answer_types,
+        weight_ex_domain=_frozen([e.weight_ex_domain for e in entries], np.float64),
+        invert_response=_frozen([e.invert_response for e in entries], np.bool_),
+        answer_type_code=_frozen([answer_types.index(e.indicator.answer_type) for e in entries], np.uint8),
+        domain_index=_frozen([domains.index(e.domain) for e in entries], np.intp),
+        category_index=_frozen([categories.index(e.category) for e in entries], np.intp),
+        domain_of=MappingProxyType(domain_of),
+        fingerprint=_fingerprint(entries),
+    )
+
+
+COMPILED_LIBRARY: CompiledLibrary = compile_library(INDICATOR_LIBRARY)
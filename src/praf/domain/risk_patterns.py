@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 
 class RiskPattern(str, Enum):
@@ -29,34 +31,120 @@ class UserRisk:
     pattern: Optional[RiskPattern] = None
 
 
-def suggest_pattern_from_text(text: str) -> RiskPattern:
-    t = (text or "").strip().lower()
-
-    if any(k in t for k in ["supplier", "vendor", "procurement", "lead time", "single source", "subcontract"]):
-        return RiskPattern.SUPPLIER_RELIABILITY
-
-    if any(k in t for k in ["batch", "variability", "process", "yield", "defect", "scrap", "manufactur"]):
-        return RiskPattern.PROCESS_VARIABILITY
+# Keyword groups in precedence order: the first group with any keyword found
+# anywhere in the (lowercased) text decides the pattern.
+PATTERN_KEYWORDS: Tuple[Tuple[RiskPattern, Tuple[str, ...]], ...] = (
+    (RiskPattern.SUPPLIER_RELIABILITY, ("supplier", "vendor", "procurement", "lead time", "single source", "subcontract")),
+    (RiskPattern.PROCESS_VARIABILITY, ("batch", "variability", "process", "yield", "defect", "scrap", "manufactur")),
+    (RiskPattern.DESIGN_MATURITY, ("assumption", "architecture", "requirement", "specification", "design change")),
+    (RiskPattern.MEASUREMENT_INTEGRITY, ("calibration", "drift", "stability", "noise", "environment", "temperature", "humidity")),
+    (RiskPattern.DATA_INTEGRITY, ("data", "integrity", "logging", "audit trail", "trace", "traceability")),
+    (RiskPattern.EVIDENCE_SUFFICIENCY, ("evidence", "validation", "verification", "test plan", "dataset", "sample size")),
+    (RiskPattern.GOVERNANCE_ACCOUNTABILITY, ("governance", "decision", "threshold", "escalation", "approval", "owner")),
+    (RiskPattern.REGULATORY_READINESS, ("regulatory", "compliance", "submission", "standard", "iso", "documentation")),
+    (RiskPattern.OPERATIONAL_CONTINUITY, ("continuity", "availability", "downtime", "failure", "disruption", "support")),
+)
 
-    if any(k in t for k in ["assumption", "architecture", "requirement", "specification", "design change"]):
-        return RiskPattern.DESIGN_MATURITY
 
-    if any(k in t for k in ["calibration", "drift", "stability", "noise", "environment", "temperature", "humidity"]):
-        return RiskPattern.MEASUREMENT_INTEGRITY
-
-    if any(k in t for k in ["data", "integrity", "logging", "audit trail", "trace", "traceability"]):
-        return RiskPattern.DATA_INTEGRITY
-
-    if any(k in t for k in ["evidence", "validation", "verification", "test plan", "dataset", "sample size"]):
-        return RiskPattern.EVIDENCE_SUFFICIENCY
+@dataclass(frozen=True)
+class PatternSuggestion:
+    pattern: RiskPattern
+    keywords: Tuple[str, ...]
+
+
+class PatternMatcher:
+    """Keyword matcher compiled once from ``PATTERN_KEYWORDS``.
+
+    Single texts are checked group by group and stop at the first group that
+    matches, which is the precedence rule itself. Batches are joined into one
+    newline-separated buffer (no keyword contains a newline) and each keyword
+    is located across the whole batch with one C-level ``str.find`` scan; the
+    hit offsets are mapped back to their texts with a binary search and the
+    lowest group index per text wins.
+    """
+
+    def __init__(self, groups: Sequence[Tuple[RiskPattern, Tuple[str, ...]]] = PATTERN_KEYWORDS) -> None:
+        self.groups: Tuple[Tuple[RiskPattern, Tuple[str, ...]], ...] = tuple((p, tuple(k)) for p, k in groups)
+        self.patterns: Tuple[RiskPattern, ...] = tuple(p for p, _ in self.groups) + (RiskPattern.OTHER,)
+
+    @staticmethod
+    def _normalise(text: Optional[str]) -> str:
+        return (text or "").strip().lower()
+
+    def match(self, text: Optional[str]) -> RiskPattern:
+        t = self._normalise(text)
+        for pattern, keywords in self.groups:
+            for k in keywords:
+                if k in t:
+                    return pattern
+        return RiskPattern.OTHER
+
+    def matched_keywords(self, text: Optional[str]) -> Tuple[str, ...]:
+        """Every keyword found in ``text``, in precedence order."""
+        t = self._normalise(text)
+        return tuple(k for _, keywords in self.groups for k in keywords if k in t)
+
+    def suggest(self, text: Optional[str]) -> PatternSuggestion:
+        keywords = self.matched_keywords(text)
+        pattern = self.match(text) if keywords else RiskPattern.OTHER
+        return PatternSuggestion(pattern=pattern, keywords=keywords)
+
+    def match_many(
+        self,
+        texts: Iterable[Optional[str]],
+        with_keywords: bool = False,
+    ) -> Union[List[RiskPattern], List[PatternSuggestion]]:
+        raw = [t or "" for t in texts]
+        if not raw:
+            return []
+        # Keywords contain neither newlines nor leading/trailing whitespace, so
+        # the texts can be joined unstripped and lowercased in one call, as
+        # long as lowercasing keeps every offset in place.
+        joined = "\n".join(raw)
+        blob = joined.lower()
+        if len(blob) != len(joined):
+            raw = [t.lower() for t in raw]
+            blob = "\n".join(raw)
+        starts = np.zeros(len(raw), dtype=np.int64)
+        np.cumsum([len(t) + 1 for t in raw[:-1]], out=starts[1:])
+
+        best = np.full(len(raw), len(self.groups), dtype=np.int16)
+        hits: List[Tuple[np.ndarray, str]] = []
+        find = blob.find
+        for rank, (_, keywords) in enumerate(self.groups):
+            for k in keywords:
+                offsets = []
+                p = find(k)
+                while p != -1:
+                    offsets.append(p)
+                    p = find(k, p + 1)
+                if not offsets:
+                    continue
+                owner = np.searchsorted(starts, np.array(offsets, dtype=np.int64), side="right") - 1
+                np.minimum.at(best, owner, rank)
+                if with_keywords:
+                    hits.append((np.unique(owner), k))
+
+        patterns = [self.patterns[r] for r in best]
+        if not with_keywords:
+            return patterns
+        found: List[List[str]] = [[] for _ in raw]
+        for owner, k in hits:
+            for idx in owner:
+                found[idx].append(k)
+        return [PatternSuggestion(pattern=p, keywords=tuple(f)) for p, f in zip(patterns, found)]
+
+
+_MATCHER = PatternMatcher()
 
-    if any(k in t for k in ["governance", "decision", "threshold", "escalation", "approval", "owner"]):
-        return RiskPattern.GOVERNANCE_ACCOUNTABILITY
 
-    if any(k in t for k in ["regulatory", "compliance", "submission", "standard", "iso", "documentation"]):
-        return RiskPattern.REGULATORY_READINESS
+def suggest_pattern_from_text(text: str) -> RiskPattern:
+    return _MATCHER.match(text)
 
-    if any(k in t for k in ["continuity", "availability", "downtime", "failure", "disruption", "support"]):
-        return RiskPattern.OPERATIONAL_CONTINUITY
 
-    return RiskPattern.OTHER
+def suggest_patterns(
+    texts: Iterable[Optional[str]],
+    with_keywords: bool = False,
+) -> Union[List[RiskPattern], List[PatternSuggestion]]:
+    """Batch ``suggest_pattern_from_text``; with ``with_keywords`` each result also lists the matched keywords."""
+    return _MATCHER.match_many(texts, with_keywords=with_keywords)
@@ -1,21 +1,56 @@
-from .scorer import ScoreResult, score_indicators
-from .aggregator import AggregatedResult, aggregate_scores
-from .classifier import RiskLevel, classify_domains
-from .rules import Decision, decide
-from .explainability import Explanation, explain
+from .codec import AnswerCodec, EncodedAnswers
+from .scorer import BatchScoreResult, ScoreResult, score_encoded, score_indicators, score_indicators_batch
+from .aggregator import AggregatedResult, BatchAggregatedResult, aggregate_scores, aggregate_scores_batch
+from .classifier import RiskLevel, classify_batch, classify_domains
+from .rules import Decision, decide, decide_batch
+from .explainability import BatchExplanation, Explanation, explain, explain_batch
+from .compact import CompactResult, compact_result, compact_results
+from .portfolio import PortfolioCube
 from .audit_trail import AuditEntry, build_audit_trail
+from .incremental import AnswerUpdate, IncrementalAssessment
+from .sensitivity import SensitivityResult, sensitivity
+from .attribution import Attribution, attribute
+from .calibration import ThresholdSweep, sweep_thresholds
+from .uncertainty import Discrete, Triangular, UncertaintyResult, monte_carlo
 
 __all__ = [
     "ScoreResult",
     "score_indicators",
+    "BatchScoreResult",
+    "score_indicators_batch",
+    "AnswerCodec",
+    "EncodedAnswers",
+    "score_encoded",
     "AggregatedResult",
     "aggregate_scores",
+    "BatchAggregatedResult",
+    "aggregate_scores_batch",
     "RiskLevel",
     "classify_domains",
+    "classify_batch",
     "Decision",
     "decide",
+    "decide_batch",
     "Explanation",
     "explain",
+    "BatchExplanation",
+    "explain_batch",
+    "CompactResult",
+    "compact_result",
+    "compact_results",
+    "PortfolioCube",
     "AuditEntry",
     "build_audit_trail",
+    "AnswerUpdate",
+    "IncrementalAssessment",
+    "SensitivityResult",
+    "sensitivity",
+    "Triangular",
+    "Discrete",
+    "UncertaintyResult",
+    "monte_carlo",
+    "ThresholdSweep",
+    "sweep_thresholds",
+    "Attribution",
+    "attribute",
 ]
@@ -1,19 +1,43 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
+import numpy as np
+
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
 from praf.domain.domains import RiskDomain
+from praf.engine.scorer import BatchScoreResult
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AggregatedResult:
     domain_scores: Dict[RiskDomain, float]
     category_scores: Dict[str, float]
     domain_counts: Dict[RiskDomain, int]
 
 
-def aggregate_scores(indicator_details: Dict[str, Dict[str, Any]], local_scores: Dict[str, float]) -> AggregatedResult:
+@dataclass(frozen=True)
+class BatchAggregatedResult:
+    """0..100 indices for N assessments.
+
+    ``domain_scores`` has one column per ``domains`` entry (``RiskDomain``
+    order) and ``category_scores`` one per ``categories`` entry
+    (``RiskCategory`` order). Domains and categories without indicators in
+    the library are NaN.
+    """
+
+    domains: Tuple[RiskDomain, ...]
+    categories: Tuple[str, ...]
+    domain_scores: np.ndarray
+    category_scores: np.ndarray
+
+
+def aggregate_scores(
+    indicator_details: Dict[str, Dict[str, Any]],
+    local_scores: Dict[str, float],
+    library: Optional[CompiledLibrary] = None,
+) -> AggregatedResult:
     """Aggregate per-indicator contributions into 0..100 risk indices.
 
     Each ``local_scores`` value is a weighted contribution
@@ -37,7 +61,11 @@ def aggregate_scores(indicator_details: Dict[str, Dict[str, Any]], local_scores:
     cancel out of step 1's normalised mean; applying it afterwards is what makes
     context-aware weighting actually shift the classification of the domains an
     activity emphasises.
+
+    When ``library`` is given, each indicator's domain is taken from its
+    precomputed entry instead of being parsed from ``meta["domain"]``.
     """
+    domain_of = library.domain_of if library is not None else {}
     domain_sum: Dict[RiskDomain, float] = {}
     domain_weight_ex: Dict[RiskDomain, float] = {}
     domain_dw: Dict[RiskDomain, float] = {}
@@ -50,7 +78,7 @@ def aggregate_scores(indicator_details: Dict[str, Dict[str, Any]], local_scores:
         contribution = float(local_scores.get(indicator_id, 0.0))
         weight = float(meta.get("weight_ex_domain", 1.0))
         dw = float(meta.get("domain_weight", 1.0))
-        domain = RiskDomain(meta["domain"])
+        domain = domain_of.get(indicator_id) or RiskDomain(meta["domain"])
         category = str(meta["category"])
 
         domain_sum[domain] = float(domain_sum.get(domain, 0.0) + contribution)
@@ -75,3 +103,52 @@ def aggregate_scores(indicator_details: Dict[str, Dict[str, Any]], local_scores:
         category_index[k] = float(min(100.0, base_index * category_dw.get(k, 1.0)))
 
     return AggregatedResult(domain_scores=domain_index, category_scores=category_index, domain_counts=domain_counts)
+
+
+def _batch_index(total: np.ndarray, weight: np.ndarray, dw: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_index = np.where(weight > 0.0, 100.0 * total / weight, 0.0)
+    return np.minimum(100.0, base_index * dw)
+
+
+def aggregate_scores_batch(scores: BatchScoreResult, library: Optional[CompiledLibrary] = None) -> BatchAggregatedResult:
+    """Vectorised ``aggregate_scores`` over the rows of a ``BatchScoreResult``.
+
+    Contributions are summed column by column in library order, the same
+    order the scalar aggregator adds them in, so each row equals
+    ``aggregate_scores`` on that assessment exactly.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    n = scores.contributions.shape[0]
+    n_domains = len(lib.domains)
+    n_categories = len(lib.categories)
+
+    domain_sum = np.zeros((n, n_domains), dtype=np.float64)
+    category_sum = np.zeros((n, n_categories), dtype=np.float64)
+    domain_weight = np.zeros(n_domains, dtype=np.float64)
+    category_weight = np.zeros(n_categories, dtype=np.float64)
+    domain_dw = np.ones((n, n_domains), dtype=np.float64)
+    category_dw = np.ones((n, n_categories), dtype=np.float64)
+
+    for k in range(len(lib)):
+        d = lib.domain_index[k]
+        c = lib.category_index[k]
+        column = scores.contributions[:, k]
+        domain_sum[:, d] += column
+        category_sum[:, c] += column
+        domain_weight[d] += lib.weight_ex_domain[k]
+        category_weight[c] += lib.weight_ex_domain[k]
+        domain_dw[:, d] = scores.domain_weight[:, k]
+        category_dw[:, c] = scores.domain_weight[:, k]
+
+    domain_index = _batch_index(domain_sum, domain_weight, domain_dw)
+    category_index = _batch_index(category_sum, category_weight, category_dw)
+    domain_index[:, np.bincount(lib.domain_index, minlength=n_domains) == 0] = np.nan
+    category_index[:, np.bincount(lib.category_index, minlength=n_categories) == 0] = np.nan
+
+    return BatchAggregatedResult(
+        domains=lib.domains,
+        categories=tuple(c.value for c in lib.categories),
+        domain_scores=domain_index,
+        category_scores=category_index,
+    )
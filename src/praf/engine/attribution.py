@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
+from praf.domain.domains import RiskDomain
+from praf.engine.scorer import BatchScoreResult
+
+
+@dataclass(frozen=True)
+class Attribution:
+    """Per-indicator shares of the domain and category indices.
+
+    ``domain_shares[n, k]`` is how many index points indicator ``k``
+    contributes to its domain's final (capped) index for assessment ``n``;
+    ``category_shares`` is the same for its category. Each indicator belongs
+    to exactly one domain and one category, so summing the shares of a
+    domain's (category's) indicators reproduces that index up to
+    floating-point rounding. ``domain_capped`` / ``category_capped`` flag
+    indices that hit the cap at 100, where every share was scaled down
+    proportionally.
+    """
+
+    indicator_ids: Tuple[str, ...]
+    domains: Tuple[RiskDomain, ...]
+    categories: Tuple[str, ...]
+    domain_shares: np.ndarray
+    category_shares: np.ndarray
+    domain_capped: np.ndarray
+    category_capped: np.ndarray
+    domain_index: np.ndarray
+    category_index: np.ndarray
+
+    def domain_totals(self) -> np.ndarray:
+        """Shares summed per domain, ``(N, len(domains))``; equals the domain index."""
+        return self.domain_shares @ _one_hot(self.domain_index, len(self.domains))
+
+    def category_totals(self) -> np.ndarray:
+        """Shares summed per category, ``(N, len(categories))``; equals the category index."""
+        return self.category_shares @ _one_hot(self.category_index, len(self.categories))
+
+
+def _one_hot(index: np.ndarray, size: int) -> np.ndarray:
+    out = np.zeros((len(index), size), dtype=np.float64)
+    out[np.arange(len(index)), index] = 1.0
+    return out
+
+
+def _shares(
+    contributions: np.ndarray,
+    group: np.ndarray,
+    n_groups: int,
+    weight_ex_domain: np.ndarray,
+    group_dw: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Split ``min(100, 100 * sum(c) / sum(w) * dw)`` of each group into per-indicator shares."""
+    one_hot = _one_hot(group, n_groups)
+    weight = weight_ex_domain @ one_hot
+    with np.errstate(divide="ignore", invalid="ignore"):
+        points_per_unit = np.where(weight > 0.0, 100.0 / weight, 0.0)[None, :] * group_dw
+        uncapped = (contributions @ one_hot) * points_per_unit
+        scale = np.where(uncapped > 100.0, 100.0 / uncapped, 1.0)
+    factor = (points_per_unit * scale)[:, group]
+    return contributions * factor, uncapped > 100.0
+
+
+def attribute(scores: BatchScoreResult, library: Optional[CompiledLibrary] = None) -> Attribution:
+    """Decompose every domain and category index into additive per-indicator shares.
+
+    With ``w_k = nature_weight * indicator_weight`` and ``c_k = severity_k * w_k``
+    the aggregator computes ``index = min(100, 100 * sum(c) / sum(w) * dw)``.
+    Indicator ``k``'s share is ``100 * c_k / sum(w) * dw``, multiplied by
+    ``100 / uncapped_index`` when the cap applies, so the shares of a group
+    always add up to its reported index.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    contributions = np.asarray(scores.contributions, dtype=np.float64)
+    n = contributions.shape[0]
+
+    # Domain weights are per domain; a category takes the weight of its last
+    # indicator in library order, as in aggregate_scores.
+    domain_dw = np.ones((n, len(lib.domains)), dtype=np.float64)
+    category_dw = np.ones((n, len(lib.categories)), dtype=np.float64)
+    for k in range(len(lib)):
+        domain_dw[:, lib.domain_index[k]] = scores.domain_weight[:, k]
+        category_dw[:, lib.category_index[k]] = scores.domain_weight[:, k]
+
+    domain_shares, domain_capped = _shares(contributions, lib.domain_index, len(lib.domains), lib.weight_ex_domain, domain_dw)
+    category_shares, category_capped = _shares(
+        contributions, lib.category_index, len(lib.categories), lib.weight_ex_domain, category_dw
+    )
+
+    return Attribution(
+        indicator_ids=lib.indicator_ids,
+        domains=lib.domains,
+        categories=tuple(c.value for c in lib.categories),
+        domain_shares=domain_shares,
+        category_shares=category_shares,
+        domain_capped=domain_capped,
+        category_capped=category_capped,
+        domain_index=lib.domain_index,
+        category_index=lib.category_index,
+    )
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Optional
 
 from praf.engine.rules import DecisionResult
 from praf.engine.classifier import DomainClassification
 from praf.domain.domains import RiskDomain
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AuditEntry:
     key: str
     value: Any
@@ -19,18 +19,30 @@ def build_audit_trail(
     decision: DecisionResult,
     indicator_details: Dict[str, Dict[str, Any]],
     local_scores: Dict[str, float],
+    sink: Optional[Callable[[AuditEntry], None]] = None,
 ) -> List[AuditEntry]:
+    """Build the audit entries of one run.
+
+    ``sink``, e.g. a ``praf.io.auditlog.AuditRun``, receives every entry as it
+    is created, so audit logs are written while the trail is being built.
+    """
     entries: List[AuditEntry] = []
 
-    entries.append(AuditEntry(key="overall_decision", value=decision.overall.value))
+    def add(key: str, value: Any) -> None:
+        entry = AuditEntry(key=key, value=value)
+        if sink is not None:
+            sink(entry)
+        entries.append(entry)
+
+    add("overall_decision", decision.overall.value)
 
     per_domain = {d.value: decision.per_domain[d].value for d in decision.per_domain}
-    entries.append(AuditEntry(key="per_domain_decision", value=per_domain))
+    add("per_domain_decision", per_domain)
 
     scores = {d.value: {"score": c.score, "level": c.level.value} for d, c in classifications.items()}
-    entries.append(AuditEntry(key="domain_scores", value=scores))
+    add("domain_scores", scores)
 
-    entries.append(AuditEntry(key="indicator_details", value=indicator_details))
-    entries.append(AuditEntry(key="local_scores", value=local_scores))
+    add("indicator_details", indicator_details)
+    add("local_scores", local_scores)
 
     return entries
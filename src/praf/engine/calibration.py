@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ThresholdSweep:
+    """Classification counts for every ``(low_threshold, high_threshold)`` pair.
+
+    ``level_counts[a, b, j]`` holds the acceptable / action_required /
+    escalation_required counts (``tuple(RiskLevel)`` order) of domain column
+    ``j`` under ``low_grid[a]`` and ``high_grid[b]``; ``decision_counts[a, b]``
+    holds the proceed / revise / escalate counts of the overall decision
+    (``tuple(Decision)`` order).
+    """
+
+    low_grid: np.ndarray
+    high_grid: np.ndarray
+    level_counts: np.ndarray
+    decision_counts: np.ndarray
+
+    @property
+    def n_assessments(self) -> int:
+        return int(self.decision_counts[0, 0].sum()) if self.decision_counts.size else 0
+
+    def decision_rates(self) -> np.ndarray:
+        """``decision_counts`` as fractions of the assessments, ready for plotting."""
+        return self.decision_counts / max(self.n_assessments, 1)
+
+
+def _band_counts(sorted_scores: np.ndarray, low_grid: np.ndarray, high_grid: np.ndarray) -> np.ndarray:
+    """Counts per band for one sorted score column, shape ``(L, H, 3)``.
+
+    Mirrors ``classify_score``: a score is acceptable below ``low``,
+    escalates at or above ``max(low, high)`` and needs action in between, so
+    every count is a difference of two binary searches.
+    """
+    below_low = np.searchsorted(sorted_scores, low_grid, side="left")[:, None]
+    below_high = np.searchsorted(sorted_scores, high_grid, side="left")[None, :]
+    below_escalation = np.maximum(below_low, below_high)
+    acceptable = np.broadcast_to(below_low, below_escalation.shape)
+    return np.stack(
+        [acceptable, below_escalation - acceptable, len(sorted_scores) - below_escalation],
+        axis=-1,
+    )
+
+
+def sweep_thresholds(
+    domain_scores_matrix: np.ndarray,
+    low_grid: Sequence[float],
+    high_grid: Sequence[float],
+) -> ThresholdSweep:
+    """Classify a historical set of domain indices under every threshold pair.
+
+    ``domain_scores_matrix`` is ``(N, D)`` with one row per assessment (e.g.
+    ``aggregate_scores_batch(...).domain_scores``); NaN marks a domain the
+    assessment does not have. Each column is sorted once and then every grid
+    point is answered by binary search, so the cost is
+    ``O(N log N + (L + H) log N)`` per domain instead of re-classifying all
+    N assessments for each of the ``L * H`` pairs.
+    """
+    scores = np.asarray(domain_scores_matrix, dtype=np.float64)
+    if scores.ndim != 2:
+        raise ValueError(f"expected an (N, D) score matrix, got shape {scores.shape}")
+    low = np.asarray(low_grid, dtype=np.float64)
+    high = np.asarray(high_grid, dtype=np.float64)
+
+    level_counts = np.empty((len(low), len(high), scores.shape[1], 3), dtype=np.int64)
+    for j in range(scores.shape[1]):
+        column = scores[:, j]
+        level_counts[:, :, j, :] = _band_counts(np.sort(column[~np.isnan(column)]), low, high)
+
+    # The overall decision is the most severe domain level, which is decided by
+    # the highest domain index of the row. Rows without any domain proceed.
+    valid = ~np.isnan(scores)
+    row_max = np.where(valid, scores, -np.inf).max(axis=1, initial=-np.inf)
+    decision_counts = _band_counts(np.sort(row_max), low, high)
+
+    return ThresholdSweep(low_grid=low, high_grid=high, level_counts=level_counts, decision_counts=decision_counts)
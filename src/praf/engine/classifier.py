@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Dict
 
+import numpy as np
+
 from praf.domain.domains import RiskDomain
 
 
@@ -13,22 +15,33 @@ class RiskLevel(str, Enum):
     ESCALATION_REQUIRED = "escalation_required"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DomainClassification:
     domain: RiskDomain
     score: float
     level: RiskLevel
 
 
+def classify_score(score: float, low_threshold: float, high_threshold: float) -> RiskLevel:
+    if score < low_threshold:
+        return RiskLevel.ACCEPTABLE
+    if score < high_threshold:
+        return RiskLevel.ACTION_REQUIRED
+    return RiskLevel.ESCALATION_REQUIRED
+
+
 def classify_domains(domain_scores: Dict[RiskDomain, float], low_threshold: float, high_threshold: float) -> Dict[RiskDomain, DomainClassification]:
     results: Dict[RiskDomain, DomainClassification] = {}
     for domain, score in domain_scores.items():
         s = float(score)
-        if s < low_threshold:
-            level = RiskLevel.ACCEPTABLE
-        elif s < high_threshold:
-            level = RiskLevel.ACTION_REQUIRED
-        else:
-            level = RiskLevel.ESCALATION_REQUIRED
+        level = classify_score(s, low_threshold, high_threshold)
         results[domain] = DomainClassification(domain=domain, score=s, level=level)
     return results
+
+
+def classify_batch(domain_scores: np.ndarray, low_threshold: float, high_threshold: float) -> np.ndarray:
+    """Vectorised ``classify_score``: level codes indexing ``tuple(RiskLevel)``, -1 where the score is NaN."""
+    scores = np.asarray(domain_scores, dtype=np.float64)
+    levels = np.where(scores < low_threshold, 0, np.where(scores < high_threshold, 1, 2)).astype(np.int8)
+    levels[np.isnan(scores)] = -1
+    return levels
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
+
+
+# Input sections in the order ``score_indicators_batch`` takes them.
+SECTIONS = ("response", "likelihood", "impact", "detectability")
+
+# Reserved codes; every other code indexes an interned scale value.
+MISSING = 0
+UNKNOWN = 1
+
+_YES = frozenset({"yes", "y", "true", "1"})
+_NO = frozenset({"no", "n", "false", "0"})
+_LOW = frozenset({"low", "l"})
+_MEDIUM = frozenset({"medium", "med", "m"})
+_HIGH = frozenset({"high", "h"})
+
+
+def _parse_yes_no(answer: Any) -> Optional[float]:
+    if isinstance(answer, str):
+        v = answer.strip().lower()
+        if v in _YES:
+            return 5.0
+        if v in _NO:
+            return 1.0
+        return None
+    if isinstance(answer, bool):
+        return 5.0 if answer else 1.0
+    return None
+
+
+def _parse_low_med_high(answer: Any) -> Optional[float]:
+    if isinstance(answer, str):
+        v = answer.strip().lower()
+        if v in _LOW:
+            return 1.0
+        if v in _MEDIUM:
+            return 3.0
+        if v in _HIGH:
+            return 5.0
+        return None
+    if isinstance(answer, (int, float)):
+        x = float(answer)
+        if x <= 1.67:
+            return 1.0
+        if x <= 3.34:
+            return 3.0
+        return 5.0
+    return None
+
+
+def _clip(x: float) -> float:
+    if x < 1.0:
+        return 1.0
+    if x > 5.0:
+        return 5.0
+    return x
+
+
+def _parse_scale_1_5(answer: Any) -> Optional[float]:
+    if isinstance(answer, (int, float)):
+        return _clip(float(answer))
+    if isinstance(answer, str):
+        try:
+            return _clip(float(answer.strip()))
+        except ValueError:
+            return None
+    return None
+
+
+def _parse_unsupported(answer: Any) -> Optional[float]:
+    return None
+
+
+# Parsers return None for answers they do not recognise; callers score those as 3.0.
+PARSERS: Dict[str, Callable[[Any], Optional[float]]] = {
+    "yes_no": _parse_yes_no,
+    "low_med_high": _parse_low_med_high,
+    "scale_1_5": _parse_scale_1_5,
+}
+
+
+def parser_for(answer_type: str) -> Callable[[Any], Optional[float]]:
+    return PARSERS.get(answer_type, _parse_unsupported)
+
+
+def _smallest_code_dtype(n_values: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16):
+        if n_values <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint32)
+
+
+@dataclass(frozen=True)
+class EncodedAnswers:
+    """Answers for N assessments as integer codes.
+
+    ``codes`` is ``(len(SECTIONS), N, K)`` with columns in library order.
+    ``values[code]`` is the scaled answer the scorer uses; ``MISSING`` and
+    ``UNKNOWN`` both decode to the neutral 3.0 but are kept apart so fallbacks
+    can be counted.
+    """
+
+    indicator_ids: Tuple[str, ...]
+    codes: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return self.codes.shape[1]
+
+    def decode(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """``(responses, likelihood, impact, detectability)`` as ``build_batch_inputs`` returns them."""
+        decoded = self.values[self.codes]
+        return decoded[0], decoded[1], decoded[2], decoded[3]
+
+    def missing_counts(self) -> np.ndarray:
+        """``(len(SECTIONS), K)`` number of assessments without an answer."""
+        return (self.codes == MISSING).sum(axis=1)
+
+    def unknown_counts(self) -> np.ndarray:
+        """``(len(SECTIONS), K)`` number of answers that were not recognised."""
+        return (self.codes == UNKNOWN).sum(axis=1)
+
+    def fallbacks(self) -> Dict[str, Dict[str, int]]:
+        """Unrecognised answers per section and indicator; only non-zero counts are listed."""
+        counts = self.unknown_counts()
+        return {
+            section: {self.indicator_ids[k]: int(counts[s, k]) for k in np.flatnonzero(counts[s])}
+            for s, section in enumerate(SECTIONS)
+            if counts[s].any()
+        }
+
+
+class AnswerCodec:
+    """Interns raw answers into integer codes over a table of scale values.
+
+    Each distinct raw answer is parsed once per answer type; later
+    occurrences are a dict lookup, and decoding is a single ``values[codes]``
+    gather. Raw values are keyed together with their type, because
+    ``True``, ``1`` and ``1.0`` compare equal but do not map alike.
+    """
+
+    def __init__(self, library: Optional[CompiledLibrary] = None) -> None:
+        self.library = library if library is not None else COMPILED_LIBRARY
+        self._values: List[float] = [3.0, 3.0]
+        self._value_codes: Dict[float, int] = {}
+        self._memo: Dict[str, Dict[Hashable, int]] = {}
+
+    @property
+    def values(self) -> np.ndarray:
+        return np.array(self._values, dtype=np.float64)
+
+    def _intern(self, value: Optional[float]) -> int:
+        if value is None:
+            return UNKNOWN
+        code = self._value_codes.get(value)
+        if code is None:
+            # NaN never compares equal, so each one gets a code of its own.
+            code = len(self._values)
+            self._values.append(value)
+            if value == value:
+                self._value_codes[value] = code
+        return code
+
+    def _memo_for(self, answer_type: str) -> Dict[Hashable, int]:
+        # Strings, by far the most common answers, are their own key; anything
+        # else is keyed by ``(type, value)``.
+        memo = self._memo.get(answer_type)
+        if memo is None:
+            memo = self._memo[answer_type] = {(type(None), None): MISSING}
+        return memo
+
+    def code(self, answer_type: str, answer: Any) -> int:
+        """Code of one raw answer; ``None`` is ``MISSING``."""
+        memo = self._memo_for(answer_type)
+        key = answer if answer.__class__ is str else (answer.__class__, answer)
+        try:
+            code = memo.get(key)
+        except TypeError:  # unhashable answers are parsed every time
+            return self._intern(parser_for(answer_type)(answer))
+        if code is None:
+            code = memo[key] = self._intern(parser_for(answer_type)(answer))
+        return code
+
+    def encode_column(self, answer_type: str, answers: Iterable[Any]) -> np.ndarray:
+        """Codes for many answers of one type, e.g. one indicator across a register.
+
+        Answers already seen are a single dict lookup each; only new ones are
+        parsed.
+        """
+        memo = self._memo_for(answer_type)
+        try:
+            keys = [a if a.__class__ is str else (a.__class__, a) for a in answers]
+            for key in set(keys).difference(memo):
+                answer = key if key.__class__ is str else key[1]
+                memo[key] = self._intern(parser_for(answer_type)(answer))
+        except TypeError:  # an unhashable answer: fall back to one lookup each
+            return np.fromiter((self.code(answer_type, a) for a in answers), dtype=np.int64)
+        return np.fromiter(map(memo.__getitem__, keys), dtype=np.int64, count=len(keys))
+
+    def encode(
+        self,
+        responses: Sequence[Mapping[str, Any]],
+        likelihood: Sequence[Mapping[str, Any]],
+        impact: Sequence[Mapping[str, Any]],
+        detectability: Sequence[Mapping[str, Any]],
+    ) -> EncodedAnswers:
+        """Encode per-assessment input dicts; absent ids are ``MISSING``."""
+        lib = self.library
+        sections = (responses, likelihood, impact, detectability)
+        n = len(responses)
+        if any(len(section) != n for section in sections):
+            raise ValueError("all input sections must hold the same number of assessments")
+        codes = np.empty((len(SECTIONS), n, len(lib)), dtype=np.int64)
+        for s, section in enumerate(sections):
+            for col, entry in enumerate(lib.entries):
+                indicator_id = entry.indicator_id
+                # Likelihood, impact and detectability are always 1..5 scales.
+                answer_type = entry.answer_type if s == 0 else "scale_1_5"
+                codes[s, :, col] = self.encode_column(answer_type, [answers.get(indicator_id, None) for answers in section])
+        return EncodedAnswers(
+            indicator_ids=lib.indicator_ids,
+            codes=codes.astype(_smallest_code_dtype(len(self._values))),
+            values=self.values,
+        )
@@ -1,34 +1,127 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
+import numpy as np
+
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
 from praf.engine.classifier import DomainClassification
 from praf.domain.domains import RiskDomain
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Explanation:
     top_contributors_by_domain: Dict[RiskDomain, List[Tuple[str, float]]]
 
 
+@dataclass(frozen=True)
+class BatchExplanation:
+    """Top contributors for N assessments.
+
+    ``positions`` and ``contributions`` are ``(N, len(domains), top_n)``:
+    library positions of each domain's top indicators, highest contribution
+    first, and their contributions. Domains with fewer than ``top_n``
+    indicators are padded with -1 / NaN.
+    """
+
+    indicator_ids: Tuple[str, ...]
+    domains: Tuple[RiskDomain, ...]
+    positions: np.ndarray
+    contributions: np.ndarray
+
+    def top_for(self, row: int, domain: RiskDomain) -> List[Tuple[str, float]]:
+        """Row ``row``'s top contributors of ``domain`` in the ``explain`` layout."""
+        j = self.domains.index(domain)
+        return [
+            (self.indicator_ids[p], float(c))
+            for p, c in zip(self.positions[row, j], self.contributions[row, j])
+            if p >= 0
+        ]
+
+
 def explain(
     classifications: Dict[RiskDomain, DomainClassification],
     indicator_details: Dict[str, Dict[str, Any]],
     local_scores: Dict[str, float],
     top_n: int = 5,
+    library: Optional[CompiledLibrary] = None,
 ) -> Explanation:
+    domain_of = library.domain_of if library is not None else {}
     domain_to_items: Dict[RiskDomain, List[Tuple[str, float]]] = {}
 
     for indicator_id, meta in indicator_details.items():
-        domain = RiskDomain(meta["domain"])
+        domain = domain_of.get(indicator_id) or RiskDomain(meta["domain"])
         score = float(local_scores.get(indicator_id, 0.0))
         domain_to_items.setdefault(domain, []).append((indicator_id, score))
 
+    # heapq.nlargest is a partial selection, O(len * log top_n), and is
+    # documented to equal sorted(..., reverse=True)[:n]: ties keep their
+    # indicator order, so reports are stable between runs.
+    n = max(0, int(top_n))
     top_by_domain: Dict[RiskDomain, List[Tuple[str, float]]] = {}
     for domain in classifications.keys():
         items = domain_to_items.get(domain, [])
-        items_sorted = sorted(items, key=lambda x: x[1], reverse=True)
-        top_by_domain[domain] = items_sorted[: max(0, int(top_n))]
+        top_by_domain[domain] = heapq.nlargest(n, items, key=lambda x: x[1])
 
     return Explanation(top_contributors_by_domain=top_by_domain)
+
+
+def _stable_top(block: np.ndarray, n: int) -> np.ndarray:
+    """Column indices of the ``n`` largest values per row, ties by column order."""
+    return np.argsort(-block, axis=1, kind="stable")[:, :n]
+
+
+def explain_batch(
+    contributions: np.ndarray,
+    top_n: int = 5,
+    library: Optional[CompiledLibrary] = None,
+) -> BatchExplanation:
+    """Vectorised ``explain`` over an ``(N, K)`` contribution matrix.
+
+    Each domain's columns are reduced with ``np.argpartition`` and only the
+    selected ``top_n`` are sorted. Ordering is by contribution descending,
+    then library position ascending, which is what ``explain`` yields for
+    details in library order. Rows whose ``top_n``-th value is tied with an
+    unselected value fall back to a stable sort, so the choice among equal
+    contributions never depends on the partition.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    values = np.asarray(contributions, dtype=np.float64)
+    n_rows = values.shape[0]
+    n = max(0, int(top_n))
+
+    positions = np.full((n_rows, len(lib.domains), n), -1, dtype=np.intp)
+    top_values = np.full((n_rows, len(lib.domains), n), np.nan, dtype=np.float64)
+    for j in range(len(lib.domains)):
+        columns = np.flatnonzero(lib.domain_index == j)
+        if columns.size == 0 or n == 0 or n_rows == 0:
+            continue
+        block = values[:, columns]
+        m = min(n, columns.size)
+
+        if m < columns.size:
+            part = np.argpartition(-block, m - 1, axis=1)[:, :m]
+            picked = np.take_along_axis(block, part, axis=1)
+            cutoff = picked.min(axis=1)
+            # Rows where more than m values reach the cutoff are ambiguous.
+            ambiguous = (block >= cutoff[:, None]).sum(axis=1) > m
+            # Order the selection by column, then stably by value descending.
+            part = np.sort(part, axis=1)
+            picked = np.take_along_axis(block, part, axis=1)
+            top = np.take_along_axis(part, np.argsort(-picked, axis=1, kind="stable"), axis=1)
+            if ambiguous.any():
+                top[ambiguous] = _stable_top(block[ambiguous], m)
+        else:
+            top = _stable_top(block, m)
+
+        positions[:, j, :m] = columns[top]
+        top_values[:, j, :m] = np.take_along_axis(block, top, axis=1)
+
+    return BatchExplanation(
+        indicator_ids=lib.indicator_ids,
+        domains=lib.domains,
+        positions=positions,
+        contributions=top_values,
+    )
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import List
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from praf.domain.activities import Context, ProjectStage
 from praf.domain.risk_patterns import RiskPattern, UserRisk
@@ -15,7 +18,7 @@ class GateGuidance(str, Enum):
     REVIEW_BEFORE_NEXT_STAGE = "review_before_next_stage"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RiskGuidance:
     risk_id: str
     pattern: RiskPattern
@@ -26,13 +29,18 @@ class RiskGuidance:
     expected_evidence: List[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GuidanceSummary:
     overall_gate_guidance: GateGuidance
     rationale: str
     items: List[RiskGuidance]
 
 
+PRIORITIES: Tuple[str, ...] = ("critical", "high", "medium", "low")
+
+GUIDANCE_RATIONALE = "Overall guidance is derived from the highest priority mapped risks in the selected context"
+
+
 def _priority(l: int, i: int, d: int) -> str:
     severity = l + i + d
     if i >= 5 and l >= 4:
@@ -56,116 +64,136 @@ def _gate_from_priority(stage: ProjectStage, priority: str) -> GateGuidance:
     return GateGuidance.PROCEED
 
 
+_PATTERN_ACTIONS: Dict[RiskPattern, Tuple[str, ...]] = {
+    RiskPattern.SUPPLIER_RELIABILITY: (
+        "Define supplier change notification rule",
+        "Define incoming inspection criteria",
+        "Define second source or contingency plan",
+    ),
+    RiskPattern.PROCESS_VARIABILITY: (
+        "Define critical process parameters",
+        "Define batch variability monitoring",
+        "Define acceptance criteria for release decisions",
+    ),
+    RiskPattern.DESIGN_MATURITY: (
+        "Create assumptions and rationale log",
+        "Define design review checkpoint and outputs",
+        "Define change control for design decisions",
+    ),
+    RiskPattern.MEASUREMENT_INTEGRITY: (
+        "Define calibration and drift monitoring approach",
+        "Define environmental sensitivity checks",
+        "Define criteria for re verification triggers",
+    ),
+    RiskPattern.DATA_INTEGRITY: (
+        "Define data capture plan and ownership",
+        "Define audit trail for changes and decisions",
+        "Define data quality checks",
+    ),
+    RiskPattern.EVIDENCE_SUFFICIENCY: (
+        "Define what evidence is required for this stage",
+        "Define test plan or evaluation plan",
+        "Define acceptance criteria for evidence completeness",
+    ),
+    RiskPattern.GOVERNANCE_ACCOUNTABILITY: (
+        "Define decision thresholds and escalation rules",
+        "Define accountable owner for each decision gate",
+        "Define decision log format and review cadence",
+    ),
+    RiskPattern.REGULATORY_READINESS: (
+        "Define required documentation set for this stage",
+        "Define traceability between requirements and evidence",
+        "Define review checklist for readiness gaps",
+    ),
+    RiskPattern.OPERATIONAL_CONTINUITY: (
+        "Define failure scenarios and recovery steps",
+        "Define monitoring and incident logging",
+        "Define continuity expectations and responsibilities",
+    ),
+    RiskPattern.OTHER: (
+        "Clarify risk statement and expected impact",
+        "Define a control objective",
+        "Define evidence to confirm controls are working",
+    ),
+}
+
+
+_PATTERN_EVIDENCE: Dict[RiskPattern, Tuple[str, ...]] = {
+    RiskPattern.SUPPLIER_RELIABILITY: (
+        "Supplier change rule document",
+        "Incoming inspection checklist",
+        "Supplier contingency note",
+    ),
+    RiskPattern.PROCESS_VARIABILITY: (
+        "Critical process parameters list",
+        "Variability monitoring plan",
+        "Release acceptance criteria",
+    ),
+    RiskPattern.DESIGN_MATURITY: (
+        "Assumptions and rationale log",
+        "Design review record",
+        "Change control record",
+    ),
+    RiskPattern.MEASUREMENT_INTEGRITY: (
+        "Calibration plan",
+        "Sensitivity check record",
+        "Re verification trigger criteria",
+    ),
+    RiskPattern.DATA_INTEGRITY: (
+        "Data capture plan",
+        "Audit trail entry template",
+        "Data quality check list",
+    ),
+    RiskPattern.EVIDENCE_SUFFICIENCY: (
+        "Evidence checklist for this stage",
+        "Test or evaluation plan",
+        "Evidence acceptance criteria",
+    ),
+    RiskPattern.GOVERNANCE_ACCOUNTABILITY: (
+        "Escalation thresholds document",
+        "Decision ownership matrix",
+        "Decision log sample entry",
+    ),
+    RiskPattern.REGULATORY_READINESS: (
+        "Documentation checklist",
+        "Traceability mapping note",
+        "Readiness gap review record",
+    ),
+    RiskPattern.OPERATIONAL_CONTINUITY: (
+        "Failure scenarios list",
+        "Incident log template",
+        "Recovery steps note",
+    ),
+    RiskPattern.OTHER: (
+        "Risk clarification note",
+        "Control objective statement",
+        "Evidence definition note",
+    ),
+}
+
+
 def _actions_for_pattern(pattern: RiskPattern) -> List[str]:
-    mapping = {
-        RiskPattern.SUPPLIER_RELIABILITY: [
-            "Define supplier change notification rule",
-            "Define incoming inspection criteria",
-            "Define second source or contingency plan",
-        ],
-        RiskPattern.PROCESS_VARIABILITY: [
-            "Define critical process parameters",
-            "Define batch variability monitoring",
-            "Define acceptance criteria for release decisions",
-        ],
-        RiskPattern.DESIGN_MATURITY: [
-            "Create assumptions and rationale log",
-            "Define design review checkpoint and outputs",
-            "Define change control for design decisions",
-        ],
-        RiskPattern.MEASUREMENT_INTEGRITY: [
-            "Define calibration and drift monitoring approach",
-            "Define environmental sensitivity checks",
-            "Define criteria for re verification triggers",
-        ],
-        RiskPattern.DATA_INTEGRITY: [
-            "Define data capture plan and ownership",
-            "Define audit trail for changes and decisions",
-            "Define data quality checks",
-        ],
-        RiskPattern.EVIDENCE_SUFFICIENCY: [
-            "Define what evidence is required for this stage",
-            "Define test plan or evaluation plan",
-            "Define acceptance criteria for evidence completeness",
-        ],
-        RiskPattern.GOVERNANCE_ACCOUNTABILITY: [
-            "Define decision thresholds and escalation rules",
-            "Define accountable owner for each decision gate",
-            "Define decision log format and review cadence",
-        ],
-        RiskPattern.REGULATORY_READINESS: [
-            "Define required documentation set for this stage",
-            "Define traceability between requirements and evidence",
-            "Define review checklist for readiness gaps",
-        ],
-        RiskPattern.OPERATIONAL_CONTINUITY: [
-            "Define failure scenarios and recovery steps",
-            "Define monitoring and incident logging",
-            "Define continuity expectations and responsibilities",
-        ],
-        RiskPattern.OTHER: [
-            "Clarify risk statement and expected impact",
-            "Define a control objective",
-            "Define evidence to confirm controls are working",
-        ],
-    }
-    return list(mapping.get(pattern, mapping[RiskPattern.OTHER]))
+    return list(_PATTERN_ACTIONS.get(pattern, _PATTERN_ACTIONS[RiskPattern.OTHER]))
 
 
 def _evidence_for_pattern(pattern: RiskPattern) -> List[str]:
-    mapping = {
-        RiskPattern.SUPPLIER_RELIABILITY: [
-            "Supplier change rule document",
-            "Incoming inspection checklist",
-            "Supplier contingency note",
-        ],
-        RiskPattern.PROCESS_VARIABILITY: [
-            "Critical process parameters list",
-            "Variability monitoring plan",
-            "Release acceptance criteria",
-        ],
-        RiskPattern.DESIGN_MATURITY: [
-            "Assumptions and rationale log",
-            "Design review record",
-            "Change control record",
-        ],
-        RiskPattern.MEASUREMENT_INTEGRITY: [
-            "Calibration plan",
-            "Sensitivity check record",
-            "Re verification trigger criteria",
-        ],
-        RiskPattern.DATA_INTEGRITY: [
-            "Data capture plan",
-            "Audit trail entry template",
-            "Data quality check list",
-        ],
-        RiskPattern.EVIDENCE_SUFFICIENCY: [
-            "Evidence checklist for this stage",
-            "Test or evaluation plan",
-            "Evidence acceptance criteria",
-        ],
-        RiskPattern.GOVERNANCE_ACCOUNTABILITY: [
-            "Escalation thresholds document",
-            "Decision ownership matrix",
-            "Decision log sample entry",
-        ],
-        RiskPattern.REGULATORY_READINESS: [
-            "Documentation checklist",
-            "Traceability mapping note",
-            "Readiness gap review record",
-        ],
-        RiskPattern.OPERATIONAL_CONTINUITY: [
-            "Failure scenarios list",
-            "Incident log template",
-            "Recovery steps note",
-        ],
-        RiskPattern.OTHER: [
-            "Risk clarification note",
-            "Control objective statement",
-            "Evidence definition note",
-        ],
-    }
-    return list(mapping.get(pattern, mapping[RiskPattern.OTHER]))
+    return list(_PATTERN_EVIDENCE.get(pattern, _PATTERN_EVIDENCE[RiskPattern.OTHER]))
+
+
+def _build_guidance(ctx: Context, r: UserRisk, pr: str) -> RiskGuidance:
+    gate = _gate_from_priority(ctx.stage, pr)
+
+    why = f"Pattern is {r.pattern.value} with L I D {r.likelihood} {r.impact} {r.detectability} at stage {ctx.stage.value}"
+
+    return RiskGuidance(
+        risk_id=r.risk_id,
+        pattern=r.pattern,
+        priority=pr,
+        gate_guidance=gate,
+        why=why,
+        recommended_actions=_actions_for_pattern(r.pattern),
+        expected_evidence=_evidence_for_pattern(r.pattern),
+    )
 
 
 def generate_guidance(ctx: Context, risks: List[UserRisk]) -> GuidanceSummary:
@@ -176,21 +204,7 @@ def generate_guidance(ctx: Context, risks: List[UserRisk]) -> GuidanceSummary:
             continue
 
         pr = _priority(r.likelihood, r.impact, r.detectability)
-        gate = _gate_from_priority(ctx.stage, pr)
-
-        why = f"Pattern is {r.pattern.value} with L I D {r.likelihood} {r.impact} {r.detectability} at stage {ctx.stage.value}"
-
-        items.append(
-            RiskGuidance(
-                risk_id=r.risk_id,
-                pattern=r.pattern,
-                priority=pr,
-                gate_guidance=gate,
-                why=why,
-                recommended_actions=_actions_for_pattern(r.pattern),
-                expected_evidence=_evidence_for_pattern(r.pattern),
-            )
-        )
+        items.append(_build_guidance(ctx, r, pr))
 
     order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
     items_sorted = sorted(items, key=lambda x: order.get(x.priority, 9))
@@ -205,10 +219,238 @@ def generate_guidance(ctx: Context, risks: List[UserRisk]) -> GuidanceSummary:
         if it.gate_guidance == GateGuidance.REVIEW_BEFORE_NEXT_STAGE and overall == GateGuidance.PROCEED:
             overall = GateGuidance.REVIEW_BEFORE_NEXT_STAGE
 
-    rationale = "Overall guidance is derived from the highest priority mapped risks in the selected context"
-
     return GuidanceSummary(
         overall_gate_guidance=overall,
-        rationale=rationale,
+        rationale=GUIDANCE_RATIONALE,
         items=items_sorted,
     )
+
+
+class GuidanceStream:
+    """Lazy, priority-ordered view of a context's guidance.
+
+    Iterating yields the same ``RiskGuidance`` items, in the same order, as
+    ``generate_guidance(...).items``, but builds each item only when it is
+    consumed. Risks are bucketed by their priority instead of sorted:
+    critical risks are yielded as soon as they are read from ``risks``
+    (nothing can outrank them), the high / medium / low buckets once the
+    input is exhausted.
+
+    ``overall_gate_guidance`` reads only as much of ``risks`` as it needs:
+    the first critical risk settles it as ``HOLD_PENDING_CONTROLS``.
+    """
+
+    def __init__(self, ctx: Context, risks: Iterable[UserRisk]) -> None:
+        self.ctx = ctx
+        self._source: Iterator[UserRisk] = iter(risks)
+        self._critical: List[UserRisk] = []
+        self._buckets: Tuple[List[UserRisk], ...] = ([], [], [])  # high, medium, low
+        self._exhausted = False
+        self._items = self._generate()
+
+    def _pull(self) -> bool:
+        """Read the next mapped risk into its bucket; False once the input is exhausted."""
+        for r in self._source:
+            if r.pattern is None:
+                continue
+            pr = _priority(r.likelihood, r.impact, r.detectability)
+            if pr == "critical":
+                self._critical.append(r)
+            else:
+                self._buckets[PRIORITIES.index(pr) - 1].append(r)
+            return True
+        self._exhausted = True
+        return False
+
+    def _generate(self) -> Iterator[RiskGuidance]:
+        emitted = 0
+        while True:
+            while emitted < len(self._critical):
+                yield _build_guidance(self.ctx, self._critical[emitted], "critical")
+                emitted += 1
+            if not self._pull():
+                break
+        for pr, bucket in zip(PRIORITIES[1:], self._buckets):
+            for r in bucket:
+                yield _build_guidance(self.ctx, r, pr)
+
+    def __iter__(self) -> "GuidanceStream":
+        return self
+
+    def __next__(self) -> RiskGuidance:
+        return next(self._items)
+
+    @property
+    def overall_gate_guidance(self) -> GateGuidance:
+        while not self._critical and not self._exhausted:
+            self._pull()
+        if self._critical:
+            return GateGuidance.HOLD_PENDING_CONTROLS
+        for pr, bucket in zip(PRIORITIES[1:], self._buckets):
+            if bucket:
+                return _gate_from_priority(self.ctx.stage, pr)
+        return GateGuidance.PROCEED
+
+    def take(self, n: int) -> List[RiskGuidance]:
+        """The next ``n`` items (fewer if the stream runs out)."""
+        return list(islice(self, n))
+
+
+def iter_guidance(ctx: Context, risks: Iterable[UserRisk]) -> GuidanceStream:
+    return GuidanceStream(ctx, risks)
+
+
+PATTERNS: Tuple[RiskPattern, ...] = tuple(RiskPattern)
+STAGES: Tuple[ProjectStage, ...] = tuple(ProjectStage)
+GATES: Tuple[GateGuidance, ...] = tuple(GateGuidance)
+
+# Severity of each gate when combining risks into an overall gate, matching
+# generate_guidance: hold > proceed with conditions > review > proceed.
+_GATE_RANK = np.array(
+    [
+        {
+            GateGuidance.PROCEED: 0,
+            GateGuidance.REVIEW_BEFORE_NEXT_STAGE: 1,
+            GateGuidance.PROCEED_WITH_CONDITIONS: 2,
+            GateGuidance.HOLD_PENDING_CONTROLS: 3,
+        }[g]
+        for g in GATES
+    ],
+    dtype=np.int8,
+)
+_RANK_GATE = np.argsort(_GATE_RANK).astype(np.int8)
+
+_ACTIONS_BY_CODE: Tuple[Tuple[str, ...], ...] = tuple(_PATTERN_ACTIONS[p] for p in PATTERNS)
+_EVIDENCE_BY_CODE: Tuple[Tuple[str, ...], ...] = tuple(_PATTERN_EVIDENCE[p] for p in PATTERNS)
+
+_GATE_CODE = {g: code for code, g in enumerate(GATES)}
+_EARLY_STAGE = np.array([s in {ProjectStage.CONCEPT, ProjectStage.DESIGN} for s in STAGES], dtype=bool)
+
+
+@dataclass(frozen=True)
+class BatchGuidance:
+    """Guidance for a whole risk register, one entry per register row.
+
+    ``priority_codes`` index ``PRIORITIES`` and ``gate_codes`` index
+    ``GATES``; rows without a pattern are -1 and, as in
+    ``generate_guidance``, take no part in the overall gate.
+    ``overall_gate_codes`` has one entry per context group. Actions and
+    evidence are the shared, immutable per-pattern tuples.
+    """
+
+    pattern_codes: np.ndarray
+    stage_codes: np.ndarray
+    likelihood: np.ndarray
+    impact: np.ndarray
+    detectability: np.ndarray
+    priority_codes: np.ndarray
+    gate_codes: np.ndarray
+    overall_gate_codes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pattern_codes)
+
+    def priority(self, row: int) -> Optional[str]:
+        code = self.priority_codes[row]
+        return PRIORITIES[code] if code >= 0 else None
+
+    def gate(self, row: int) -> Optional[GateGuidance]:
+        code = self.gate_codes[row]
+        return GATES[code] if code >= 0 else None
+
+    def actions(self, row: int) -> Tuple[str, ...]:
+        code = self.pattern_codes[row]
+        return _ACTIONS_BY_CODE[code] if code >= 0 else ()
+
+    def evidence(self, row: int) -> Tuple[str, ...]:
+        code = self.pattern_codes[row]
+        return _EVIDENCE_BY_CODE[code] if code >= 0 else ()
+
+    def why(self, row: int) -> Optional[str]:
+        code = self.pattern_codes[row]
+        if code < 0:
+            return None  # unmapped risks get no guidance, as in generate_guidance
+        pattern = PATTERNS[code]
+        return (
+            f"Pattern is {pattern.value} with L I D {self.likelihood[row]} {self.impact[row]} {self.detectability[row]} "
+            f"at stage {STAGES[self.stage_codes[row]].value}"
+        )
+
+    def overall_gates(self) -> List[GateGuidance]:
+        return [GATES[code] for code in self.overall_gate_codes]
+
+
+def register_columns(risks: Sequence[UserRisk]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """``(pattern_codes, likelihood, impact, detectability)`` arrays for a list of ``UserRisk``."""
+    pattern_index = {p: code for code, p in enumerate(PATTERNS)}
+    patterns = np.array([pattern_index[r.pattern] if r.pattern is not None else -1 for r in risks], dtype=np.int16)
+    l = np.array([r.likelihood for r in risks], dtype=np.int64)
+    i = np.array([r.impact for r in risks], dtype=np.int64)
+    d = np.array([r.detectability for r in risks], dtype=np.int64)
+    return patterns, l, i, d
+
+
+def generate_guidance_batch(
+    pattern_codes: np.ndarray,
+    likelihood: np.ndarray,
+    impact: np.ndarray,
+    detectability: np.ndarray,
+    stage_codes: np.ndarray,
+    context_index: Optional[np.ndarray] = None,
+    n_contexts: Optional[int] = None,
+) -> BatchGuidance:
+    """Vectorised ``generate_guidance`` over register columns.
+
+    ``pattern_codes`` index ``PATTERNS`` (-1 for an unmapped risk),
+    ``stage_codes`` index ``STAGES`` and ``context_index`` assigns each row
+    to one of ``n_contexts`` groups (all rows form a single group when
+    omitted). Priority and gate use the same rules as ``_priority`` and
+    ``_gate_from_priority``; the overall gate of every group is one
+    ``np.maximum.at`` reduction.
+    """
+    patterns = np.asarray(pattern_codes, dtype=np.int16)
+    l = np.asarray(likelihood)
+    i = np.asarray(impact)
+    d = np.asarray(detectability)
+    stages = np.broadcast_to(np.asarray(stage_codes, dtype=np.int16), patterns.shape)
+    mapped = patterns >= 0
+
+    severity = l + i + d
+    priority = np.select(
+        [(i >= 5) & (l >= 4), severity >= 12, severity >= 9],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+
+    gate = np.select(
+        [priority == 0, (priority == 1) & _EARLY_STAGE[stages], priority <= 2],
+        [
+            _GATE_CODE[GateGuidance.HOLD_PENDING_CONTROLS],
+            _GATE_CODE[GateGuidance.PROCEED_WITH_CONDITIONS],
+            _GATE_CODE[GateGuidance.REVIEW_BEFORE_NEXT_STAGE],
+        ],
+        default=_GATE_CODE[GateGuidance.PROCEED],
+    ).astype(np.int8)
+    priority[~mapped] = -1
+    gate[~mapped] = -1
+
+    if context_index is None:
+        groups = np.zeros(patterns.shape, dtype=np.intp)
+        n_groups = 1 if n_contexts is None else int(n_contexts)
+    else:
+        groups = np.asarray(context_index, dtype=np.intp)
+        n_groups = int(n_contexts) if n_contexts is not None else int(groups.max(initial=-1)) + 1
+
+    overall_rank = np.zeros(n_groups, dtype=np.int8)
+    np.maximum.at(overall_rank, groups[mapped], _GATE_RANK[gate[mapped]])
+
+    return BatchGuidance(
+        pattern_codes=patterns,
+        stage_codes=np.asarray(stages),
+        likelihood=l,
+        impact=i,
+        detectability=d,
+        priority_codes=priority,
+        gate_codes=gate,
+        overall_gate_codes=_RANK_GATE[overall_rank],
+    )
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
+from praf.domain.domains import RiskDomain
+from praf.engine.classifier import DomainClassification, RiskLevel, classify_score
+from praf.engine.rules import Decision, DecisionResult
+from praf.engine.scorer import _map_scale_1_5, _response_scale
+
+
+_UNSET: Any = object()
+
+_LEVEL_DECISION = {
+    RiskLevel.ACCEPTABLE: Decision.PROCEED,
+    RiskLevel.ACTION_REQUIRED: Decision.REVISE,
+    RiskLevel.ESCALATION_REQUIRED: Decision.ESCALATE,
+}
+
+
+@dataclass(frozen=True)
+class AnswerUpdate:
+    indicator_id: str
+    domain: RiskDomain
+    previous_score: float
+    score: float
+    previous_level: RiskLevel
+    level: RiskLevel
+    previous_overall: Decision
+    overall: Decision
+
+    @property
+    def level_changed(self) -> bool:
+        return self.level != self.previous_level
+
+    @property
+    def decision_changed(self) -> bool:
+        return self.overall != self.previous_overall
+
+
+def _index(total: float, weight: float, dw: float) -> float:
+    base_index = 100.0 * total / weight if weight > 0.0 else 0.0
+    return float(min(100.0, base_index * dw))
+
+
+class IncrementalAssessment:
+    """Stateful assessment that re-scores one answer at a time.
+
+    Holds each indicator's contribution plus running per-domain and
+    per-category sums, weight totals and classifications. ``set_answer``
+    re-scores the touched indicator only and updates its domain and category
+    in O(1), independent of library size.
+
+    The indices equal ``aggregate_scores`` on the same inputs up to
+    floating-point rounding: a running sum is updated by subtracting the old
+    contribution and adding the new one, so after many edits it can drift by
+    a few ulps from a fresh left-to-right sum. ``refresh`` re-sums exactly.
+    """
+
+    def __init__(
+        self,
+        responses: Mapping[str, Any],
+        likelihood: Mapping[str, Any],
+        impact: Mapping[str, Any],
+        detectability: Mapping[str, Any],
+        domain_weights: Mapping[RiskDomain, float],
+        low_threshold: float,
+        high_threshold: float,
+        library: Optional[CompiledLibrary] = None,
+    ) -> None:
+        self.library = library if library is not None else COMPILED_LIBRARY
+        self.low_threshold = float(low_threshold)
+        self.high_threshold = float(high_threshold)
+
+        entries = self.library.entries
+        self._inputs: List[List[Any]] = [
+            [
+                responses.get(e.indicator_id, None),
+                likelihood.get(e.indicator_id, 3),
+                impact.get(e.indicator_id, 3),
+                detectability.get(e.indicator_id, 3),
+            ]
+            for e in entries
+        ]
+        self._contribution: List[float] = [0.0] * len(entries)
+
+        self._domain_dw: Dict[RiskDomain, float] = {}
+        self._domain_weight: Dict[RiskDomain, float] = {}
+        self._category_dw: Dict[str, float] = {}
+        self._category_weight: Dict[str, float] = {}
+        for e in entries:
+            dw = float(domain_weights.get(e.domain, 1.0))
+            category = e.category.value
+            self._domain_dw[e.domain] = dw
+            self._domain_weight[e.domain] = self._domain_weight.get(e.domain, 0.0) + e.weight_ex_domain
+            # Mirrors aggregate_scores: a category takes the domain weight of
+            # its last indicator in library order.
+            self._category_dw[category] = dw
+            self._category_weight[category] = self._category_weight.get(category, 0.0) + e.weight_ex_domain
+
+        for position in range(len(entries)):
+            self._contribution[position] = self._score(position)
+        self.refresh()
+
+    def _score(self, position: int) -> float:
+        entry = self.library.entries[position]
+        r, l, i, d = self._inputs[position]
+        r_raw = _response_scale(entry.answer_type, r)
+        r_scale = 6.0 - r_raw if entry.invert_response else r_raw
+        base = (r_scale + _map_scale_1_5(l) + _map_scale_1_5(i) + _map_scale_1_5(d)) / 4.0
+        severity = (base - 1.0) / 4.0
+        return float(severity * entry.weight_ex_domain)
+
+    def refresh(self) -> None:
+        """Recompute every running sum and classification from the stored contributions."""
+        self._domain_sum: Dict[RiskDomain, float] = {d: 0.0 for d in self._domain_weight}
+        self._category_sum: Dict[str, float] = {c: 0.0 for c in self._category_weight}
+        for entry, contribution in zip(self.library.entries, self._contribution):
+            self._domain_sum[entry.domain] = float(self._domain_sum[entry.domain] + contribution)
+            self._category_sum[entry.category.value] = float(self._category_sum[entry.category.value] + contribution)
+
+        self._level: Dict[RiskDomain, RiskLevel] = {}
+        self._level_counts: Dict[RiskLevel, int] = {level: 0 for level in RiskLevel}
+        for domain in self._domain_sum:
+            level = classify_score(self._domain_index(domain), self.low_threshold, self.high_threshold)
+            self._level[domain] = level
+            self._level_counts[level] += 1
+
+    def _domain_index(self, domain: RiskDomain) -> float:
+        return _index(self._domain_sum[domain], self._domain_weight[domain], self._domain_dw[domain])
+
+    @property
+    def overall(self) -> Decision:
+        if self._level_counts[RiskLevel.ESCALATION_REQUIRED]:
+            return Decision.ESCALATE
+        if self._level_counts[RiskLevel.ACTION_REQUIRED]:
+            return Decision.REVISE
+        return Decision.PROCEED
+
+    @property
+    def domain_scores(self) -> Dict[RiskDomain, float]:
+        return {d: self._domain_index(d) for d in self._domain_sum}
+
+    @property
+    def category_scores(self) -> Dict[str, float]:
+        return {
+            c: _index(self._category_sum[c], self._category_weight[c], self._category_dw[c]) for c in self._category_sum
+        }
+
+    @property
+    def local_scores(self) -> Dict[str, float]:
+        return dict(zip(self.library.indicator_ids, self._contribution))
+
+    @property
+    def classifications(self) -> Dict[RiskDomain, DomainClassification]:
+        return {
+            d: DomainClassification(domain=d, score=self._domain_index(d), level=self._level[d]) for d in self._domain_sum
+        }
+
+    @property
+    def decision(self) -> DecisionResult:
+        return DecisionResult(
+            overall=self.overall,
+            per_domain={d: _LEVEL_DECISION[level] for d, level in self._level.items()},
+        )
+
+    def set_answer(
+        self,
+        indicator_id: str,
+        response: Any = _UNSET,
+        likelihood: Any = _UNSET,
+        impact: Any = _UNSET,
+        detectability: Any = _UNSET,
+    ) -> AnswerUpdate:
+        """Change any of one indicator's four inputs and update the assessment.
+
+        Inputs that are not passed keep their current value. Raises
+        ``KeyError`` for an indicator that is not in the library.
+        """
+        position = self.library.position[indicator_id]
+        entry = self.library.entries[position]
+        inputs = self._inputs[position]
+        for slot, value in enumerate((response, likelihood, impact, detectability)):
+            if value is not _UNSET:
+                inputs[slot] = value
+
+        domain = entry.domain
+        category = entry.category.value
+        previous_score = self._domain_index(domain)
+        previous_level = self._level[domain]
+        previous_overall = self.overall
+
+        contribution = self._score(position)
+        delta = contribution - self._contribution[position]
+        self._contribution[position] = contribution
+        self._domain_sum[domain] = float(self._domain_sum[domain] + delta)
+        self._category_sum[category] = float(self._category_sum[category] + delta)
+
+        score = self._domain_index(domain)
+        level = classify_score(score, self.low_threshold, self.high_threshold)
+        if level != previous_level:
+            self._level_counts[previous_level] -= 1
+            self._level_counts[level] += 1
+            self._level[domain] = level
+
+        return AnswerUpdate(
+            indicator_id=indicator_id,
+            domain=domain,
+            previous_score=previous_score,
+            score=score,
+            previous_level=previous_level,
+            level=level,
+            previous_overall=previous_overall,
+            overall=self.overall,
+        )
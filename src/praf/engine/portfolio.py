@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import io
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from praf.domain.activities import Activity, Context, ProjectStage
+from praf.domain.domains import RiskDomain
+from praf.engine.classifier import RiskLevel
+from praf.engine.compact import CompactResult
+from praf.engine.rules import Decision
+
+
+ACTIVITIES: Tuple[Activity, ...] = tuple(Activity)
+STAGES: Tuple[ProjectStage, ...] = tuple(ProjectStage)
+DOMAINS: Tuple[RiskDomain, ...] = tuple(RiskDomain)
+
+CUBE_FORMAT = "praf.cube/v1"
+
+
+def _codes(values: Union[np.ndarray, Sequence], members: Tuple) -> np.ndarray:
+    """Enum ordinals for ``values``, which may already be integer codes."""
+    array = np.asarray(values)
+    if array.dtype.kind in "iu":
+        return array.astype(np.intp)
+    lookup = {m: i for i, m in enumerate(members)}
+    return np.array([lookup[type(members[0])(v)] for v in values], dtype=np.intp)
+
+
+class PortfolioCube:
+    """Mergeable rollup of many assessments, grouped by ``Activity`` x ``ProjectStage``.
+
+    Every cell holds fixed-size integer counters only:
+
+    - ``level_counts``: ``(A, S, D, len(RiskLevel))`` domain levels
+    - ``decision_counts``: ``(A, S, len(Decision))`` overall decisions
+    - ``score_histogram``: ``(A, S, D, bins)`` domain indices in equal-width
+      bins over 0..100, the quantile sketch
+
+    Memory does not depend on how many assessments were added, and since
+    merging is integer addition, merging shards in any order equals one pass
+    over all of them. Quantiles are interpolated inside a bin, so they are
+    within one bin width (``100 / bins``) of the exact value.
+    """
+
+    def __init__(self, bins: int = 200) -> None:
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        self.bins = int(bins)
+        a, s, d = len(ACTIVITIES), len(STAGES), len(DOMAINS)
+        self.level_counts = np.zeros((a, s, d, len(RiskLevel)), dtype=np.int64)
+        self.decision_counts = np.zeros((a, s, len(Decision)), dtype=np.int64)
+        self.score_histogram = np.zeros((a, s, d, self.bins), dtype=np.int64)
+
+    @property
+    def n_assessments(self) -> int:
+        return int(self.decision_counts.sum())
+
+    def _bin(self, scores: np.ndarray) -> np.ndarray:
+        return np.clip((scores * (self.bins / 100.0)).astype(np.intp), 0, self.bins - 1)
+
+    def add_batch(
+        self,
+        activities: Union[np.ndarray, Sequence[Activity]],
+        stages: Union[np.ndarray, Sequence[ProjectStage]],
+        domain_scores: np.ndarray,
+        levels: np.ndarray,
+        decisions: np.ndarray,
+    ) -> None:
+        """Add N assessments.
+
+        ``domain_scores`` and ``levels`` are ``(N, len(RiskDomain))`` as from
+        ``aggregate_scores_batch``/``classify_batch``; NaN scores and level
+        -1 (domains the library does not cover) are skipped. ``decisions``
+        are ``decide_batch`` codes. Activities and stages are enum members,
+        their values, or ordinals.
+        """
+        a = _codes(activities, ACTIVITIES)
+        s = _codes(stages, STAGES)
+        scores = np.asarray(domain_scores, dtype=np.float64)
+        level_codes = np.asarray(levels, dtype=np.intp)
+        n = scores.shape[0]
+        if scores.shape != (n, len(DOMAINS)) or level_codes.shape != scores.shape or a.shape != (n,) or s.shape != (n,):
+            raise ValueError(f"expected {n} activities/stages and ({n}, {len(DOMAINS)}) scores and levels")
+
+        np.add.at(self.decision_counts, (a, s, np.asarray(decisions, dtype=np.intp)), 1)
+        rows, domains = np.nonzero(level_codes >= 0)
+        np.add.at(self.level_counts, (a[rows], s[rows], domains, level_codes[rows, domains]), 1)
+        rows, domains = np.nonzero(~np.isnan(scores))
+        np.add.at(self.score_histogram, (a[rows], s[rows], domains, self._bin(scores[rows, domains])), 1)
+
+    def add_result(self, ctx: Context, result: CompactResult) -> None:
+        levels = np.frombuffer(result.levels, dtype=np.uint8).astype(np.intp)
+        levels[levels == 0xFF] = -1
+        self.add_batch(
+            [ctx.activity],
+            [ctx.stage],
+            result.values[None, : len(DOMAINS)],
+            levels[None, :],
+            np.array([result.decision]),
+        )
+
+    def add_records(self, records: np.ndarray) -> None:
+        """Add structured records as written by ``praf.io.store.ResultStore``."""
+        self.add_batch(
+            records["activity"],
+            records["stage"],
+            records["domain_scores"],
+            records["domain_levels"],
+            records["decision"],
+        )
+
+    def merge(self, other: "PortfolioCube") -> "PortfolioCube":
+        """A new cube holding the assessments of both ``self`` and ``other``."""
+        if other.bins != self.bins:
+            raise ValueError(f"cannot merge cubes with {self.bins} and {other.bins} bins")
+        merged = PortfolioCube(self.bins)
+        merged.level_counts = self.level_counts + other.level_counts
+        merged.decision_counts = self.decision_counts + other.decision_counts
+        merged.score_histogram = self.score_histogram + other.score_histogram
+        return merged
+
+    @classmethod
+    def merge_all(cls, cubes: Iterable["PortfolioCube"]) -> "PortfolioCube":
+        """Merge shards, e.g. one cube per worker process; needs at least one cube."""
+        it = iter(cubes)
+        try:
+            merged = next(it)
+        except StopIteration:
+            raise ValueError("merge_all needs at least one cube") from None
+        for cube in it:
+            merged = merged.merge(cube)
+        return merged
+
+    def _select(self, array: np.ndarray, activity: Optional[Activity], stage: Optional[ProjectStage]) -> np.ndarray:
+        """Sum ``array`` over activities and stages unless one is fixed."""
+        a = slice(None) if activity is None else ACTIVITIES.index(Activity(activity))
+        s = slice(None) if stage is None else STAGES.index(ProjectStage(stage))
+        selected = array[a, s]
+        if activity is None:
+            selected = selected.sum(axis=0)
+        if stage is None:
+            selected = selected.sum(axis=0)
+        return selected
+
+    def levels(self, activity: Optional[Activity] = None, stage: Optional[ProjectStage] = None) -> np.ndarray:
+        """``(len(RiskDomain), len(RiskLevel))`` level counts, summed over whatever is not fixed."""
+        return self._select(self.level_counts, activity, stage)
+
+    def decisions(self, activity: Optional[Activity] = None, stage: Optional[ProjectStage] = None) -> np.ndarray:
+        """``(len(Decision),)`` overall decision counts."""
+        return self._select(self.decision_counts, activity, stage)
+
+    def quantiles(
+        self,
+        domain: RiskDomain,
+        qs: Sequence[float] = (0.5, 0.9, 0.99),
+        activity: Optional[Activity] = None,
+        stage: Optional[ProjectStage] = None,
+    ) -> np.ndarray:
+        """Approximate quantiles of ``domain``'s index; NaN when the selection is empty."""
+        hist = self._select(self.score_histogram, activity, stage)[DOMAINS.index(RiskDomain(domain))]
+        total = hist.sum()
+        qs = np.asarray(qs, dtype=np.float64)
+        if total == 0:
+            return np.full(qs.shape, np.nan)
+        cumulative = np.cumsum(hist)
+        # A tiny floor makes q=0 land on the first non-empty bin.
+        target = np.maximum(qs * total, np.finfo(np.float64).tiny)
+        b = np.minimum(np.searchsorted(cumulative, target, side="left"), self.bins - 1)
+        below = np.where(b > 0, cumulative[b - 1], 0)
+        fraction = np.where(hist[b] > 0, (target - below) / np.maximum(hist[b], 1), 0.0)
+        width = 100.0 / self.bins
+        return (b + np.clip(fraction, 0.0, 1.0)) * width
+
+    def to_bytes(self) -> bytes:
+        """Compressed ``.npz`` serialisation; mostly-empty cells compress to almost nothing."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            format=np.array(CUBE_FORMAT),
+            bins=np.array(self.bins),
+            axes=np.array([len(ACTIVITIES), len(STAGES), len(DOMAINS)]),
+            level_counts=self.level_counts,
+            decision_counts=self.decision_counts,
+            score_histogram=self.score_histogram,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PortfolioCube":
+        with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+            if str(npz["format"]) != CUBE_FORMAT:
+                raise ValueError(f"not a {CUBE_FORMAT} cube")
+            if npz["axes"].tolist() != [len(ACTIVITIES), len(STAGES), len(DOMAINS)]:
+                raise ValueError("cube was written with different activities, stages or domains")
+            cube = cls(int(npz["bins"]))
+            cube.level_counts = npz["level_counts"].astype(np.int64)
+            cube.decision_counts = npz["decision_counts"].astype(np.int64)
+            cube.score_histogram = npz["score_histogram"].astype(np.int64)
+        return cube
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PortfolioCube):
+            return NotImplemented
+        return (
+            self.bins == other.bins
+            and np.array_equal(self.level_counts, other.level_counts)
+            and np.array_equal(self.decision_counts, other.decision_counts)
+            and np.array_equal(self.score_histogram, other.score_histogram)
+        )
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Dict
 
+import numpy as np
+
 from praf.engine.classifier import DomainClassification, RiskLevel
 from praf.domain.domains import RiskDomain
 
@@ -14,7 +16,7 @@ class Decision(str, Enum):
     ESCALATE = "escalate"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DecisionResult:
     overall: Decision
     per_domain: Dict[RiskDomain, Decision]
@@ -36,3 +38,12 @@ def decide(classifications: Dict[RiskDomain, DomainClassification]) -> DecisionR
             overall = Decision.ESCALATE
 
     return DecisionResult(overall=overall, per_domain=per_domain)
+
+
+def decide_batch(levels: np.ndarray) -> np.ndarray:
+    """Overall decision codes (indexing ``tuple(Decision)``) from ``classify_batch`` level codes.
+
+    The overall decision is the most severe domain level, exactly as in
+    ``decide``; Decision and RiskLevel share the same severity order.
+    """
+    return np.asarray(levels).max(axis=-1, initial=0).astype(np.int8)
@@ -1,20 +1,38 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional, Sequence, Tuple, Union
 
-from praf.domain import INDICATOR_LIBRARY
-from praf.domain.natures import nature_weight_modifier
+import numpy as np
+
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
+from praf.engine.codec import AnswerCodec, EncodedAnswers, parser_for
 from praf.domain.domains import RiskDomain
-from praf.domain.indicators import Polarity
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScoreResult:
     local_scores: Dict[str, float]
     indicator_details: Dict[str, Dict[str, Any]]
 
 
+@dataclass(frozen=True)
+class BatchScoreResult:
+    """Scores for N assessments, one row per assessment.
+
+    Columns follow ``indicator_ids`` (library order).
+    ``contributions[n, k]`` equals ``local_scores[indicator_ids[k]]`` of the
+    scalar path for assessment ``n``; ``severity`` and ``domain_weight`` mirror
+    the matching ``indicator_details`` fields.
+    """
+
+    indicator_ids: Tuple[str, ...]
+    severity: np.ndarray
+    contributions: np.ndarray
+    weight_ex_domain: np.ndarray
+    domain_weight: np.ndarray
+
+
 def _map_yes_no(answer: Any) -> float:
     """Map a yes/no answer to the affirmative axis (yes = 5, no = 1).
 
@@ -22,67 +40,23 @@ def _map_yes_no(answer: Any) -> float:
     affirmative answer. Whether "yes" raises or lowers risk is decided later by
     the indicator's polarity (see ``score_indicators``), not here.
     """
-    if isinstance(answer, str):
-        v = answer.strip().lower()
-        if v in {"yes", "y", "true", "1"}:
-            return 5.0
-        if v in {"no", "n", "false", "0"}:
-            return 1.0
-        return 3.0
-    if isinstance(answer, bool):
-        return 5.0 if answer else 1.0
-    return 3.0
+    value = parser_for("yes_no")(answer)
+    return 3.0 if value is None else value
 
 
 def _map_low_med_high(answer: Any) -> float:
-    if isinstance(answer, str):
-        v = answer.strip().lower()
-        if v in {"low", "l"}:
-            return 1.0
-        if v in {"medium", "med", "m"}:
-            return 3.0
-        if v in {"high", "h"}:
-            return 5.0
-        return 3.0
-    if isinstance(answer, (int, float)):
-        x = float(answer)
-        if x <= 1.67:
-            return 1.0
-        if x <= 3.34:
-            return 3.0
-        return 5.0
-    return 3.0
+    value = parser_for("low_med_high")(answer)
+    return 3.0 if value is None else value
 
 
 def _map_scale_1_5(answer: Any) -> float:
-    if isinstance(answer, (int, float)):
-        x = float(answer)
-        if x < 1.0:
-            return 1.0
-        if x > 5.0:
-            return 5.0
-        return x
-    if isinstance(answer, str):
-        try:
-            x = float(answer.strip())
-            if x < 1.0:
-                return 1.0
-            if x > 5.0:
-                return 5.0
-            return x
-        except ValueError:
-            return 3.0
-    return 3.0
+    value = parser_for("scale_1_5")(answer)
+    return 3.0 if value is None else value
 
 
 def _response_scale(answer_type: str, answer: Any) -> float:
-    if answer_type == "yes_no":
-        return _map_yes_no(answer)
-    if answer_type == "low_med_high":
-        return _map_low_med_high(answer)
-    if answer_type == "scale_1_5":
-        return _map_scale_1_5(answer)
-    return 3.0
+    value = parser_for(answer_type)(answer)
+    return 3.0 if value is None else value
 
 
 def score_indicators(
@@ -91,22 +65,25 @@ def score_indicators(
     impact: Dict[str, Any],
     detectability: Dict[str, Any],
     domain_weights: Dict[RiskDomain, float],
+    library: Optional[CompiledLibrary] = None,
 ) -> ScoreResult:
+    lib = library if library is not None else COMPILED_LIBRARY
     local_scores: Dict[str, float] = {}
     details: Dict[str, Dict[str, Any]] = {}
 
-    for indicator_id, indicator in INDICATOR_LIBRARY.items():
+    for entry in lib.entries:
+        indicator_id = entry.indicator_id
         r = responses.get(indicator_id, None)
         l = likelihood.get(indicator_id, 3)
         i = impact.get(indicator_id, 3)
         d = detectability.get(indicator_id, 3)
 
-        r_raw = _response_scale(indicator.answer_type.value, r)
+        r_raw = _response_scale(entry.answer_type, r)
         # Apply polarity: for protective controls (risk when the control is
         # ABSENT) an affirmative answer lowers risk, so invert the raw axis
         # (5 <-> 1, 3 stays 3). Hazard-level indicators (risk when PRESENT) use
         # the raw axis directly.
-        if indicator.polarity == Polarity.RISK_WHEN_ABSENT:
+        if entry.invert_response:
             r_scale = 6.0 - r_raw
         else:
             r_scale = r_raw
@@ -123,16 +100,16 @@ def score_indicators(
         base = (r_scale + l_scale + i_scale + d_scale) / 4.0
         severity = (base - 1.0) / 4.0
 
-        dw = float(domain_weights.get(indicator.domain, 1.0))
-        nw = float(nature_weight_modifier(indicator.nature))
-        iw = float(indicator.base_weight)
+        dw = float(domain_weights.get(entry.domain, 1.0))
+        nw = entry.nature_weight
+        iw = entry.base_weight
 
         # The domain weight (dw) is constant across every indicator in a domain,
         # so it would cancel out of the weight-normalised mean below and have no
         # effect. It is therefore applied *after* normalisation in the
         # aggregator (as a sensitivity multiplier), and kept out of the
         # per-indicator contribution weight here.
-        weight_ex_domain = nw * iw
+        weight_ex_domain = entry.weight_ex_domain
 
         # Weighted contribution of this indicator to its domain's mean severity.
         # nw and iw vary within a domain, so they genuinely shape the ranking
@@ -141,10 +118,7 @@ def score_indicators(
 
         local_scores[indicator_id] = float(contribution)
         details[indicator_id] = {
-            "domain": indicator.domain.value,
-            "category": indicator.category.value,
-            "nature": indicator.nature.value,
-            "polarity": indicator.polarity.value,
+            **entry.metadata,
             "weights": {"domain": dw, "nature": nw, "indicator": iw},
             "domain_weight": dw,
             "weight_ex_domain": weight_ex_domain,
@@ -155,3 +129,91 @@ def score_indicators(
         }
 
     return ScoreResult(local_scores=local_scores, indicator_details=details)
+
+
+def _clip_scale(values: Any) -> np.ndarray:
+    """Vectorised ``_map_scale_1_5`` for numeric arrays; NaN marks a missing value."""
+    x = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(x), 3.0, np.clip(x, 1.0, 5.0))
+
+
+def build_batch_inputs(
+    responses: Sequence[Mapping[str, Any]],
+    likelihood: Sequence[Mapping[str, Any]],
+    impact: Sequence[Mapping[str, Any]],
+    detectability: Sequence[Mapping[str, Any]],
+    library: Optional[CompiledLibrary] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Convert per-assessment input dicts into the arrays ``score_indicators_batch`` takes.
+
+    Responses are mapped onto the raw affirmative axis with the same rules as
+    the scalar path; likelihood, impact and detectability are mapped with
+    ``_map_scale_1_5``. Missing answers use the scalar defaults. Each distinct
+    raw answer is parsed once (see ``AnswerCodec``).
+    """
+    return AnswerCodec(library).encode(responses, likelihood, impact, detectability).decode()
+
+
+def score_indicators_batch(
+    responses: np.ndarray,
+    likelihood: np.ndarray,
+    impact: np.ndarray,
+    detectability: np.ndarray,
+    domain_weights: Union[Dict[RiskDomain, float], np.ndarray],
+    library: Optional[CompiledLibrary] = None,
+) -> BatchScoreResult:
+    """Score N assessments in one vectorised pass.
+
+    Each input is an ``(N, K)`` array with one column per indicator in library
+    order (``INDICATOR_LIBRARY`` unless ``library`` is given). ``responses``
+    holds the raw affirmative-axis value (1..5, as produced by the answer
+    mapping; see ``build_batch_inputs``) *before* polarity is applied. Likelihood, impact and detectability are
+    clipped to 1..5 like the scalar path. NaN marks a missing value and is
+    scored as the neutral 3.0.
+
+    ``domain_weights`` is either one mapping shared by every assessment or an
+    ``(N, len(RiskDomain))`` array in ``RiskDomain`` declaration order, so a
+    batch can mix activities.
+
+    The arithmetic is performed in the same order as ``score_indicators``, so
+    the results are bit-for-bit identical to the scalar path.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+
+    r_raw = _clip_scale(responses)
+    if r_raw.ndim != 2 or r_raw.shape[1] != len(lib):
+        raise ValueError(f"expected input arrays of shape (N, {len(lib)}), got {r_raw.shape}")
+    r_scale = np.where(lib.invert_response, 6.0 - r_raw, r_raw)
+    l_scale = _clip_scale(likelihood)
+    i_scale = _clip_scale(impact)
+    d_scale = _clip_scale(detectability)
+
+    base = (r_scale + l_scale + i_scale + d_scale) / 4.0
+    severity = (base - 1.0) / 4.0
+    contributions = severity * lib.weight_ex_domain
+
+    if isinstance(domain_weights, np.ndarray):
+        dw_matrix = np.asarray(domain_weights, dtype=np.float64)
+        if dw_matrix.shape != (r_raw.shape[0], len(lib.domains)):
+            raise ValueError(f"expected domain weights of shape ({r_raw.shape[0]}, {len(lib.domains)}), got {dw_matrix.shape}")
+        domain_weight = dw_matrix[:, lib.domain_index]
+    else:
+        row = lib.domain_weight_vector(domain_weights)[lib.domain_index]
+        domain_weight = np.broadcast_to(row, r_raw.shape)
+
+    return BatchScoreResult(
+        indicator_ids=lib.indicator_ids,
+        severity=severity,
+        contributions=contributions,
+        weight_ex_domain=lib.weight_ex_domain,
+        domain_weight=domain_weight,
+    )
+
+
+def score_encoded(
+    encoded: EncodedAnswers,
+    domain_weights: Union[Dict[RiskDomain, float], np.ndarray],
+    library: Optional[CompiledLibrary] = None,
+) -> BatchScoreResult:
+    """``score_indicators_batch`` over answers encoded by ``AnswerCodec``."""
+    return score_indicators_batch(*encoded.decode(), domain_weights, library=library)
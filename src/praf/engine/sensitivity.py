@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from praf.config.schemas import AllowedAnswerType
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
+from praf.domain.domains import RiskDomain
+from praf.engine.classifier import RiskLevel
+from praf.engine.rules import Decision
+from praf.engine.scorer import build_batch_inputs
+
+
+INPUTS: Tuple[str, ...] = ("response", "likelihood", "impact", "detectability")
+CANDIDATE_VALUES = np.arange(1.0, 6.0)
+
+# Raw-axis values an answer of each type can actually produce.
+_ADMISSIBLE_RESPONSES = {
+    AllowedAnswerType.YES_NO: (1.0, 5.0),
+    AllowedAnswerType.LOW_MED_HIGH: (1.0, 3.0, 5.0),
+    AllowedAnswerType.SCALE_1_5: (1.0, 2.0, 3.0, 4.0, 5.0),
+}
+
+_LEVELS = tuple(RiskLevel)
+_DECISIONS = tuple(Decision)
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    """What-if outcomes for every indicator, input and candidate value.
+
+    Arrays have shape ``(K, 4, 5)``: indicator (library order) x input
+    (``INPUTS``) x candidate value (``values``, 1..5). For the response the
+    candidate is the raw affirmative-axis value before polarity, as in
+    ``score_indicators_batch``. Cells whose value the indicator's answer type
+    cannot produce are masked out of ``admissible``; there ``domain_index``
+    and ``delta`` are NaN and ``level``/``overall`` are -1.
+
+    ``level`` indexes ``tuple(RiskLevel)`` and ``overall`` indexes
+    ``tuple(Decision)``.
+    """
+
+    indicator_ids: Tuple[str, ...]
+    domains: Tuple[RiskDomain, ...]
+    values: np.ndarray
+    admissible: np.ndarray
+    domain_index: np.ndarray
+    delta: np.ndarray
+    level: np.ndarray
+    overall: np.ndarray
+    current_level: np.ndarray
+    current_overall: int
+
+    @property
+    def level_changed(self) -> np.ndarray:
+        return self.admissible & (self.level != self.current_level[:, None, None])
+
+    @property
+    def decision_changed(self) -> np.ndarray:
+        return self.admissible & (self.overall != self.current_overall)
+
+    def flips(self) -> List[Tuple[str, str, float, RiskLevel, Decision]]:
+        """``(indicator_id, input, value, new_level, new_overall)`` for every change that flips the domain level."""
+        out = []
+        for k, s, v in zip(*np.nonzero(self.level_changed)):
+            out.append(
+                (
+                    self.indicator_ids[k],
+                    INPUTS[s],
+                    float(self.values[v]),
+                    _LEVELS[self.level[k, s, v]],
+                    _DECISIONS[self.overall[k, s, v]],
+                )
+            )
+        return out
+
+
+def _levels(index: np.ndarray, low_threshold: float, high_threshold: float) -> np.ndarray:
+    return np.where(index < low_threshold, 0, np.where(index < high_threshold, 1, 2)).astype(np.int8)
+
+
+def _domain_index(total: np.ndarray, weight: np.ndarray, dw: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_index = np.where(weight > 0.0, 100.0 * total / weight, 0.0)
+    return np.minimum(100.0, base_index * dw)
+
+
+def sensitivity(
+    responses: Mapping[str, Any],
+    likelihood: Mapping[str, Any],
+    impact: Mapping[str, Any],
+    detectability: Mapping[str, Any],
+    domain_weights: Mapping[RiskDomain, float],
+    low_threshold: float,
+    high_threshold: float,
+    library: Optional[CompiledLibrary] = None,
+) -> SensitivityResult:
+    """Evaluate every single-input change of one assessment in one vectorised pass.
+
+    The aggregator is a weight-normalised linear mean, so replacing one
+    indicator's contribution only moves its own domain sum:
+    ``new_sum = sum - contribution_k + contribution_k'``. The candidate
+    severities are computed with the scorer's arithmetic, so each cell equals
+    re-running the pipeline with that single change, up to the rounding of
+    the running domain sum.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    r_raw, l, i, d = (a[0] for a in build_batch_inputs([responses], [likelihood], [impact], [detectability], library=lib))
+    r = np.where(lib.invert_response, 6.0 - r_raw, r_raw)
+    k = len(lib)
+    n_domains = len(lib.domains)
+
+    current = np.stack([r, l, i, d], axis=1)  # (K, 4)
+    contribution = ((r + l + i + d) / 4.0 - 1.0) / 4.0 * lib.weight_ex_domain
+
+    dw = lib.domain_weight_vector(domain_weights)
+    present = np.bincount(lib.domain_index, minlength=n_domains) > 0
+    domain_sum = np.bincount(lib.domain_index, weights=contribution, minlength=n_domains)
+    domain_weight = np.bincount(lib.domain_index, weights=lib.weight_ex_domain, minlength=n_domains)
+    index = _domain_index(domain_sum, domain_weight, dw)
+    levels = np.where(present, _levels(index, low_threshold, high_threshold), -1)
+    current_overall = int(levels.max(initial=0))
+
+    # Highest level among the *other* domains, per domain.
+    max_other = np.empty(n_domains, dtype=np.int8)
+    for j in range(n_domains):
+        max_other[j] = np.delete(levels, j).max(initial=0)
+
+    # Candidate scaled inputs: (K, 4 inputs, 5 values), one input replaced at a time.
+    candidate = np.broadcast_to(current[:, None, :, None], (k, 4, 4, 5)).copy()
+    response_values = np.where(lib.invert_response[:, None], 6.0 - CANDIDATE_VALUES, CANDIDATE_VALUES)
+    slot = np.arange(4)
+    candidate[:, slot, slot, :] = CANDIDATE_VALUES
+    candidate[:, 0, 0, :] = response_values
+    scaled = candidate[:, :, 0] + candidate[:, :, 1] + candidate[:, :, 2] + candidate[:, :, 3]
+    new_contribution = (scaled / 4.0 - 1.0) / 4.0 * lib.weight_ex_domain[:, None, None]
+
+    dom = lib.domain_index
+    new_sum = domain_sum[dom][:, None, None] - contribution[:, None, None] + new_contribution
+    new_index = _domain_index(new_sum, domain_weight[dom][:, None, None], dw[dom][:, None, None])
+    new_level = _levels(new_index, low_threshold, high_threshold)
+    new_overall = np.maximum(new_level, max_other[dom][:, None, None])
+
+    admissible = np.ones((k, 4, 5), dtype=bool)
+    for code, answer_type in enumerate(lib.answer_types):
+        allowed = np.isin(CANDIDATE_VALUES, _ADMISSIBLE_RESPONSES[answer_type])
+        admissible[lib.answer_type_code == code, 0, :] = allowed
+
+    delta = new_index - index[dom][:, None, None]
+    return SensitivityResult(
+        indicator_ids=lib.indicator_ids,
+        domains=tuple(lib.domains[j] for j in dom),
+        values=CANDIDATE_VALUES.copy(),
+        admissible=admissible,
+        domain_index=np.where(admissible, new_index, np.nan),
+        delta=np.where(admissible, delta, np.nan),
+        level=np.where(admissible, new_level, -1).astype(np.int8),
+        overall=np.where(admissible, new_overall, -1).astype(np.int8),
+        current_level=levels[dom].astype(np.int8),
+        current_overall=current_overall,
+    )
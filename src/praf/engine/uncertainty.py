@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from praf.domain.compiled import COMPILED_LIBRARY, CompiledLibrary
+from praf.domain.domains import RiskDomain
+from praf.engine.aggregator import aggregate_scores_batch
+from praf.engine.classifier import RiskLevel, classify_batch
+from praf.engine.rules import Decision, decide_batch
+from praf.engine.scorer import build_batch_inputs, score_indicators_batch
+
+
+@dataclass(frozen=True)
+class Triangular:
+    """Triangular distribution on the 1..5 scale (e.g. low / most likely / high estimate)."""
+
+    low: float
+    mode: float
+    high: float
+
+    def __post_init__(self) -> None:
+        if not self.low <= self.mode <= self.high:
+            raise ValueError(f"expected low <= mode <= high, got {self.low}, {self.mode}, {self.high}")
+
+
+@dataclass(frozen=True)
+class Discrete:
+    """Probabilities of the values 1, 2, 3, 4 and 5."""
+
+    probabilities: Tuple[float, float, float, float, float]
+
+    def __post_init__(self) -> None:
+        p = np.asarray(self.probabilities, dtype=np.float64)
+        if p.shape != (5,) or np.any(p < 0.0) or not np.isclose(p.sum(), 1.0):
+            raise ValueError(f"expected five non-negative probabilities summing to 1, got {self.probabilities}")
+
+
+Estimate = Union[float, int, Triangular, Discrete]
+
+
+@dataclass(frozen=True)
+class UncertaintyResult:
+    """Monte Carlo outcome distributions.
+
+    ``index_samples`` is ``(n_samples, len(domains))``. ``level_probabilities``
+    is ``(len(domains), 3)`` over ``tuple(RiskLevel)`` and
+    ``decision_probabilities`` is ``(3,)`` over ``tuple(Decision)``. Domains
+    without indicators are NaN.
+    """
+
+    domains: Tuple[RiskDomain, ...]
+    index_samples: np.ndarray
+    level_probabilities: np.ndarray
+    decision_probabilities: np.ndarray
+
+    def quantiles(self, q: Sequence[float]) -> np.ndarray:
+        """Per-domain quantiles of the index, shape ``(len(q), len(domains))``."""
+        return np.quantile(self.index_samples, q, axis=0)
+
+    def level_probability(self, domain: RiskDomain, level: RiskLevel) -> float:
+        return float(self.level_probabilities[self.domains.index(domain), list(RiskLevel).index(level)])
+
+    def decision_probability(self, decision: Decision) -> float:
+        return float(self.decision_probabilities[list(Decision).index(decision)])
+
+
+def _sample_column_group(rng: np.random.Generator, estimates: List[Any], n_samples: int) -> np.ndarray:
+    """Draw ``(n_samples, len(estimates))`` values for one input's distributions."""
+    out = np.empty((n_samples, len(estimates)), dtype=np.float64)
+    tri = [j for j, e in enumerate(estimates) if isinstance(e, Triangular) and e.low < e.high]
+    flat = [j for j, e in enumerate(estimates) if isinstance(e, Triangular) and e.low == e.high]
+    disc = [j for j, e in enumerate(estimates) if isinstance(e, Discrete)]
+
+    if tri:
+        left = np.array([estimates[j].low for j in tri])
+        mode = np.array([estimates[j].mode for j in tri])
+        right = np.array([estimates[j].high for j in tri])
+        out[:, tri] = rng.triangular(left, mode, right, size=(n_samples, len(tri)))
+    for j in flat:
+        out[:, j] = estimates[j].low
+    if disc:
+        cdf = np.cumsum([estimates[j].probabilities for j in disc], axis=1)[:, :4]
+        u = rng.random((n_samples, len(disc)))
+        out[:, disc] = 1.0 + (u[:, :, None] >= cdf[None, :, :]).sum(axis=2)
+    return out
+
+
+def monte_carlo(
+    responses: Mapping[str, Any],
+    likelihood: Mapping[str, Estimate],
+    impact: Mapping[str, Estimate],
+    detectability: Mapping[str, Estimate],
+    domain_weights: Mapping[RiskDomain, float],
+    low_threshold: float,
+    high_threshold: float,
+    n_samples: int = 10_000,
+    seed: Union[int, np.random.Generator, None] = None,
+    library: Optional[CompiledLibrary] = None,
+) -> UncertaintyResult:
+    """Propagate uncertain likelihood / impact / detectability through the engine.
+
+    Each L/I/D entry is either a point value (as in ``score_indicators``) or a
+    ``Triangular`` / ``Discrete`` distribution. ``n_samples`` scenarios are
+    drawn with ``np.random.default_rng(seed)`` and scored as one batch, so the
+    same seed reproduces the same result.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    rng = np.random.default_rng(seed)
+
+    points: List[Dict[str, Any]] = []
+    distributions: List[Dict[int, Any]] = []
+    for section in (likelihood, impact, detectability):
+        fixed: Dict[str, Any] = {}
+        uncertain: Dict[int, Any] = {}
+        for indicator_id, value in section.items():
+            if isinstance(value, (Triangular, Discrete)):
+                if indicator_id in lib.position:
+                    uncertain[lib.position[indicator_id]] = value
+            else:
+                fixed[indicator_id] = value
+        points.append(fixed)
+        distributions.append(uncertain)
+
+    base = build_batch_inputs([responses], [points[0]], [points[1]], [points[2]], library=lib)
+    arrays = [np.broadcast_to(a, (n_samples, len(lib))) for a in base]
+    for slot, uncertain in enumerate(distributions, start=1):
+        if uncertain:
+            columns = sorted(uncertain)
+            sampled = np.array(arrays[slot])
+            sampled[:, columns] = _sample_column_group(rng, [uncertain[j] for j in columns], n_samples)
+            arrays[slot] = sampled
+
+    scores = score_indicators_batch(*arrays, domain_weights, library=lib)
+    aggregated = aggregate_scores_batch(scores, library=lib)
+    levels = classify_batch(aggregated.domain_scores, low_threshold, high_threshold)
+    overall = decide_batch(levels)
+
+    n_levels = len(RiskLevel)
+    level_probabilities = np.full((len(lib.domains), n_levels), np.nan)
+    for j in range(len(lib.domains)):
+        column = levels[:, j]
+        if n_samples and column[0] >= 0:
+            level_probabilities[j] = np.bincount(column, minlength=n_levels) / n_samples
+    decision_probabilities = np.bincount(overall, minlength=len(Decision)) / max(n_samples, 1)
+
+    return UncertaintyResult(
+        domains=aggregated.domains,
+        index_samples=aggregated.domain_scores,
+        level_probabilities=level_probabilities,
+        decision_probabilities=decision_probabilities,
+    )
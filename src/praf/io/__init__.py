@@ -1,4 +1,46 @@
-from .loaders import load_json_inputs
-from .exporters import export_json_report
+from .loaders import AssessmentInput, decode_assessment, load_assessment, load_json_inputs, load_report
+from .exporters import ReportStreamWriter, export_json_report, export_reports
+from .store import ResultStore, STORE_FORMAT, build_records, record_dtype, score_records
+from .cache import CacheStats, DirectoryTier, ResultCache, SQLiteTier, assessment_key, cached_report_json, open_disk_tier
+from .history import HistoryStore, LatestAssessment, LevelTransition, TrendPoint
+from .auditlog import AuditLog, AuditLogError, AuditRun, VerifyResult, read_run, verify_log
+from .reports import REPORT_BUILDERS, REPORT_SCHEMA_V2, build_report, build_report_v2, expand_report, library_snapshot
 
-__all__ = ["load_json_inputs", "export_json_report"]
+__all__ = [
+    "AssessmentInput",
+    "decode_assessment",
+    "load_assessment",
+    "load_json_inputs",
+    "load_report",
+    "export_json_report",
+    "export_reports",
+    "ReportStreamWriter",
+    "REPORT_BUILDERS",
+    "REPORT_SCHEMA_V2",
+    "build_report",
+    "build_report_v2",
+    "expand_report",
+    "library_snapshot",
+    "ResultStore",
+    "STORE_FORMAT",
+    "record_dtype",
+    "build_records",
+    "score_records",
+    "assessment_key",
+    "CacheStats",
+    "ResultCache",
+    "DirectoryTier",
+    "SQLiteTier",
+    "open_disk_tier",
+    "cached_report_json",
+    "HistoryStore",
+    "TrendPoint",
+    "LevelTransition",
+    "LatestAssessment",
+    "AuditLog",
+    "AuditRun",
+    "AuditLogError",
+    "VerifyResult",
+    "read_run",
+    "verify_log",
+]
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from praf.engine.audit_trail import AuditEntry
+
+
+MAGIC = b"PRAFLOG1"
+GENESIS = bytes(32)
+
+# Record: payload length, chain hash, payload. The chain hash is
+# sha256(previous chain hash + payload); the first record chains from GENESIS.
+_RECORD = struct.Struct("<I32s")
+# Payload: run id and key length, then the key and the JSON-encoded value.
+_PAYLOAD = struct.Struct("<QH")
+# Index entry per run: run id, offset of its first record, chain hash before it.
+_INDEX = np.dtype([("run", "<u8"), ("offset", "<u8"), ("previous", "S32")])
+
+
+def _index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def _encode(run: int, key: str, value: Any) -> bytes:
+    k = key.encode("utf-8")
+    v = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _PAYLOAD.pack(run, len(k)) + k + v
+
+
+def _decode(payload: bytes) -> Tuple[int, AuditEntry]:
+    run, key_len = _PAYLOAD.unpack_from(payload)
+    start = _PAYLOAD.size
+    key = bytes(payload[start : start + key_len]).decode("utf-8")
+    value = json.loads(bytes(payload[start + key_len :]))
+    return run, AuditEntry(key=key, value=value)
+
+
+class AuditLogError(ValueError):
+    """A damaged log; ``offset`` is where the damage starts.
+
+    ``torn`` marks a record cut short, as an interrupted write leaves it,
+    rather than one whose hash does not match.
+    """
+
+    def __init__(self, message: str, offset: int, torn: bool = False) -> None:
+        super().__init__(message)
+        self.offset = offset
+        self.torn = torn
+
+
+def _read_index(path: str) -> np.ndarray:
+    """Index entries of ``path``, ignoring a partly written last entry."""
+    try:
+        with open(_index_path(path), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return np.empty(0, dtype=_INDEX)
+    whole = len(data) - len(data) % _INDEX.itemsize
+    return np.frombuffer(data[:whole], dtype=_INDEX).copy()
+
+
+@dataclass(frozen=True)
+class VerifyResult:
+    ok: bool
+    records: int
+    runs: int
+    bytes_checked: int
+    error: Optional[str] = None
+    error_offset: Optional[int] = None
+
+
+def _scan(buf: Any, start: int, previous: bytes, end: int) -> Iterator[Tuple[int, int, bytes, memoryview]]:
+    """Yield ``(offset, run, chain_hash, payload)`` for records in ``buf[start:end]``.
+
+    Raises ``AuditLogError`` on a truncated record or a broken chain. Each
+    ``payload`` view is released once the caller moves on, and every view is
+    released when the scan ends, so the caller can always close ``buf``.
+    """
+    view = memoryview(buf)
+    payload: Optional[memoryview] = None
+    offset = start
+    sha256 = hashlib.sha256
+    header = _RECORD.size
+    try:
+        while offset < end:
+            if offset + header > end:
+                raise AuditLogError(f"truncated record header at offset {offset}", offset, torn=True)
+            length, chain = _RECORD.unpack_from(buf, offset)
+            body = offset + header
+            if body + length > end:
+                raise AuditLogError(f"truncated record at offset {offset}", offset, torn=True)
+            payload = view[body : body + length]
+            h = sha256(previous)
+            h.update(payload)
+            if h.digest() != chain:
+                raise AuditLogError(f"hash chain broken at offset {offset}", offset)
+            yield offset, _PAYLOAD.unpack_from(payload)[0], chain, payload
+            payload.release()
+            previous = chain
+            offset = body + length
+    finally:
+        if payload is not None:
+            payload.release()
+        view.release()
+
+
+class AuditRun:
+    """Entries of one run; also usable as the ``sink`` of ``build_audit_trail``."""
+
+    def __init__(self, log: "AuditLog", run: int) -> None:
+        self._log = log
+        self.run = run
+        self._started = False
+
+    def append(self, key: str, value: Any) -> None:
+        self._log._append(self, _encode(self.run, key, value))
+
+    def __call__(self, entry: AuditEntry) -> None:
+        self.append(entry.key, entry.value)
+
+    def __enter__(self) -> "AuditRun":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._log.flush()
+
+
+class AuditLog:
+    """Append-only, hash-chained audit log.
+
+    The file starts with ``MAGIC`` and holds length-prefixed records. Each
+    record carries ``sha256(previous chain hash + payload)``, so editing,
+    dropping or reordering any record breaks every later hash. A fixed-width
+    sidecar index (``<path>.idx``) stores, per run, the offset of its first
+    record and the chain hash before it, so ``read_run`` can seek straight to
+    a run and still verify it.
+
+    A run's records must be contiguous, so only the run started last can
+    append: ``begin_run`` closes the previous run, and appending to a closed
+    run raises ``ValueError``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        index = _read_index(path)
+        if not os.path.exists(path):
+            if index.size:
+                raise ValueError(f"found an index for missing audit log {path}")
+            with open(path, "xb") as f:
+                f.write(MAGIC)
+        self._last, self._end, index = self._recover(index)
+        self._file = open(path, "ab")
+        self._index_file = open(_index_path(path), "ab")
+        self._next_run = int(index["run"][-1]) + 1 if index.size else 1
+        self._current: Optional[AuditRun] = None
+
+    def _recover(self, index: np.ndarray) -> Tuple[bytes, int, np.ndarray]:
+        """Chain hash of the last record, the end offset and the index, repaired after a crash.
+
+        Scans from the last indexed run that starts inside the file. A torn
+        last record is cut off; index entries past the new end are dropped
+        and runs whose index entry was lost are indexed again. A broken
+        chain is not repaired and raises ``AuditLogError``.
+        """
+        with open(self.path, "r+b") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a praf audit log")
+            size = os.fstat(f.fileno()).st_size
+            inside = index[index["offset"] < size]
+            start, previous = len(MAGIC), GENESIS
+            if inside.size:
+                start, previous = int(inside["offset"][-1]), bytes(inside["previous"][-1]).ljust(32, b"\0")
+            end = start
+            runs: List[Tuple[int, int, bytes]] = []
+            if size > start:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    try:
+                        for offset, run, chain, payload in _scan(buf, start, previous, size):
+                            if not runs or runs[-1][0] != run:
+                                runs.append((run, offset, previous))
+                            previous = chain
+                            end = offset + _RECORD.size + len(payload)
+                    except AuditLogError as exc:
+                        if not exc.torn:
+                            raise
+            if end < size:
+                f.truncate(end)
+        kept = index[index["offset"] < end]
+        known = set(kept["offset"].tolist())
+        missing = np.array([r for r in runs if r[1] not in known], dtype=_INDEX)
+        repaired = np.concatenate([kept, missing])
+        index_path = _index_path(self.path)
+        if repaired.tobytes() != index.tobytes() or (
+            os.path.exists(index_path) and os.path.getsize(index_path) != index.nbytes
+        ):
+            repaired.tofile(index_path)
+        return previous, end, repaired
+
+    def begin_run(self) -> AuditRun:
+        run = AuditRun(self, self._next_run)
+        self._next_run += 1
+        self._current = run
+        return run
+
+    def _append(self, run: AuditRun, payload: bytes) -> None:
+        if run is not self._current:
+            raise ValueError(f"run {run.run} is closed; only the most recently started run can append")
+        chain = hashlib.sha256(self._last + payload).digest()
+        if not run._started:
+            self._index_file.write(np.array([(run.run, self._end, self._last)], dtype=_INDEX).tobytes())
+            run._started = True
+        self._file.write(_RECORD.pack(len(payload), chain))
+        self._file.write(payload)
+        self._last = chain
+        self._end += _RECORD.size + len(payload)
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._index_file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> "AuditLog":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def read_run(path: str, run: int) -> List[AuditEntry]:
+    """Entries of ``run``, located via the index and verified against its chain."""
+    index = _read_index(path)
+    pos = int(np.searchsorted(index["run"], run))
+    if pos >= index.size or int(index["run"][pos]) != run:
+        raise KeyError(f"run {run} is not in {path}")
+    start, previous = int(index["offset"][pos]), bytes(index["previous"][pos]).ljust(32, b"\0")
+    entries: List[AuditEntry] = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        end = int(index["offset"][pos + 1]) if pos + 1 < index.size else len(buf)
+        for offset, record_run, _, payload in _scan(buf, start, previous, end):
+            if record_run != run:
+                raise AuditLogError(f"record at offset {offset} belongs to run {record_run}, not run {run}", offset)
+            entries.append(_decode(payload)[1])
+    return entries
+
+
+def verify_log(path: str) -> VerifyResult:
+    """Re-hash the whole log sequentially and check the index against it.
+
+    The file is memory-mapped and hashed record by record, so the cost is
+    one sequential read plus SHA-256 of every byte.
+    """
+    index = _read_index(path)
+    records = 0
+    runs: List[Tuple[int, int, bytes]] = []
+    last_run = None
+    previous = GENESIS
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < len(MAGIC) or f.read(len(MAGIC)) != MAGIC:
+            return VerifyResult(False, 0, 0, 0, error="missing header", error_offset=0)
+        if size == len(MAGIC):
+            return VerifyResult(index.size == 0, 0, 0, size, error=None if index.size == 0 else "index lists runs")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            try:
+                for offset, run, chain, _ in _scan(buf, len(MAGIC), GENESIS, size):
+                    if run != last_run:
+                        runs.append((run, offset, previous))
+                        last_run = run
+                    previous = chain
+                    records += 1
+            except AuditLogError as exc:
+                return VerifyResult(False, records, len(runs), exc.offset, error=str(exc), error_offset=exc.offset)
+
+    expected = [(int(r), int(o), bytes(p).ljust(32, b"\0")) for r, o, p in index]
+    if expected != runs:
+        return VerifyResult(False, records, len(runs), size, error="index does not match the log")
+    return VerifyResult(True, records, len(runs), size)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Protocol
+
+from praf.config.defaults import Defaults
+from praf.domain import COMPILED_LIBRARY, CompiledLibrary, Context
+from praf.io.reports import REPORT_BUILDERS
+
+
+def assessment_key(
+    ctx: Context,
+    responses: Mapping[str, Any],
+    likelihood: Mapping[str, Any],
+    impact: Mapping[str, Any],
+    detectability: Mapping[str, Any],
+    defaults: Defaults,
+    schema: str = "v1",
+    library: Optional[CompiledLibrary] = None,
+) -> str:
+    """Stable sha256 key of everything a report depends on.
+
+    Inputs are normalised to one list per section in library order with the
+    scorer's defaults filled in, so key order, ids the library does not know
+    and explicitly passed defaults do not change the key. The library
+    fingerprint covers indicator metadata, weights and the activity domain
+    weights, so editing any of them invalidates every cached entry.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    ids = lib.indicator_ids
+    payload = [
+        lib.fingerprint,
+        schema,
+        ctx.activity.value,
+        ctx.stage.value,
+        float(defaults.low_threshold),
+        float(defaults.high_threshold),
+        [responses.get(k, None) for k in ids],
+        [likelihood.get(k, 3) for k in ids],
+        [impact.get(k, 3) for k in ids],
+        [detectability.get(k, 3) for k in ids],
+    ]
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=repr)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    disk_hits: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskTier(Protocol):
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def put(self, key: str, value: bytes) -> None: ...
+
+
+class DirectoryTier:
+    """One file per entry under ``path/<key[:2]>/<key>``.
+
+    Writes go through a temporary file and ``os.replace`` so concurrent
+    workers never read a partial entry.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._file(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, value: bytes) -> None:
+        target = self._file(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(value)
+        os.replace(tmp, target)
+
+
+class SQLiteTier:
+    """Entries in a single SQLite table; safe to share between processes."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS reports (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM reports WHERE key = ?", (key,)).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO reports (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_disk_tier(path: str) -> DiskTier:
+    """``.sqlite``/``.sqlite3``/``.db`` paths open a ``SQLiteTier``, anything else a ``DirectoryTier``."""
+    if os.path.splitext(path)[1].lower() in (".sqlite", ".sqlite3", ".db"):
+        return SQLiteTier(path)
+    return DirectoryTier(path)
+
+
+class ResultCache:
+    """Serialized reports keyed by ``assessment_key``.
+
+    The in-process tier is an LRU bounded by ``max_bytes`` of stored report
+    bytes; least recently used entries are evicted first. When ``disk`` is
+    given, memory misses fall through to it, disk hits are promoted into
+    memory and every new entry is written to both. Disk tiers are never
+    evicted from.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk: Optional[DiskTier] = None) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self.max_bytes = int(max_bytes)
+        self.disk = disk
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._disk_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                disk_hits=self._disk_hits,
+                entries=len(self._entries),
+                size_bytes=self._size,
+            )
+
+    def _remember(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._evictions += 1
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+        value = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._remember(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def get_or_build(self, key: str, build: Callable[[], bytes]) -> bytes:
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop the in-process tier; counters and the disk tier are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def add_stats(self, other: CacheStats) -> None:
+        """Fold in the lookups counted by another process's cache over the same disk tier."""
+        with self._lock:
+            self._hits += other.hits
+            self._misses += other.misses
+            self._disk_hits += other.disk_hits
+
+    def close(self) -> None:
+        """Close the disk tier, if it holds a connection."""
+        close = getattr(self.disk, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def cached_report_json(
+    cache: ResultCache,
+    ctx: Context,
+    responses: Mapping[str, Any],
+    likelihood: Mapping[str, Any],
+    impact: Mapping[str, Any],
+    detectability: Mapping[str, Any],
+    defaults: Defaults,
+    schema: str = "v1",
+    library: Optional[CompiledLibrary] = None,
+) -> str:
+    """Compact JSON report for one assessment, built only on a cache miss."""
+    builder = REPORT_BUILDERS[schema]
+    key = assessment_key(ctx, responses, likelihood, impact, detectability, defaults, schema=schema, library=library)
+
+    def build() -> bytes:
+        report = builder(ctx, responses, likelihood, impact, detectability, defaults=defaults, library=library)
+        return json.dumps(report, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return cache.get_or_build(key, build).decode("utf-8")
@@ -1,9 +1,133 @@
 from __future__ import annotations
 
+import gzip
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
 
 
 def export_json_report(path: str, report: Dict[str, Any]) -> None:
     with open(path, "w", encoding="utf-8") as f:
         json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+FORMATS = ("ndjson", "json")
+
+
+def _dumps(report: Union[Mapping[str, Any], str]) -> str:
+    if isinstance(report, str):
+        return report
+    return json.dumps(report, ensure_ascii=False, separators=(",", ":"))
+
+
+class ReportStreamWriter:
+    """Write reports one at a time as NDJSON or as a single JSON array.
+
+    Reports are serialised compactly and buffered. Every ``flush_every``
+    reports, or once ``buffer_bytes`` are pending, the buffer is written out
+    in one piece, so the file on disk is always valid up to the last flush:
+
+    - ``ndjson``: every flushed line is a complete report.
+    - ``json``: each flush rewrites the closing ``]``, so the array is
+      complete after every flush. This needs a seekable, uncompressed file.
+    - gzip (``compress="gzip"`` or a ``.gz`` path): each flush writes one
+      complete gzip member. Concatenated members form a valid gzip stream,
+      so ``gzip.open`` and ``zcat`` read everything flushed before an abort.
+
+    ``write`` also accepts already serialised JSON text, e.g. lines from
+    ``praf batch`` or the result cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: str = "ndjson",
+        compress: Optional[str] = None,
+        flush_every: int = 1000,
+        buffer_bytes: int = 1 << 20,
+        compresslevel: int = 6,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, got {format!r}")
+        if compress is None and path.endswith(".gz"):
+            compress = "gzip"
+        if compress not in (None, "gzip"):
+            raise ValueError(f"unsupported compression {compress!r}; only 'gzip' is available")
+        if compress == "gzip" and format == "json":
+            raise ValueError("a gzip-compressed JSON array cannot stay valid between flushes; use ndjson")
+        self.path = path
+        self.format = format
+        self.compress = compress
+        self.flush_every = max(1, int(flush_every))
+        self.buffer_bytes = max(1, int(buffer_bytes))
+        self.compresslevel = compresslevel
+        self.count = 0
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._flushed = 0
+        self._file = open(path, "wb")
+        if format == "json":
+            self._file.write(b"[\n]\n")
+            self._file.flush()
+
+    def write(self, report: Union[Mapping[str, Any], str]) -> None:
+        text = _dumps(report)
+        self._pending.append(text)
+        self._pending_bytes += len(text)
+        self.count += 1
+        if len(self._pending) >= self.flush_every or self._pending_bytes >= self.buffer_bytes:
+            self.flush()
+
+    def write_many(self, reports: Iterable[Union[Mapping[str, Any], str]]) -> int:
+        n = 0
+        for report in reports:
+            self.write(report)
+            n += 1
+        return n
+
+    def _encode_pending(self) -> bytes:
+        if self.format == "ndjson":
+            return ("\n".join(self._pending) + "\n").encode("utf-8")
+        separator = ",\n" if self._flushed else "\n"
+        return (separator + ",\n".join(self._pending) + "\n]\n").encode("utf-8")
+
+    def flush(self) -> None:
+        if not self._pending:
+            self._file.flush()
+            return
+        data = self._encode_pending()
+        if self.compress == "gzip":
+            data = gzip.compress(data, compresslevel=self.compresslevel, mtime=0)
+        if self.format == "json":
+            self._file.seek(-3, 2)  # overwrite the previous closing "\n]\n"
+            self._file.truncate()
+        self._file.write(data)
+        self._file.flush()
+        self._flushed += len(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "ReportStreamWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def export_reports(
+    path: str,
+    reports: Iterable[Union[Mapping[str, Any], str]],
+    format: str = "ndjson",
+    compress: Optional[str] = None,
+    flush_every: int = 1000,
+) -> int:
+    """Stream ``reports`` to ``path`` without holding them in memory; returns the count."""
+    with ReportStreamWriter(path, format=format, compress=compress, flush_every=flush_every) as writer:
+        return writer.write_many(reports)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from praf.domain import Activity, ProjectStage, RiskDomain
+from praf.engine.classifier import RiskLevel
+from praf.engine.rules import Decision
+
+
+Timestamp = Union[float, int, datetime]
+
+LEVELS: Tuple[RiskLevel, ...] = tuple(RiskLevel)
+DECISIONS: Tuple[Decision, ...] = tuple(Decision)
+DOMAINS: Tuple[RiskDomain, ...] = tuple(RiskDomain)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    ts REAL NOT NULL,
+    activity TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    decision TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_assessments_project_ts ON assessments (project, ts);
+CREATE INDEX IF NOT EXISTS ix_assessments_context ON assessments (activity, stage);
+CREATE TABLE IF NOT EXISTS domain_scores (
+    assessment_id INTEGER NOT NULL REFERENCES assessments (id),
+    project TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    ts REAL NOT NULL,
+    score REAL NOT NULL,
+    level TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_domain_scores_project_domain_ts ON domain_scores (project, domain, ts);
+"""
+
+
+def _seconds(ts: Timestamp) -> float:
+    return ts.timestamp() if isinstance(ts, datetime) else float(ts)
+
+
+@dataclass(frozen=True, slots=True)
+class TrendPoint:
+    timestamp: float
+    score: float
+    level: RiskLevel
+
+
+@dataclass(frozen=True, slots=True)
+class LevelTransition:
+    timestamp: float
+    previous: RiskLevel
+    level: RiskLevel
+
+
+@dataclass(frozen=True, slots=True)
+class LatestAssessment:
+    project: str
+    timestamp: float
+    activity: Activity
+    stage: ProjectStage
+    decision: Decision
+
+
+class HistoryStore:
+    """SQLite history of scored assessments, keyed by project and timestamp.
+
+    Timestamps are stored as POSIX seconds; ``datetime`` values are
+    converted on the way in. Each assessment is one ``assessments`` row plus
+    one ``domain_scores`` row per classified domain. The domain rows repeat
+    the project and timestamp, so trend queries are served by the
+    ``(project, domain, ts)`` index alone. Inserts are batched with
+    ``executemany`` inside one ``BEGIN IMMEDIATE`` transaction per call, so
+    several writers can share a database. The database runs in WAL mode, so
+    readers are not blocked while a batch is written.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM assessments").fetchone()[0]
+
+    def _insert(self, rows: Sequence[Tuple[str, float, str, str, str]], domains: Sequence[List[Tuple[str, float, str]]]) -> None:
+        with self._conn:
+            cursor = self._conn.cursor()
+            # Take the write lock before reading MAX(id), so concurrent writers
+            # on the same database cannot hand out the same ids.
+            cursor.execute("BEGIN IMMEDIATE")
+            row = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM assessments").fetchone()
+            first = row[0] + 1
+            cursor.executemany(
+                "INSERT INTO assessments (id, project, ts, activity, stage, decision) VALUES (?, ?, ?, ?, ?, ?)",
+                ((first + n, *r) for n, r in enumerate(rows)),
+            )
+            cursor.executemany(
+                "INSERT INTO domain_scores (assessment_id, project, domain, ts, score, level) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (first + n, rows[n][0], domain, rows[n][1], score, level)
+                    for n, per_domain in enumerate(domains)
+                    for domain, score, level in per_domain
+                ),
+            )
+
+    def add_reports(self, items: Iterable[Tuple[str, Timestamp, Mapping[str, Any]]]) -> int:
+        """Insert ``(project, timestamp, report)`` triples (v1 or v2 reports); returns the count."""
+        rows: List[Tuple[str, float, str, str, str]] = []
+        domains: List[List[Tuple[str, float, str]]] = []
+        for project, ts, report in items:
+            ctx = report["context"]
+            rows.append((str(project), _seconds(ts), ctx["activity"], ctx["stage"], report["overall_decision"]))
+            domains.append([(d, float(v["score"]), v["level"]) for d, v in report["domain_scores"].items()])
+        self._insert(rows, domains)
+        return len(rows)
+
+    def add_batch(
+        self,
+        projects: Sequence[str],
+        timestamps: Sequence[Timestamp],
+        activities: Sequence[Activity],
+        stages: Sequence[ProjectStage],
+        domain_scores: np.ndarray,
+        levels: np.ndarray,
+        decisions: np.ndarray,
+    ) -> int:
+        """Insert N assessments from batch arrays.
+
+        ``domain_scores``/``levels``/``decisions`` are as produced by
+        ``aggregate_scores_batch``, ``classify_batch`` and ``decide_batch``;
+        domains with level -1 are not stored.
+        """
+        scores = np.asarray(domain_scores, dtype=np.float64)
+        level_codes = np.asarray(levels)
+        n = scores.shape[0]
+        if not len(projects) == len(timestamps) == len(activities) == len(stages) == n:
+            raise ValueError(f"expected {n} projects, timestamps, activities and stages")
+        rows = [
+            (str(projects[i]), _seconds(timestamps[i]), Activity(activities[i]).value, ProjectStage(stages[i]).value,
+             DECISIONS[int(decisions[i])].value)
+            for i in range(n)
+        ]
+        domain_values = [d.value for d in DOMAINS]
+        level_values = [lv.value for lv in LEVELS]
+        score_rows = scores.tolist()
+        level_rows = level_codes.tolist()
+        domains = [
+            [(domain_values[j], score_rows[i][j], level_values[code]) for j, code in enumerate(level_rows[i]) if code >= 0]
+            for i in range(n)
+        ]
+        self._insert(rows, domains)
+        return n
+
+    def trend(self, project: str, domain: RiskDomain, last: Optional[int] = None) -> List[TrendPoint]:
+        """``domain``'s scores for ``project``, oldest first; only the ``last`` runs if given."""
+        rows = self._conn.execute(
+            "SELECT ts, score, level FROM domain_scores WHERE project = ? AND domain = ? ORDER BY ts DESC LIMIT ?",
+            (project, RiskDomain(domain).value, -1 if last is None else int(last)),
+        ).fetchall()
+        return [TrendPoint(timestamp=ts, score=score, level=RiskLevel(level)) for ts, score, level in reversed(rows)]
+
+    def transitions(self, project: str, domain: RiskDomain) -> List[LevelTransition]:
+        """Runs where ``domain``'s level differs from the previous run of ``project``."""
+        rows = self._conn.execute(
+            """
+            SELECT ts, previous, level FROM (
+                SELECT ts, level, LAG(level) OVER (ORDER BY ts, assessment_id) AS previous
+                FROM domain_scores WHERE project = ? AND domain = ?
+            ) WHERE previous IS NOT NULL AND previous != level ORDER BY ts
+            """,
+            (project, RiskDomain(domain).value),
+        ).fetchall()
+        return [LevelTransition(timestamp=ts, previous=RiskLevel(prev), level=RiskLevel(level)) for ts, prev, level in rows]
+
+    def latest(
+        self,
+        activity: Optional[Activity] = None,
+        stage: Optional[ProjectStage] = None,
+    ) -> Dict[str, LatestAssessment]:
+        """Most recent assessment of every project, optionally restricted to one activity and/or stage."""
+        where: List[str] = []
+        params: List[str] = []
+        if activity is not None:
+            where.append("activity = ?")
+            params.append(Activity(activity).value)
+        if stage is not None:
+            where.append("stage = ?")
+            params.append(ProjectStage(stage).value)
+        rows = self._conn.execute(
+            f"""
+            SELECT project, ts, activity, stage, decision FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY project ORDER BY ts DESC, id DESC) AS rn
+                FROM assessments {"WHERE " + " AND ".join(where) if where else ""}
+            ) WHERE rn = 1 ORDER BY project
+            """,
+            params,
+        ).fetchall()
+        return {
+            project: LatestAssessment(
+                project=project,
+                timestamp=ts,
+                activity=Activity(activity_value),
+                stage=ProjectStage(stage_value),
+                decision=Decision(decision),
+            )
+            for project, ts, activity_value, stage_value, decision in rows
+        }
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from praf.domain import Activity, COMPILED_LIBRARY, CompiledLibrary, Context, ProjectStage
+from praf.io.reports import expand_report
+
+
+DEFAULT_ACTIVITY = "product_design"
+DEFAULT_STAGE = "design"
+
+SECTIONS = ("responses", "likelihood", "impact", "detectability")
 
 
 @dataclass(frozen=True)
@@ -13,6 +23,88 @@ class LoadedInputs:
     detectability: Dict[str, Any]
 
 
+@dataclass(frozen=True)
+class AssessmentInput:
+    """One decoded assessment: its context plus the four input sections.
+
+    The sections are the decoded JSON objects themselves, not copies.
+    ``unknown_ids`` lists ids (in first-seen order) that are not in the
+    library the input was validated against; scoring ignores them.
+    """
+
+    context: Context
+    responses: Mapping[str, Any]
+    likelihood: Mapping[str, Any]
+    impact: Mapping[str, Any]
+    detectability: Mapping[str, Any]
+    unknown_ids: Tuple[str, ...] = ()
+
+    def sections(self) -> Tuple[Mapping[str, Any], Mapping[str, Any], Mapping[str, Any], Mapping[str, Any]]:
+        return self.responses, self.likelihood, self.impact, self.detectability
+
+
+def decode_context(raw: Any) -> Context:
+    raw = raw or {}
+    if not isinstance(raw, Mapping):
+        raise ValueError(f"'context' must be a JSON object, got {type(raw).__name__}")
+    activity = str(raw.get("activity", DEFAULT_ACTIVITY))
+    stage = str(raw.get("stage", DEFAULT_STAGE))
+    return Context(activity=Activity(activity), stage=ProjectStage(stage))
+
+
+def decode_assessment(
+    payload: Any,
+    library: Optional[CompiledLibrary] = None,
+    strict: bool = False,
+) -> AssessmentInput:
+    """Validate an already-decoded assessment object.
+
+    With ``strict=True`` ids missing from the library raise ``ValueError``
+    instead of being reported in ``unknown_ids``.
+    """
+    if not isinstance(payload, Mapping):
+        raise ValueError(f"assessment must be a JSON object, got {type(payload).__name__}")
+    lib = library if library is not None else COMPILED_LIBRARY
+
+    sections = []
+    unknown: Dict[str, None] = {}
+    for key in SECTIONS:
+        section = payload.get(key, {}) or {}
+        if not isinstance(section, Mapping):
+            raise ValueError(f"'{key}' must be a JSON object, got {type(section).__name__}")
+        for indicator_id in section:
+            if indicator_id not in lib.position:
+                unknown[indicator_id] = None
+        sections.append(section)
+
+    if strict and unknown:
+        raise ValueError(f"unknown indicator ids: {', '.join(unknown)}")
+
+    return AssessmentInput(
+        decode_context(payload.get("context")),
+        *sections,
+        unknown_ids=tuple(unknown),
+    )
+
+
+def load_assessment(
+    source: Union[str, os.PathLike, bytes, bytearray, memoryview],
+    library: Optional[CompiledLibrary] = None,
+    strict: bool = False,
+) -> AssessmentInput:
+    """Read and decode an assessment in one pass.
+
+    ``source`` is either a path or the raw JSON bytes (UTF-8/16/32), so
+    callers that already hold the buffer skip the file open entirely.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source) if isinstance(source, memoryview) else source
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+    return decode_assessment(json.loads(data), library=library, strict=strict)
+
+
 def load_json_inputs(path: str) -> LoadedInputs:
     with open(path, "r", encoding="utf-8") as f:
         payload = json.load(f)
@@ -23,3 +115,10 @@ def load_json_inputs(path: str) -> LoadedInputs:
         impact=dict(payload.get("impact", {})),
         detectability=dict(payload.get("detectability", {})),
     )
+
+
+def load_report(path: str, library: Optional[CompiledLibrary] = None) -> Dict[str, Any]:
+    """Load a JSON report, expanding a compact v2 report into the v1 layout."""
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return expand_report(report, library=library)
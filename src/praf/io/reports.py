@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from praf.domain import Context, Activity, ProjectStage, COMPILED_LIBRARY, CompiledLibrary
+from praf.domain.domains import activity_domain_weights
+from praf.engine.scorer import ScoreResult, score_indicators
+from praf.engine.aggregator import aggregate_scores
+from praf.engine.classifier import DomainClassification, classify_domains
+from praf.engine.rules import DecisionResult, decide
+from praf.engine.explainability import Explanation, explain
+from praf.engine.audit_trail import AuditEntry, build_audit_trail
+from praf.config.defaults import Defaults
+from praf.domain.domains import RiskDomain
+
+
+REPORT_SCHEMA_V2 = "praf.report/v2"
+
+_INPUT_KEYS = ("response", "likelihood", "impact", "detectability")
+
+
+def _run_pipeline(
+    ctx: Context,
+    responses: Mapping[str, Any],
+    likelihood: Mapping[str, Any],
+    impact: Mapping[str, Any],
+    detectability: Mapping[str, Any],
+    defaults: Defaults,
+    library: CompiledLibrary,
+) -> Tuple[ScoreResult, Dict[RiskDomain, DomainClassification], DecisionResult, Explanation]:
+    domain_weights = activity_domain_weights(ctx.activity)
+
+    score_result = score_indicators(
+        responses=responses,
+        likelihood=likelihood,
+        impact=impact,
+        detectability=detectability,
+        domain_weights=domain_weights,
+        library=library,
+    )
+
+    aggregated = aggregate_scores(score_result.indicator_details, score_result.local_scores, library=library)
+    classifications = classify_domains(aggregated.domain_scores, defaults.low_threshold, defaults.high_threshold)
+    decision = decide(classifications)
+    expl = explain(classifications, score_result.indicator_details, score_result.local_scores, top_n=5, library=library)
+    return score_result, classifications, decision, expl
+
+
+def _summary(
+    ctx: Context,
+    classifications: Dict[RiskDomain, DomainClassification],
+    decision: DecisionResult,
+    expl: Explanation,
+) -> Dict[str, Any]:
+    return {
+        "context": {"activity": ctx.activity.value, "stage": ctx.stage.value},
+        "overall_decision": decision.overall.value,
+        "per_domain_decision": {d.value: decision.per_domain[d].value for d in decision.per_domain},
+        "domain_scores": {d.value: {"score": classifications[d].score, "level": classifications[d].level.value} for d in classifications},
+        "top_contributors_by_domain": {d.value: expl.top_contributors_by_domain.get(d, []) for d in classifications},
+    }
+
+
+def build_report(
+    ctx: Context,
+    responses: Mapping[str, Any],
+    likelihood: Mapping[str, Any],
+    impact: Mapping[str, Any],
+    detectability: Mapping[str, Any],
+    defaults: Defaults,
+    library: Optional[CompiledLibrary] = None,
+    audit_sink: Optional[Callable[[AuditEntry], None]] = None,
+) -> Dict[str, Any]:
+    """Run the full engine chain for one assessment and build the v1 report.
+
+    The v1 report is self-contained: its audit trail carries the full
+    ``indicator_details`` (static library metadata included) and the local
+    scores. ``audit_sink`` receives each audit entry as it is built (see
+    ``praf.io.auditlog``).
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    score_result, classifications, decision, expl = _run_pipeline(
+        ctx, responses, likelihood, impact, detectability, defaults, lib
+    )
+    audit = build_audit_trail(
+        classifications, decision, score_result.indicator_details, score_result.local_scores, sink=audit_sink
+    )
+
+    report = _summary(ctx, classifications, decision, expl)
+    report["audit_trail"] = [{"key": a.key, "value": a.value} for a in audit]
+    return report
+
+
+def build_report_v2(
+    ctx: Context,
+    responses: Mapping[str, Any],
+    likelihood: Mapping[str, Any],
+    impact: Mapping[str, Any],
+    detectability: Mapping[str, Any],
+    defaults: Defaults,
+    library: Optional[CompiledLibrary] = None,
+) -> Dict[str, Any]:
+    """Build the compact v2 report.
+
+    Only per-assessment data is stored: the decision summary, the thresholds
+    used and the raw inputs as one list per input in library order. Static
+    indicator metadata and everything derivable from the inputs (scaled
+    values, severities, local scores) are left out; the report references the
+    library by fingerprint instead and ``expand_report`` recomputes the rest.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    _, classifications, decision, expl = _run_pipeline(ctx, responses, likelihood, impact, detectability, defaults, lib)
+
+    report: Dict[str, Any] = {
+        "schema": REPORT_SCHEMA_V2,
+        "library": {"fingerprint": lib.fingerprint, "indicators": len(lib)},
+        "thresholds": [defaults.low_threshold, defaults.high_threshold],
+    }
+    report.update(_summary(ctx, classifications, decision, expl))
+    ids = lib.indicator_ids
+    report["inputs"] = {
+        "response": [responses.get(k, None) for k in ids],
+        "likelihood": [likelihood.get(k, 3) for k in ids],
+        "impact": [impact.get(k, 3) for k in ids],
+        "detectability": [detectability.get(k, 3) for k in ids],
+    }
+    return report
+
+
+# Report builders by schema name, as accepted by the CLI and the cache.
+REPORT_BUILDERS: Dict[str, Callable[..., Dict[str, Any]]] = {"v1": build_report, "v2": build_report_v2}
+
+
+def expand_report(report: Mapping[str, Any], library: Optional[CompiledLibrary] = None) -> Dict[str, Any]:
+    """Re-expand a v2 report into the equivalent v1 report.
+
+    v1 reports are returned unchanged. Raises ``ValueError`` if the report was
+    produced against a different indicator library than ``library``.
+    """
+    if report.get("schema") != REPORT_SCHEMA_V2:
+        return dict(report)
+
+    lib = library if library is not None else COMPILED_LIBRARY
+    fingerprint = report.get("library", {}).get("fingerprint")
+    if fingerprint != lib.fingerprint:
+        raise ValueError(f"report was built against library {fingerprint}, not {lib.fingerprint}")
+
+    columns: List[List[Any]] = [list(report["inputs"][key]) for key in _INPUT_KEYS]
+    if any(len(col) != len(lib) for col in columns):
+        raise ValueError(f"report inputs do not have {len(lib)} entries per input")
+    responses, likelihood, impact, detectability = ({k: v for k, v in zip(lib.indicator_ids, col)} for col in columns)
+
+    ctx = Context(activity=Activity(report["context"]["activity"]), stage=ProjectStage(report["context"]["stage"]))
+    low, high = report["thresholds"]
+    defaults = Defaults(low_threshold=float(low), high_threshold=float(high))
+    return build_report(ctx, responses, likelihood, impact, detectability, defaults, library=lib)
+
+
+def library_snapshot(library: Optional[CompiledLibrary] = None) -> Dict[str, Any]:
+    """Static library metadata that v2 reports reference by fingerprint.
+
+    Archives store this once alongside their v2 reports instead of once per
+    report.
+    """
+    lib = library if library is not None else COMPILED_LIBRARY
+    return {
+        "fingerprint": lib.fingerprint,
+        "indicators": [
+            {
+                "indicator_id": e.indicator_id,
+                "question": e.indicator.question,
+                "answer_type": e.answer_type,
+                **e.metadata,
+                "weights": {"nature": e.nature_weight, "indicator": e.base_weight},
+            }
+            for e in lib.entries
+        ],
+        "activity_domain_weights": {
+            a.value: {d.value: w for d, w in activity_domain_weights(a).items()} for a in Activity
+        },
+    }
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from praf.domain import Activity, COMPILED_LIBRARY, CompiledLibrary, Context, ProjectStage, RiskDomain
+from praf.engine.aggregator import BatchAggregatedResult, aggregate_scores_batch
+from praf.engine.classifier import classify_batch
+from praf.engine.explainability import BatchExplanation, explain_batch
+from praf.engine.rules import decide_batch
+from praf.engine.scorer import BatchScoreResult
+
+
+STORE_FORMAT = "praf.store/v1"
+
+MANIFEST_NAME = "manifest.json"
+RECORDS_NAME = "records.bin"
+
+ACTIVITIES: Tuple[Activity, ...] = tuple(Activity)
+STAGES: Tuple[ProjectStage, ...] = tuple(ProjectStage)
+
+
+def record_dtype(n_domains: int, n_categories: int, top_n: int) -> np.dtype:
+    """Fixed-width layout of one stored assessment.
+
+    ``activity``/``stage`` index ``ACTIVITIES``/``STAGES``; ``decision`` and
+    ``domain_levels`` are the ``decide_batch``/``classify_batch`` codes.
+    ``top_positions`` holds library positions (-1 padded) as in
+    ``BatchExplanation``. The layout is little-endian and unaligned so the
+    file reads the same on every platform.
+    """
+    return np.dtype(
+        [
+            ("activity", "u1"),
+            ("stage", "u1"),
+            ("decision", "i1"),
+            ("domain_levels", "i1", (n_domains,)),
+            ("domain_scores", "<f8", (n_domains,)),
+            ("category_scores", "<f8", (n_categories,)),
+            ("top_positions", "<i4", (n_domains, top_n)),
+            ("top_contributions", "<f8", (n_domains, top_n)),
+        ]
+    )
+
+
+def build_records(
+    aggregated: BatchAggregatedResult,
+    levels: np.ndarray,
+    decisions: np.ndarray,
+    explanation: BatchExplanation,
+    activities: Sequence[Activity],
+    stages: Sequence[ProjectStage],
+) -> np.ndarray:
+    """Pack batch pipeline outputs into a structured array of ``record_dtype``."""
+    n = aggregated.domain_scores.shape[0]
+    if len(activities) != n or len(stages) != n:
+        raise ValueError(f"expected {n} activities and stages, got {len(activities)} and {len(stages)}")
+    top_n = explanation.positions.shape[2]
+    records = np.empty(n, dtype=record_dtype(len(aggregated.domains), len(aggregated.categories), top_n))
+    records["activity"] = [ACTIVITIES.index(Activity(a)) for a in activities]
+    records["stage"] = [STAGES.index(ProjectStage(s)) for s in stages]
+    records["decision"] = decisions
+    records["domain_levels"] = levels
+    records["domain_scores"] = aggregated.domain_scores
+    records["category_scores"] = aggregated.category_scores
+    records["top_positions"] = explanation.positions
+    records["top_contributions"] = explanation.contributions
+    return records
+
+
+def score_records(
+    scores: BatchScoreResult,
+    activities: Sequence[Activity],
+    stages: Sequence[ProjectStage],
+    low_threshold: float,
+    high_threshold: float,
+    top_n: int = 5,
+    library: Optional[CompiledLibrary] = None,
+) -> np.ndarray:
+    """Run aggregation, classification, decision and explanation over ``scores`` and pack the result."""
+    aggregated = aggregate_scores_batch(scores, library=library)
+    levels = classify_batch(aggregated.domain_scores, low_threshold, high_threshold)
+    return build_records(
+        aggregated,
+        levels,
+        decide_batch(levels),
+        explain_batch(scores.contributions, top_n=top_n, library=library),
+        activities,
+        stages,
+    )
+
+
+def _descr(dtype: np.dtype) -> List[Any]:
+    # Round-trip through JSON so shapes compare equal to a loaded manifest.
+    return json.loads(json.dumps(np.lib.format.dtype_to_descr(dtype)))
+
+
+@dataclass(frozen=True)
+class _Manifest:
+    fingerprint: str
+    indicator_ids: Tuple[str, ...]
+    domains: Tuple[RiskDomain, ...]
+    categories: Tuple[str, ...]
+    top_n: int
+    dtype: np.dtype
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "format": STORE_FORMAT,
+            "library": {"fingerprint": self.fingerprint, "indicator_ids": list(self.indicator_ids)},
+            "domains": [d.value for d in self.domains],
+            "categories": list(self.categories),
+            "top_n": self.top_n,
+            "context_columns": {"activity": [a.value for a in ACTIVITIES], "stage": [s.value for s in STAGES]},
+            "dtype": _descr(self.dtype),
+        }
+
+    @classmethod
+    def from_json(cls, raw: Dict[str, Any]) -> "_Manifest":
+        if raw.get("format") != STORE_FORMAT:
+            raise ValueError(f"not a {STORE_FORMAT} result store: format {raw.get('format')!r}")
+        columns = raw["context_columns"]
+        if columns["activity"] != [a.value for a in ACTIVITIES] or columns["stage"] != [s.value for s in STAGES]:
+            raise ValueError("result store context columns do not match this version's activities and stages")
+        domains = tuple(RiskDomain(d) for d in raw["domains"])
+        categories = tuple(raw["categories"])
+        top_n = int(raw["top_n"])
+        dtype = record_dtype(len(domains), len(categories), top_n)
+        if _descr(dtype) != raw["dtype"]:
+            raise ValueError("result store record layout does not match its manifest")
+        return cls(
+            fingerprint=raw["library"]["fingerprint"],
+            indicator_ids=tuple(raw["library"]["indicator_ids"]),
+            domains=domains,
+            categories=categories,
+            top_n=top_n,
+            dtype=dtype,
+        )
+
+
+class ResultStore:
+    """Append-only columnar store of batch results.
+
+    A store is a directory holding ``manifest.json`` (library fingerprint,
+    indicator ids, column labels and record layout) and ``records.bin``, a
+    flat run of fixed-width ``record_dtype`` records. ``records`` memory-maps
+    the file read-only, so selecting a column such as
+    ``store.records["domain_scores"][:, j]`` touches only the pages it reads
+    instead of decoding every report. The row count is derived from the file
+    size, so the manifest never changes after ``create``.
+    """
+
+    def __init__(self, path: str, manifest: _Manifest) -> None:
+        self.path = path
+        self._manifest = manifest
+        self._records_path = os.path.join(path, RECORDS_NAME)
+        self._mapped: Optional[np.ndarray] = None
+
+    @classmethod
+    def create(cls, path: str, top_n: int = 5, library: Optional[CompiledLibrary] = None) -> "ResultStore":
+        """Create an empty store at ``path``; the directory must not already hold one."""
+        lib = library if library is not None else COMPILED_LIBRARY
+        manifest = _Manifest(
+            fingerprint=lib.fingerprint,
+            indicator_ids=lib.indicator_ids,
+            domains=lib.domains,
+            categories=tuple(c.value for c in lib.categories),
+            top_n=int(top_n),
+            dtype=record_dtype(len(lib.domains), len(lib.categories), int(top_n)),
+        )
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            raise FileExistsError(f"result store already exists at {path}")
+        open(os.path.join(path, RECORDS_NAME), "xb").close()
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest.to_json(), f, ensure_ascii=False, indent=2)
+        return cls(path, manifest)
+
+    @classmethod
+    def open(cls, path: str, library: Optional[CompiledLibrary] = None) -> "ResultStore":
+        """Open an existing store.
+
+        Raises ``ValueError`` if ``library`` is given and the store was written
+        against a different library.
+        """
+        with open(os.path.join(path, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = _Manifest.from_json(json.load(f))
+        if library is not None and manifest.fingerprint != library.fingerprint:
+            raise ValueError(f"result store was built against library {manifest.fingerprint}, not {library.fingerprint}")
+        return cls(path, manifest)
+
+    @property
+    def fingerprint(self) -> str:
+        return self._manifest.fingerprint
+
+    @property
+    def indicator_ids(self) -> Tuple[str, ...]:
+        return self._manifest.indicator_ids
+
+    @property
+    def domains(self) -> Tuple[RiskDomain, ...]:
+        return self._manifest.domains
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return self._manifest.categories
+
+    @property
+    def top_n(self) -> int:
+        return self._manifest.top_n
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._manifest.dtype
+
+    def __len__(self) -> int:
+        return os.path.getsize(self._records_path) // self.dtype.itemsize
+
+    def append(self, records: np.ndarray) -> None:
+        """Append records of this store's ``dtype`` (e.g. from ``score_records``).
+
+        A partial record left at the end by an interrupted append is cut off
+        first, so new records always start on a record boundary.
+        """
+        records = np.asarray(records)
+        if records.dtype != self.dtype:
+            raise ValueError(f"records have dtype {records.dtype}, expected {self.dtype}")
+        with open(self._records_path, "r+b") as f:
+            f.truncate(len(self) * self.dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(records).tobytes())
+
+    @property
+    def records(self) -> np.ndarray:
+        """Read-only memory-mapped view of every stored record.
+
+        The mapping is refreshed when the file has grown since the last call;
+        views taken earlier keep seeing the rows that existed then.
+        """
+        n = len(self)
+        if self._mapped is None or len(self._mapped) != n:
+            if n == 0:
+                self._mapped = np.empty(0, dtype=self.dtype)
+            else:
+                self._mapped = np.memmap(self._records_path, dtype=self.dtype, mode="r", shape=(n,))
+        return self._mapped
+
+    def context(self, row: int) -> Context:
+        record = self.records[row]
+        return Context(activity=ACTIVITIES[record["activity"]], stage=STAGES[record["stage"]])
+
+    def top_for(self, row: int, domain: RiskDomain) -> List[Tuple[str, float]]:
+        """Row ``row``'s top contributors of ``domain`` in the ``explain`` layout."""
+        j = self.domains.index(domain)
+        record = self.records[row]
+        return [
+            (self.indicator_ids[p], float(c))
+            for p, c in zip(record["top_positions"][j], record["top_contributions"][j])
+            if p >= 0
+        ]
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from praf.domain import INDICATOR_LIBRARY
+
+
+def _random_answers(rows, seed):
+    rng = np.random.default_rng(seed)
+    responses = [{k: str(rng.choice(["yes", "no", "low", "high"])) for k in INDICATOR_LIBRARY} for _ in range(rows)]
+    lid = [{k: int(rng.integers(1, 6)) for k in INDICATOR_LIBRARY} for _ in range(rows)]
+    return responses, lid
+
+
+@pytest.fixture(scope="session")
+def random_answers():
+    """``random_answers(rows, seed)`` -> ``(responses, lid)`` for every indicator.
+
+    ``lid`` holds one 1-5 rating per indicator, passed as likelihood, impact
+    and detectability alike. The same seed always gives the same rows.
+    """
+    return _random_answers
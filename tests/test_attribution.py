@@ -0,0 +1,36 @@
+import numpy as np
+
+from praf.domain import INDICATOR_LIBRARY, RiskDomain
+from praf.domain.activities import Activity
+from praf.domain.domains import activity_domain_weights
+from praf.engine.aggregator import aggregate_scores_batch
+from praf.engine.attribution import attribute
+from praf.engine.scorer import build_batch_inputs, score_indicators_batch
+
+
+def test_shares_add_up_to_indices(random_answers):
+    responses, lid = random_answers(40, 2)
+    scores = score_indicators_batch(*build_batch_inputs(responses, lid, lid, lid), activity_domain_weights(Activity.REGULATORY_PREPARATION))
+    agg = aggregate_scores_batch(scores)
+    att = attribute(scores)
+
+    present = ~np.isnan(agg.domain_scores)
+    assert np.allclose(att.domain_totals()[present], agg.domain_scores[present])
+    present = ~np.isnan(agg.category_scores)
+    assert np.allclose(att.category_totals()[present], agg.category_scores[present])
+    assert (att.domain_shares >= 0).all()
+
+
+def test_capped_domain_is_scaled_to_100():
+    ids = list(INDICATOR_LIBRARY)
+    worst = np.full((1, len(ids)), 5.0)
+    best = np.full((1, len(ids)), 1.0)
+    responses = np.where(np.array([INDICATOR_LIBRARY[i].polarity.value == "risk_when_absent" for i in ids]), best, worst)
+    scores = score_indicators_batch(responses, worst, worst, worst, activity_domain_weights(Activity.SUPPLIER_SELECTION))
+    att = attribute(scores)
+
+    j = att.domains.index(RiskDomain.SUPPLY_CHAIN)
+    assert att.domain_capped[0, j]
+    assert np.isclose(att.domain_totals()[0, j], 100.0)
+    share = att.domain_shares[0, [ids.index("I008"), ids.index("I009")]]
+    assert np.isclose(share[0] / share[1], scores.contributions[0, ids.index("I008")] / scores.contributions[0, ids.index("I009")])
@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from praf.config.defaults import Defaults
+from praf.io.auditlog import _INDEX, AuditLog, AuditLogError, read_run, verify_log
+from praf.io.loaders import load_assessment
+from praf.io.reports import build_report
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+
+
+def _write_runs(path, runs):
+    with AuditLog(path) as log:
+        for n in range(runs):
+            run = log.begin_run()
+            run.append("run", n)
+            run.append("payload", {"n": n, "text": "é" * n})
+
+
+def test_report_entries_stream_into_the_log(tmp_path):
+    path = str(tmp_path / "audit.log")
+    loaded = load_assessment(EXAMPLE)
+    with AuditLog(path) as log:
+        run = log.begin_run()
+        report = build_report(loaded.context, *loaded.sections(), Defaults(), audit_sink=run)
+    entries = read_run(path, run.run)
+    assert [{"key": e.key, "value": e.value} for e in entries] == json.loads(json.dumps(report["audit_trail"]))
+    assert verify_log(path).ok
+
+
+def test_reopen_appends_to_the_chain_and_seeks_by_run(tmp_path):
+    path = str(tmp_path / "audit.log")
+    _write_runs(path, 3)
+    _write_runs(path, 2)  # run ids continue after reopening
+    result = verify_log(path)
+    assert result.ok and result.runs == 5 and result.records == 10
+    assert [(e.key, e.value) for e in read_run(path, 4)] == [("run", 0), ("payload", {"n": 0, "text": ""})]
+    assert read_run(path, 3)[1].value["text"] == "éé"
+
+
+def test_tampering_is_detected(tmp_path):
+    path = tmp_path / "audit.log"
+    _write_runs(str(path), 4)
+    data = bytearray(path.read_bytes())
+    pos = data.index("éé".encode("utf-8"))
+    data[pos : pos + 4] = "èè".encode("utf-8")
+    path.write_bytes(bytes(data))
+    result = verify_log(str(path))
+    assert not result.ok and "hash chain" in result.error
+    assert result.error_offset < pos
+    with pytest.raises(AuditLogError, match="hash chain"):
+        read_run(str(path), 3)
+    assert read_run(str(path), 4)[0].value == 3
+
+
+def test_truncation_is_detected(tmp_path):
+    path = tmp_path / "audit.log"
+    _write_runs(str(path), 2)
+    path.write_bytes(path.read_bytes()[:-3])
+    result = verify_log(str(path))
+    assert not result.ok and "truncated" in result.error
+    with pytest.raises(AuditLogError, match="truncated"):
+        read_run(str(path), 2)
+
+
+def test_only_the_latest_run_can_append(tmp_path):
+    path = str(tmp_path / "audit.log")
+    with AuditLog(path) as log:
+        first = log.begin_run()
+        first.append("a", 1)
+        second = log.begin_run()
+        second.append("b", 1)
+        with pytest.raises(ValueError):
+            first.append("a", 2)
+        second.append("b", 2)
+    assert [(e.key, e.value) for e in read_run(path, 1)] == [("a", 1)]
+    assert [(e.key, e.value) for e in read_run(path, 2)] == [("b", 1), ("b", 2)]
+    assert verify_log(path).ok
+
+
+def test_read_run_rejects_records_of_another_run(tmp_path):
+    path = str(tmp_path / "audit.log")
+    _write_runs(path, 2)
+    index = np.fromfile(path + ".idx", dtype=_INDEX)
+    index["offset"][1] = index["offset"][0]  # run 2 now points at run 1's records
+    index["previous"][1] = index["previous"][0]
+    index.tofile(path + ".idx")
+    with pytest.raises(AuditLogError):
+        read_run(path, 2)
+
+
+def test_reopen_after_a_crash_repairs_the_tail(tmp_path):
+    path = tmp_path / "audit.log"
+    _write_runs(str(path), 3)
+    with open(str(path) + ".idx", "ab") as f:  # index entry of a run whose records never landed
+        f.write(np.array([(4, path.stat().st_size, bytes(32))], dtype=_INDEX).tobytes())
+    path.write_bytes(path.read_bytes()[:-3])  # last record of run 3 torn mid-write
+    _write_runs(str(path), 1)
+    result = verify_log(str(path))
+    assert result.ok and result.runs == 4 and result.records == 7
+    assert [(e.key, e.value) for e in read_run(str(path), 3)] == [("run", 2)]
+    assert read_run(str(path), 4)[0].value == 0
+
+
+def test_reopen_reindexes_runs_whose_index_entry_was_lost(tmp_path):
+    path = str(tmp_path / "audit.log")
+    _write_runs(path, 2)
+    index = np.fromfile(path + ".idx", dtype=_INDEX)
+    index[:1].tofile(path + ".idx")
+    _write_runs(path, 1)
+    result = verify_log(path)
+    assert result.ok and result.runs == 3
+    assert [e.value for e in read_run(path, 3)] == [0, {"n": 0, "text": ""}]
+
+
+def test_reopen_refuses_a_broken_chain(tmp_path):
+    path = tmp_path / "audit.log"
+    _write_runs(str(path), 2)
+    data = bytearray(path.read_bytes())
+    data[-2] ^= 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(AuditLogError, match="hash chain"):
+        AuditLog(str(path))
@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+
+from praf.domain import INDICATOR_LIBRARY, RiskDomain
+from praf.domain.activities import Activity
+from praf.domain.domains import activity_domain_weights
+from praf.engine.scorer import build_batch_inputs, score_indicators, score_indicators_batch
+
+
+def _random_inputs(n, seed=7):
+    rng = random.Random(seed)
+    answers = {
+        "yes_no": ["yes", "no", "Y", "maybe", None, True],
+        "low_med_high": ["low", "medium", "high", "H", 2.2, None],
+        "scale_1_5": [1, 2.5, "4", 7, "bad", None],
+    }
+    responses, likelihood, impact, detectability = [], [], [], []
+    for _ in range(n):
+        responses.append({k: rng.choice(answers[ind.answer_type.value]) for k, ind in INDICATOR_LIBRARY.items()})
+        likelihood.append({k: rng.randint(0, 6) for k in INDICATOR_LIBRARY if rng.random() < 0.8})
+        impact.append({k: rng.choice([1, 2, 3.5, 5, "2"]) for k in INDICATOR_LIBRARY})
+        detectability.append({k: rng.randint(1, 5) for k in INDICATOR_LIBRARY})
+    return responses, likelihood, impact, detectability
+
+
+def test_batch_matches_scalar_exactly():
+    responses, likelihood, impact, detectability = _random_inputs(50)
+    dw = activity_domain_weights(Activity.SUPPLIER_SELECTION)
+    batch = score_indicators_batch(*build_batch_inputs(responses, likelihood, impact, detectability), dw)
+
+    assert batch.indicator_ids == tuple(INDICATOR_LIBRARY.keys())
+    for n in range(50):
+        scalar = score_indicators(responses[n], likelihood[n], impact[n], detectability[n], dw)
+        for k, indicator_id in enumerate(batch.indicator_ids):
+            assert batch.contributions[n, k] == scalar.local_scores[indicator_id]
+            assert batch.severity[n, k] == scalar.indicator_details[indicator_id]["severity"]
+            assert batch.domain_weight[n, k] == scalar.indicator_details[indicator_id]["domain_weight"]
+
+
+def test_batch_per_assessment_domain_weights():
+    activities = [Activity.PRODUCT_DESIGN, Activity.SUPPLIER_SELECTION]
+    matrix = np.array([[activity_domain_weights(a)[d] for d in RiskDomain] for a in activities])
+    ones = np.full((2, len(INDICATOR_LIBRARY)), 3.0)
+    batch = score_indicators_batch(ones, ones, ones, ones, matrix)
+
+    col = batch.indicator_ids.index("I008")  # supply chain
+    assert batch.domain_weight[0, col] == 1.0
+    assert batch.domain_weight[1, col] == 1.35
+
+
+def test_batch_nan_is_neutral():
+    k = len(INDICATOR_LIBRARY)
+    missing = np.full((1, k), np.nan)
+    neutral = np.full((1, k), 3.0)
+    a = score_indicators_batch(missing, missing, missing, missing, {})
+    b = score_indicators_batch(neutral, neutral, neutral, neutral, {})
+    assert np.array_equal(a.contributions, b.contributions)
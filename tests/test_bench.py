@@ -0,0 +1,68 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+from praf.bench import MIN_OPS_FOR_P99, BenchReport, build_cases, compare, main, run_benchmarks, synthetic_library
+
+
+def test_cases_cover_every_stage_and_scale():
+    keys = {c.key for c in build_cases("full")}
+    assert {c.stage for c in build_cases("quick")} == {"score", "aggregate", "explain", "encode", "guidance", "patterns", "pipeline"}
+    for key in (
+        "score_indicators[assessments=1,indicators=10000]",
+        "batch_pipeline[assessments=100000,indicators=12]",
+        "generate_guidance[risks=100000]",
+        "suggest_pattern_from_text[texts=10]",
+        "cli_batch[assessments=1000]",
+    ):
+        assert key in keys
+    assert len(synthetic_library(30)) == 30
+    with pytest.raises(ValueError):
+        build_cases("huge")
+
+
+def test_run_save_and_compare(tmp_path):
+    report = run_benchmarks("quick", select=["indicators=12]", "risks=10]"], min_time=0.0, min_ops=2)
+    assert report.results and all(r.ops >= 2 and r.throughput > 0 and r.peak_bytes > 0 for r in report.results)
+    assert all(r.latency_ms["p50"] <= r.latency_ms["p99"] for r in report.results)
+
+    path = str(tmp_path / "bench.json")
+    report.save(path)
+    loaded = BenchReport.load(path)
+    assert loaded == report
+    assert compare(loaded, report) == []
+
+    first = replace(report.results[0], ops=MIN_OPS_FOR_P99)
+    report = replace(report, results=[first] + report.results[1:])
+    slower = replace(
+        first,
+        throughput=first.throughput / 2,
+        latency_ms={**first.latency_ms, "p99": first.latency_ms["p99"] * 3},
+        peak_bytes=first.peak_bytes * 2 + 10**5,
+    )
+    current = replace(report, results=[slower] + report.results[1:])
+    regressions = compare(current, report)
+    assert [(r.key, r.metric) for r in regressions] == [(first.key, m) for m in ("throughput", "p99_ms", "peak_bytes")]
+    assert regressions[0].change == pytest.approx(0.5)
+    few = replace(current, results=[replace(slower, ops=MIN_OPS_FOR_P99 - 1)])
+    assert [r.metric for r in compare(few, report)] == ["throughput", "peak_bytes"]
+    assert compare(current, report, {"throughput": 0.6, "p99_ms": 3.0, "peak_bytes": 10.0}) == []
+    with pytest.raises(ValueError):
+        compare(current, report, {"speed": 0.1})
+
+
+def test_cli_exit_status_reflects_regressions(tmp_path, capsys):
+    out = str(tmp_path / "run.json")
+    args = ["--filter", "generate_guidance_batch[risks=10]", "--min-time", "0"]
+    assert main(args + ["--output", out]) == 0
+    assert "generate_guidance_batch[risks=10]" in capsys.readouterr().out
+
+    raw = json.loads(open(out, encoding="utf-8").read())
+    raw["results"][0]["throughput"] *= 1000  # a baseline no run can match
+    baseline = str(tmp_path / "baseline.json")
+    with open(baseline, "w", encoding="utf-8") as f:
+        json.dump(raw, f)
+    assert main(args + ["--baseline", baseline]) == 1
+    assert "regression in generate_guidance_batch[risks=10]: throughput" in capsys.readouterr().err
+    assert main(args + ["--baseline", baseline, "--tolerance", "throughput=1.0"]) == 0
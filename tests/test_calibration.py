@@ -0,0 +1,35 @@
+import numpy as np
+
+from praf.domain import RiskDomain
+from praf.engine.calibration import sweep_thresholds
+from praf.engine.classifier import RiskLevel, classify_domains
+from praf.engine.rules import Decision, decide
+
+
+def test_sweep_matches_classifier_for_every_pair():
+    rng = np.random.default_rng(5)
+    domains = list(RiskDomain)[:4]
+    scores = np.round(rng.uniform(0, 100, size=(60, len(domains))), 0)  # rounding creates exact ties
+    scores[3, 1] = np.nan
+    low_grid = [20.0, 40.0, 55.0, 80.0]
+    high_grid = [40.0, 70.0, 90.0]
+
+    sweep = sweep_thresholds(scores, low_grid, high_grid)
+    assert sweep.level_counts.shape == (4, 3, 4, 3)
+    assert sweep.n_assessments == 60
+
+    for a, low in enumerate(low_grid):
+        for b, high in enumerate(high_grid):
+            levels = np.zeros((len(domains), 3), dtype=int)
+            decisions = np.zeros(3, dtype=int)
+            for row in scores:
+                present = {d: s for d, s in zip(domains, row) if not np.isnan(s)}
+                cls = classify_domains(present, low, high)
+                for j, d in enumerate(domains):
+                    if d in cls:
+                        levels[j, list(RiskLevel).index(cls[d].level)] += 1
+                decisions[list(Decision).index(decide(cls).overall)] += 1
+            assert np.array_equal(sweep.level_counts[a, b], levels)
+            assert np.array_equal(sweep.decision_counts[a, b], decisions)
+
+    assert np.allclose(sweep.decision_rates().sum(axis=-1), 1.0)
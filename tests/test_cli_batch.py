@@ -0,0 +1,58 @@
+import io
+import json
+from pathlib import Path
+
+from praf.cli.main import main
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+
+
+def _example_line():
+    return json.dumps(json.loads(EXAMPLE.read_text(encoding="utf-8")))
+
+
+def test_batch_matches_single_report(tmp_path, capsys):
+    assert main([str(EXAMPLE)]) == 0
+    single = json.loads(capsys.readouterr().out)
+
+    src = tmp_path / "in.jsonl"
+    src.write_text(_example_line() + "\n\n" + _example_line() + "\n", encoding="utf-8")
+    assert main(["batch", str(src)]) == 0
+    captured = capsys.readouterr()
+
+    lines = captured.out.splitlines()
+    assert len(lines) == 2
+    assert all(json.loads(line) == single for line in lines)
+    assert "\n" not in lines[0] and ": " not in lines[0][:40]
+    assert "2 assessments (0 failed)" in captured.err
+
+
+def test_batch_reads_stdin_and_reports_bad_records(monkeypatch, capsys):
+    stdin = io.StringIO("not json\n" + _example_line() + "\n" + '{"context": {"activity": "bogus"}}\n')
+    monkeypatch.setattr("sys.stdin", stdin)
+    assert main(["batch"]) == 1
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[0]["line"] == 1 and "error" in lines[0]
+    assert lines[1]["overall_decision"] == "escalate"
+    assert lines[2]["line"] == 3 and "bogus" in lines[2]["error"]
+
+
+def test_batch_workers_preserve_order(tmp_path, capsys):
+    lines = []
+    for n in range(23):
+        payload = json.loads(EXAMPLE.read_text(encoding="utf-8"))
+        payload["likelihood"] = {"I001": 1 + n % 5}
+        lines.append("oops" if n == 7 else json.dumps(payload))
+    src = tmp_path / "in.jsonl"
+    src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    assert main(["batch", str(src)]) == 1
+    serial = capsys.readouterr().out
+    assert main(["batch", str(src), "--workers", "3", "--chunk-size", "4"]) == 1
+    parallel = capsys.readouterr()
+
+    assert parallel.out == serial
+    assert json.loads(parallel.out.splitlines()[7])["line"] == 8
+    assert "3 worker(s)" in parallel.err
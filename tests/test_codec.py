@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from praf.domain import INDICATOR_LIBRARY, COMPILED_LIBRARY
+from praf.engine.codec import MISSING, UNKNOWN, AnswerCodec, parser_for
+from praf.engine.scorer import _map_scale_1_5, _response_scale, build_batch_inputs, score_encoded, score_indicators_batch
+
+
+ODD_ANSWERS = [None, "yes", " YES ", "y", "No", "0", "1", True, False, 1, 1.0, 0, 2.5, "2.5", 7, "-3", "low", "Med",
+               " h ", "maybe", "", 3.34, 3.35, 1.67, [1], {"x": 1}]
+
+
+@pytest.mark.parametrize("answer_type", ["yes_no", "low_med_high", "scale_1_5", "free_text"])
+def test_codes_decode_to_scalar_mapping(answer_type):
+    codec = AnswerCodec()
+    codes = codec.encode_column(answer_type, ODD_ANSWERS)
+    assert codes.tolist() == codec.encode_column(answer_type, ODD_ANSWERS).tolist()  # memoised path
+    assert codec.values[codes].tolist() == [_response_scale(answer_type, a) for a in ODD_ANSWERS]
+    assert codes[0] == MISSING
+
+
+def test_true_and_one_are_kept_apart():
+    codec = AnswerCodec()
+    code = codec.code("yes_no", True)
+    assert codec.values[code] == 5.0
+    assert codec.code("yes_no", 1) == UNKNOWN
+    assert codec.code("yes_no", 1.0) == UNKNOWN
+
+
+def test_encode_matches_per_answer_mapping_and_counts_fallbacks():
+    ids = list(INDICATOR_LIBRARY)
+    rng = np.random.default_rng(5)
+    responses = [{k: ODD_ANSWERS[int(rng.integers(len(ODD_ANSWERS)))] for k in ids} for _ in range(30)]
+    lid = [{k: ODD_ANSWERS[int(rng.integers(len(ODD_ANSWERS)))] for k in ids[::2]} for _ in range(30)]
+
+    encoded = AnswerCodec().encode(responses, lid, lid, lid)
+    assert encoded.codes.dtype == np.uint8
+    r, l, i, d = encoded.decode()
+    for row in range(30):
+        for col, entry in enumerate(COMPILED_LIBRARY.entries):
+            assert r[row, col] == _response_scale(entry.answer_type, responses[row].get(entry.indicator_id))
+            assert l[row, col] == _map_scale_1_5(lid[row].get(entry.indicator_id, 3))
+
+    parse = parser_for(COMPILED_LIBRARY.entries[0].answer_type)
+    expected = sum(1 for row in responses if row[ids[0]] is not None and parse(row[ids[0]]) is None)
+    assert encoded.unknown_counts()[0, 0] == expected
+    assert (encoded.missing_counts()[1, 1::2] == 30).all()
+    fallbacks = encoded.fallbacks()
+    assert all(count > 0 for section in fallbacks.values() for count in section.values())
+
+    batch = score_encoded(encoded, {})
+    assert np.array_equal(batch.contributions, score_indicators_batch(*build_batch_inputs(responses, lid, lid, lid), {}).contributions)
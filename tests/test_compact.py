@@ -0,0 +1,69 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from praf.domain import RiskDomain
+from praf.domain.activities import Activity
+from praf.domain.domains import activity_domain_weights
+from praf.engine.aggregator import aggregate_scores
+from praf.engine.classifier import DomainClassification, RiskLevel, classify_domains
+from praf.engine.compact import compact_result, compact_results
+from praf.engine.rules import decide
+from praf.engine.scorer import build_batch_inputs, score_indicators, score_indicators_batch
+
+
+ROWS = 300
+
+
+@pytest.fixture(scope="module")
+def inputs(random_answers):
+    responses, lid = random_answers(ROWS, 8)
+    return responses, lid, activity_domain_weights(Activity.REGULATORY_PREPARATION)
+
+
+def _scalar(responses, lid, dw):
+    score = score_indicators(responses, lid, lid, lid, dw)
+    aggregated = aggregate_scores(score.indicator_details, score.local_scores)
+    classifications = classify_domains(aggregated.domain_scores, 40.0, 70.0)
+    return score, aggregated, classifications, decide(classifications)
+
+
+def _per_assessment_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(held) == ROWS
+    return size / ROWS
+
+
+def test_views_match_scalar_results(inputs):
+    responses, lid, dw = inputs
+    batch = compact_results(score_indicators_batch(*build_batch_inputs(responses, lid, lid, lid), dw), 40.0, 70.0)
+    for row in range(0, ROWS, 37):
+        score, aggregated, classifications, decision = scalar = _scalar(responses[row], lid[row], dw)
+        for result in (compact_result(*scalar), batch[row]):
+            assert list(result.domain_scores.items()) == list(aggregated.domain_scores.items())
+            assert list(result.category_scores.items()) == list(aggregated.category_scores.items())
+            assert dict(result.local_scores) == score.local_scores
+            assert result.classifications == classifications
+            assert result.decision_result == decision
+            assert result.overall == decision.overall
+    with pytest.raises(ValueError):
+        batch[0].values[0] = 1.0
+
+
+def test_compact_results_are_much_smaller(inputs):
+    responses, lid, dw = inputs
+    full = _per_assessment_bytes(lambda: [_scalar(responses[n], lid[n], dw) for n in range(ROWS)])
+    scalar = [_scalar(responses[n], lid[n], dw) for n in range(ROWS)]
+    compact = _per_assessment_bytes(lambda: [compact_result(*s) for s in scalar])
+    assert compact < 1024
+    assert compact * 10 < full
+
+
+def test_result_types_use_slots():
+    c = DomainClassification(domain=list(RiskDomain)[0], score=1.0, level=RiskLevel.ACCEPTABLE)
+    assert not hasattr(c, "__dict__")
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from praf.domain import COMPILED_LIBRARY, INDICATOR_LIBRARY, RiskDomain, compile_library
+from praf.domain.natures import nature_weight_modifier
+from praf.domain.indicators import Polarity
+from praf.domain.activities import Activity
+from praf.domain.domains import activity_domain_weights
+from praf.engine.scorer import score_indicators
+from praf.engine.aggregator import aggregate_scores
+
+
+def test_compiled_arrays_match_library():
+    lib = COMPILED_LIBRARY
+    assert lib.indicator_ids == tuple(INDICATOR_LIBRARY.keys())
+    for indicator_id, indicator in INDICATOR_LIBRARY.items():
+        k = lib.position[indicator_id]
+        assert lib.weight_ex_domain[k] == nature_weight_modifier(indicator.nature) * indicator.base_weight
+        assert lib.invert_response[k] == (indicator.polarity == Polarity.RISK_WHEN_ABSENT)
+        assert lib.domains[lib.domain_index[k]] == indicator.domain
+        assert lib.categories[lib.category_index[k]] == indicator.category
+        assert lib.answer_types[lib.answer_type_code[k]] == indicator.answer_type
+
+
+def test_compiled_library_is_immutable():
+    with pytest.raises(ValueError):
+        COMPILED_LIBRARY.weight_ex_domain[0] = 2.0
+    with pytest.raises(TypeError):
+        COMPILED_LIBRARY.position["I999"] = 0
+
+
+def test_subset_library_scores_only_its_indicators():
+    subset = compile_library({k: INDICATOR_LIBRARY[k] for k in ("I008", "I009")})
+    dw = activity_domain_weights(Activity.SUPPLIER_SELECTION)
+    scored = score_indicators({"I008": "yes"}, {}, {}, {}, dw, library=subset)
+    assert list(scored.local_scores) == ["I008", "I009"]
+
+    agg = aggregate_scores(scored.indicator_details, scored.local_scores, library=subset)
+    assert set(agg.domain_scores) == {RiskDomain.SUPPLY_CHAIN}
+    assert agg.domain_scores == aggregate_scores(scored.indicator_details, scored.local_scores).domain_scores
+
+
+def test_domain_weight_vector_order():
+    dw = activity_domain_weights(Activity.REGULATORY_PREPARATION)
+    vec = COMPILED_LIBRARY.domain_weight_vector(dw)
+    assert np.array_equal(vec, [dw[d] for d in RiskDomain])
@@ -0,0 +1,54 @@
+import numpy as np
+
+from praf.domain import INDICATOR_LIBRARY, RiskDomain, compile_library
+from praf.domain.indicators import Indicator
+from praf.engine.classifier import classify_domains
+from praf.engine.explainability import explain, explain_batch
+from praf.engine.scorer import score_indicators
+
+
+def _wide_library(per_domain=9):
+    template = INDICATOR_LIBRARY["I008"]
+    library = {}
+    for n in range(per_domain):
+        indicator_id = f"S{n:02d}"
+        library[indicator_id] = Indicator(
+            indicator_id=indicator_id,
+            question=template.question,
+            answer_type=template.answer_type,
+            domain=template.domain,
+            category=template.category,
+            nature=template.nature,
+        )
+    return compile_library(library)
+
+
+def test_explain_ties_keep_indicator_order():
+    lib = _wide_library()
+    scored = score_indicators({}, {}, {}, {}, {}, library=lib)  # every contribution is equal
+    cls = classify_domains({RiskDomain.SUPPLY_CHAIN: 50.0}, 40.0, 70.0)
+    top = explain(cls, scored.indicator_details, scored.local_scores, top_n=3).top_contributors_by_domain
+    assert [i for i, _ in top[RiskDomain.SUPPLY_CHAIN]] == ["S00", "S01", "S02"]
+
+
+def test_explain_batch_matches_explain():
+    lib = _wide_library()
+    rng = np.random.default_rng(11)
+    contributions = rng.integers(0, 4, size=(200, len(lib))).astype(np.float64)  # many ties
+    batch = explain_batch(contributions, top_n=4, library=lib)
+
+    details = {k: {"domain": RiskDomain.SUPPLY_CHAIN.value} for k in lib.indicator_ids}
+    cls = classify_domains({RiskDomain.SUPPLY_CHAIN: 0.0}, 40.0, 70.0)
+    for row in range(200):
+        local = dict(zip(lib.indicator_ids, contributions[row]))
+        expected = explain(cls, details, local, top_n=4).top_contributors_by_domain[RiskDomain.SUPPLY_CHAIN]
+        assert batch.top_for(row, RiskDomain.SUPPLY_CHAIN) == expected
+
+
+def test_explain_batch_pads_small_domains():
+    contributions = np.arange(len(INDICATOR_LIBRARY), dtype=np.float64)[None, :]
+    batch = explain_batch(contributions, top_n=5)
+    j = batch.domains.index(RiskDomain.SUPPLY_CHAIN)
+    assert list(batch.positions[0, j]) == [8, 7, -1, -1, -1]
+    assert np.isnan(batch.contributions[0, j, 2:]).all()
+    assert batch.top_for(0, RiskDomain.SUPPLY_CHAIN) == [("I009", 8.0), ("I008", 7.0)]
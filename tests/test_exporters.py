@@ -0,0 +1,73 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from praf.cli.main import main
+from praf.io.exporters import ReportStreamWriter, export_reports
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+
+
+def _reports(n):
+    return [{"n": i, "text": "é" * (i % 3), "scores": [i / 3, None]} for i in range(n)]
+
+
+def test_ndjson_round_trip_and_serialised_text(tmp_path):
+    path = tmp_path / "out.ndjson"
+    reports = _reports(25)
+    with ReportStreamWriter(str(path), flush_every=7) as writer:
+        writer.write_many(reports[:-1])
+        writer.write(json.dumps(reports[-1]))
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == reports
+    assert writer.count == 25
+
+
+def test_json_array_is_valid_after_every_flush(tmp_path):
+    path = tmp_path / "out.json"
+    reports = _reports(10)
+    writer = ReportStreamWriter(str(path), format="json", flush_every=3)
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+    for n, report in enumerate(reports, start=1):
+        writer.write(report)
+        assert json.loads(path.read_text(encoding="utf-8")) == reports[: n - n % 3]
+    writer.close()
+    assert json.loads(path.read_text(encoding="utf-8")) == reports
+
+
+def test_gzip_members_are_readable_without_close(tmp_path):
+    path = tmp_path / "out.ndjson.gz"
+    reports = _reports(20)
+    writer = ReportStreamWriter(str(path), flush_every=4)
+    writer.write_many(reports[:10])  # 8 flushed, 2 pending when the "crash" happens
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == reports[:8]
+    writer.write_many(reports[10:])
+    writer.close()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == reports
+
+
+def test_rejects_unsupported_combinations(tmp_path):
+    with pytest.raises(ValueError):
+        ReportStreamWriter(str(tmp_path / "out.json.gz"), format="json")
+    with pytest.raises(ValueError):
+        ReportStreamWriter(str(tmp_path / "out.zst"), compress="zstd")
+    assert export_reports(str(tmp_path / "empty.json"), [], format="json") == 0
+    assert json.loads((tmp_path / "empty.json").read_text(encoding="utf-8")) == []
+
+
+def test_batch_writes_gzip_output(tmp_path, capsys):
+    src = tmp_path / "in.jsonl"
+    line = json.dumps(json.loads(EXAMPLE.read_text(encoding="utf-8")))
+    src.write_text(line + "\n" + line + "\n", encoding="utf-8")
+    assert main(["batch", str(src)]) == 0
+    expected = capsys.readouterr().out
+    out = tmp_path / "out.ndjson.gz"
+    assert main(["batch", str(src), "--output", str(out)]) == 0
+    assert capsys.readouterr().out == ""
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        assert f.read() == expected
@@ -0,0 +1,104 @@
+import random
+
+import numpy as np
+
+from praf.domain.activities import Activity, Context, ProjectStage
+from praf.domain.risk_patterns import RiskPattern, UserRisk
+from praf.engine.guidance import (
+    STAGES,
+    GateGuidance,
+    generate_guidance,
+    generate_guidance_batch,
+    iter_guidance,
+    register_columns,
+)
+
+
+def _register(n, seed):
+    rng = random.Random(seed)
+    patterns = list(RiskPattern) + [None]
+    return [
+        UserRisk(
+            risk_id=f"R{k}",
+            description="",
+            owner="",
+            likelihood=rng.randint(1, 5),
+            impact=rng.randint(1, 5),
+            detectability=rng.randint(1, 5),
+            pattern=rng.choice(patterns),
+        )
+        for k in range(n)
+    ]
+
+
+def test_batch_matches_generate_guidance():
+    contexts = [Context(Activity.PRODUCT_DESIGN, stage) for stage in ProjectStage] * 4
+    registers = [_register(random.Random(c).randint(0, 12), seed=c) for c in range(len(contexts))]
+
+    rows = [r for reg in registers for r in reg]
+    patterns, l, i, d = register_columns(rows)
+    stages = np.array([STAGES.index(ctx.stage) for ctx, reg in zip(contexts, registers) for _ in reg])
+    groups = np.array([c for c, reg in enumerate(registers) for _ in reg])
+    batch = generate_guidance_batch(patterns, l, i, d, stages, groups, n_contexts=len(contexts))
+
+    row = 0
+    for c, (ctx, reg) in enumerate(zip(contexts, registers)):
+        summary = generate_guidance(ctx, reg)
+        assert batch.overall_gates()[c] == summary.overall_gate_guidance
+        by_id = {item.risk_id: item for item in summary.items}
+        for risk in reg:
+            item = by_id.get(risk.risk_id)
+            if item is None:
+                assert batch.priority(row) is None and batch.gate(row) is None
+            else:
+                assert batch.priority(row) == item.priority
+                assert batch.gate(row) == item.gate_guidance
+                assert list(batch.actions(row)) == item.recommended_actions
+                assert list(batch.evidence(row)) == item.expected_evidence
+                assert batch.why(row) == item.why
+            row += 1
+
+
+def test_batch_shares_action_tuples():
+    patterns, l, i, d = register_columns(_register(50, seed=1))
+    batch = generate_guidance_batch(patterns, l, i, d, STAGES.index(ProjectStage.PILOT))
+    mapped = [r for r in range(len(batch)) if batch.pattern_codes[r] == 0]
+    assert len({id(batch.actions(r)) for r in mapped}) == 1
+
+
+def test_batch_unmapped_rows_have_no_guidance():
+    patterns, l, i, d = register_columns(_register(50, seed=2))
+    batch = generate_guidance_batch(patterns, l, i, d, STAGES.index(ProjectStage.PILOT))
+    unmapped = [r for r in range(len(batch)) if batch.pattern_codes[r] < 0]
+    assert unmapped
+    for r in unmapped:
+        assert batch.why(r) is None and batch.priority(r) is None and batch.gate(r) is None
+        assert batch.actions(r) == () and batch.evidence(r) == ()
+
+
+def test_stream_matches_generate_guidance():
+    for stage in ProjectStage:
+        ctx = Context(Activity.SUPPLIER_SELECTION, stage)
+        for seed in range(20):
+            register = _register(15, seed)
+            summary = generate_guidance(ctx, register)
+            stream = iter_guidance(ctx, register)
+            assert stream.overall_gate_guidance == summary.overall_gate_guidance
+            assert list(stream) == summary.items
+
+
+def test_stream_resolves_gate_at_first_critical():
+    consumed = []
+
+    def risks():
+        for k in range(1000):
+            consumed.append(k)
+            critical = k == 3
+            yield UserRisk(f"R{k}", "", "", 5 if critical else 1, 5 if critical else 1, 1, RiskPattern.DATA_INTEGRITY)
+
+    stream = iter_guidance(Context(Activity.DATA_COLLECTION, ProjectStage.PILOT), risks())
+    assert stream.overall_gate_guidance == GateGuidance.HOLD_PENDING_CONTROLS
+    assert len(consumed) == 4
+    top = stream.take(1)
+    assert top[0].risk_id == "R3" and len(consumed) == 4
+    assert len(stream.take(20)) == 20
@@ -0,0 +1,98 @@
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from praf.config.defaults import Defaults
+from praf.domain import Activity, ProjectStage, RiskDomain
+from praf.engine.classifier import RiskLevel
+from praf.engine.rules import Decision
+from praf.io.history import HistoryStore
+from praf.io.loaders import load_assessment
+from praf.io.reports import build_report
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+DOMAIN = list(RiskDomain)[0]
+J = 0
+
+
+def _batch(store, project, scores, start=0.0, activity=Activity.PRODUCT_DESIGN, stage=ProjectStage.DESIGN):
+    n = len(scores)
+    domain_scores = np.full((n, len(RiskDomain)), np.nan)
+    domain_scores[:, J] = scores
+    levels = np.full((n, len(RiskDomain)), -1)
+    levels[:, J] = [0 if s < 40 else 1 if s < 70 else 2 for s in scores]
+    store.add_batch([project] * n, [start + t for t in range(n)], [activity] * n, [stage] * n, domain_scores, levels,
+                    levels.max(axis=1))
+
+
+def test_trend_transitions_and_latest(tmp_path):
+    with HistoryStore(str(tmp_path / "h.sqlite")) as store:
+        _batch(store, "alpha", [10.0, 20.0, 50.0, 55.0, 80.0, 30.0])
+        _batch(store, "beta", [75.0, 72.0], start=100.0, activity=Activity.SUPPLIER_SELECTION)
+        assert len(store) == 8
+
+        trend = store.trend("alpha", DOMAIN, last=3)
+        assert [p.score for p in trend] == [55.0, 80.0, 30.0]
+        assert [p.timestamp for p in trend] == [3.0, 4.0, 5.0]
+        assert len(store.trend("alpha", DOMAIN)) == 6
+        assert store.trend("alpha", list(RiskDomain)[1]) == []
+
+        changes = [(t.timestamp, t.previous, t.level) for t in store.transitions("alpha", DOMAIN)]
+        assert changes == [
+            (2.0, RiskLevel.ACCEPTABLE, RiskLevel.ACTION_REQUIRED),
+            (4.0, RiskLevel.ACTION_REQUIRED, RiskLevel.ESCALATION_REQUIRED),
+            (5.0, RiskLevel.ESCALATION_REQUIRED, RiskLevel.ACCEPTABLE),
+        ]
+
+        latest = store.latest()
+        assert latest["alpha"].timestamp == 5.0 and latest["alpha"].decision == Decision.PROCEED
+        assert latest["beta"].decision == Decision.ESCALATE
+        assert list(store.latest(activity=Activity.SUPPLIER_SELECTION)) == ["beta"]
+
+
+def test_reports_round_trip(tmp_path):
+    loaded = load_assessment(EXAMPLE)
+    report = build_report(loaded.context, *loaded.sections(), Defaults())
+    when = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    with HistoryStore(str(tmp_path / "h.sqlite")) as store:
+        assert store.add_reports([("p", when, report)]) == 1
+        for domain, entry in report["domain_scores"].items():
+            (point,) = store.trend("p", RiskDomain(domain))
+            assert point.timestamp == when.timestamp()
+            assert (point.score, point.level.value) == (entry["score"], entry["level"])
+        assert store.latest()["p"].decision.value == report["overall_decision"]
+
+
+def test_indexes_exist(tmp_path):
+    with HistoryStore(str(tmp_path / "h.sqlite")) as store:
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT ts FROM domain_scores WHERE project = 'x' AND domain = 'y' ORDER BY ts"
+        ).fetchall()
+        assert any("ix_domain_scores_project_domain_ts" in row[-1] for row in plan)
+
+
+def test_concurrent_writers_get_distinct_ids(tmp_path):
+    path = str(tmp_path / "h.sqlite")
+    HistoryStore(path).close()  # create the schema once
+    errors = []
+
+    def write(project):
+        try:
+            with HistoryStore(path) as store:
+                for k in range(30):
+                    _batch(store, project, [10.0, 50.0, 80.0], start=3.0 * k)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(f"p{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    with HistoryStore(path) as store:
+        assert len(store) == 4 * 30 * 3
+        assert all(len(store.trend(f"p{n}", DOMAIN)) == 90 for n in range(4))
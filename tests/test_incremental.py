@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from praf.config.defaults import Defaults
+from praf.domain import INDICATOR_LIBRARY, RiskDomain
+from praf.domain.activities import Activity
+from praf.domain.domains import activity_domain_weights
+from praf.engine.aggregator import aggregate_scores
+from praf.engine.classifier import RiskLevel, classify_domains
+from praf.engine.incremental import IncrementalAssessment
+from praf.engine.rules import Decision, decide
+from praf.engine.scorer import score_indicators
+
+
+def _full(responses, lid, dw, d):
+    scored = score_indicators(responses, lid, lid, lid, dw)
+    agg = aggregate_scores(scored.indicator_details, scored.local_scores)
+    cls = classify_domains(agg.domain_scores, d.low_threshold, d.high_threshold)
+    return agg, cls, decide(cls)
+
+
+def test_initial_state_matches_pipeline_exactly():
+    d = Defaults()
+    dw = activity_domain_weights(Activity.SUPPLIER_SELECTION)
+    responses = {"I001": "no", "I004": "high", "I008": "yes"}
+    lid = {"I001": 4, "I008": 5}
+    inc = IncrementalAssessment(responses, lid, lid, lid, dw, d.low_threshold, d.high_threshold)
+    agg, cls, decision = _full(responses, lid, dw, d)
+
+    assert inc.domain_scores == agg.domain_scores
+    assert inc.category_scores == agg.category_scores
+    assert inc.classifications == cls
+    assert inc.decision == decision
+
+
+def test_random_edits_track_full_recompute():
+    rng = random.Random(3)
+    d = Defaults()
+    dw = activity_domain_weights(Activity.PRODUCT_DESIGN)
+    responses, lid = {}, {}
+    inc = IncrementalAssessment(responses, lid, lid, lid, dw, d.low_threshold, d.high_threshold)
+
+    for _ in range(300):
+        indicator_id = rng.choice(list(INDICATOR_LIBRARY))
+        answer = rng.choice(["yes", "no", "low", "high", 2, None])
+        value = rng.randint(1, 5)
+        responses[indicator_id] = answer
+        lid[indicator_id] = value
+        update = inc.set_answer(indicator_id, response=answer, likelihood=value, impact=value, detectability=value)
+
+        agg, cls, decision = _full(responses, lid, dw, d)
+        assert update.score == pytest.approx(agg.domain_scores[update.domain])
+        for domain, score in inc.domain_scores.items():
+            assert score == pytest.approx(agg.domain_scores[domain])
+        assert inc.decision == decision
+
+
+def test_set_answer_reports_flips():
+    d = Defaults()
+    ids = list(INDICATOR_LIBRARY)
+    responses = {i: "yes" for i in ids}
+    lid = {i: 1 for i in ids}
+    inc = IncrementalAssessment(responses, lid, lid, lid, {}, d.low_threshold, d.high_threshold)
+    assert inc.overall == Decision.PROCEED
+
+    update = inc.set_answer("I008", response="no", likelihood=5, impact=5, detectability=5)
+    assert update.domain == RiskDomain.SUPPLY_CHAIN
+    assert not update.level_changed and not update.decision_changed
+
+    update = inc.set_answer("I009", response="no", likelihood=3, impact=3, detectability=3)
+    assert update.previous_level == RiskLevel.ACCEPTABLE
+    assert update.level == RiskLevel.ACTION_REQUIRED
+    assert update.decision_changed and update.overall == Decision.REVISE
+
+    update = inc.set_answer("I009", response="yes", likelihood=1, impact=1, detectability=1)
+    assert update.level == RiskLevel.ACCEPTABLE
+    assert update.decision_changed and inc.overall == Decision.PROCEED
+
+
+def test_unknown_indicator_raises():
+    inc = IncrementalAssessment({}, {}, {}, {}, {}, 40.0, 70.0)
+    with pytest.raises(KeyError):
+        inc.set_answer("I999", response="yes")
@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from praf.domain import Activity, ProjectStage
+from praf.io.loaders import decode_assessment, load_assessment, load_json_inputs
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+
+
+def test_path_and_bytes_agree_with_legacy_loader():
+    legacy = load_json_inputs(str(EXAMPLE))
+    from_path = load_assessment(EXAMPLE)
+    from_bytes = load_assessment(EXAMPLE.read_bytes())
+    for loaded in (from_path, from_bytes):
+        assert loaded.responses == legacy.responses
+        assert loaded.likelihood == legacy.likelihood
+        assert loaded.impact == legacy.impact
+        assert loaded.detectability == legacy.detectability
+        assert loaded.unknown_ids == ()
+    assert from_path.context == from_bytes.context
+
+
+def test_context_defaults_and_values():
+    loaded = load_assessment(b'{"responses": {}}')
+    assert loaded.context.activity == Activity("product_design")
+    assert loaded.context.stage == ProjectStage("design")
+
+    raw = json.loads(EXAMPLE.read_text(encoding="utf-8"))
+    loaded = load_assessment(memoryview(json.dumps(raw).encode("utf-16")))
+    assert loaded.context.activity.value == raw["context"]["activity"]
+
+
+def test_sections_are_not_copied():
+    payload = {"responses": {"I001": "yes"}}
+    assert decode_assessment(payload).responses is payload["responses"]
+
+
+def test_unknown_ids():
+    payload = {"responses": {"I001": "yes", "NOPE": "no"}, "impact": {"NOPE": 3, "ALSO": 2}}
+    assert decode_assessment(payload).unknown_ids == ("NOPE", "ALSO")
+    with pytest.raises(ValueError, match="NOPE"):
+        decode_assessment(payload, strict=True)
+
+
+@pytest.mark.parametrize("payload", [[], {"responses": [1]}, {"context": "x"}])
+def test_rejects_malformed(payload):
+    with pytest.raises(ValueError):
+        decode_assessment(payload)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from praf.domain import Activity, Context, ProjectStage, RiskDomain
+from praf.domain.domains import activity_domain_weights
+from praf.engine.aggregator import aggregate_scores_batch
+from praf.engine.classifier import classify_batch
+from praf.engine.compact import compact_results
+from praf.engine.portfolio import PortfolioCube
+from praf.engine.rules import decide_batch
+from praf.engine.scorer import build_batch_inputs, score_indicators_batch
+
+
+def _shard(random_answers, seed, rows=60):
+    responses, lid = random_answers(rows, seed)
+    rng = np.random.default_rng([seed, 1])
+    activities = [list(Activity)[i] for i in rng.integers(0, len(Activity), rows)]
+    stages = [list(ProjectStage)[i] for i in rng.integers(0, len(ProjectStage), rows)]
+    dw = np.array([[activity_domain_weights(a).get(d, 1.0) for d in RiskDomain] for a in activities])
+    scores = score_indicators_batch(*build_batch_inputs(responses, lid, lid, lid), dw)
+    agg = aggregate_scores_batch(scores)
+    levels = classify_batch(agg.domain_scores, 40.0, 70.0)
+    return activities, stages, agg.domain_scores, levels, decide_batch(levels), scores
+
+
+def _cube(shard, bins=200):
+    cube = PortfolioCube(bins)
+    cube.add_batch(*shard[:5])
+    return cube
+
+
+def test_merge_equals_single_pass(random_answers):
+    shards = [_shard(random_answers, seed) for seed in range(3)]
+    single = PortfolioCube()
+    activities = [a for s in shards for a in s[0]]
+    stages = [x for s in shards for x in s[1]]
+    single.add_batch(activities, stages, *(np.concatenate([s[i] for s in shards]) for i in range(2, 5)))
+    merged = PortfolioCube.merge_all(_cube(s) for s in shards)
+    assert merged == single
+    assert merged == _cube(shards[2]).merge(_cube(shards[0])).merge(_cube(shards[1]))
+    assert merged.n_assessments == 180
+
+
+def test_counts_and_quantiles(random_answers):
+    activities, stages, scores, levels, decisions, _ = shard = _shard(random_answers, 7, rows=400)
+    cube = _cube(shard, bins=1000)
+    assert cube.decisions().tolist() == np.bincount(decisions, minlength=3).tolist()
+    a, s = activities[0], stages[0]
+    mask = np.array([x == a and y == s for x, y in zip(activities, stages)])
+    j = 0
+    present = levels[mask, j] >= 0
+    assert cube.levels(a, s)[j].tolist() == np.bincount(levels[mask, j][present], minlength=3).tolist()
+
+    for j, domain in enumerate(RiskDomain):
+        column = scores[:, j]
+        if np.isnan(column).all():
+            assert np.isnan(cube.quantiles(domain)).all()
+            continue
+        # The sketch lands in the bin holding the ceil(q * n)-th score.
+        exact = np.quantile(column, [0.0, 0.1, 0.5, 0.9, 1.0], method="inverted_cdf")
+        assert np.allclose(cube.quantiles(domain, [0.0, 0.1, 0.5, 0.9, 1.0]), exact, atol=100.0 / 1000)
+
+
+def test_compact_results_and_serialisation(random_answers):
+    activities, stages, *_, scores = shard = _shard(random_answers, 3)
+    cube = PortfolioCube()
+    for a, s, result in zip(activities, stages, compact_results(scores, 40.0, 70.0)):
+        cube.add_result(Context(activity=a, stage=s), result)
+    assert cube == _cube(shard)
+
+    data = cube.to_bytes()
+    assert len(data) < 20_000
+    assert PortfolioCube.from_bytes(data) == cube
+    with pytest.raises(ValueError):
+        cube.merge(PortfolioCube(bins=10))
+
+
+def test_store_records(random_answers):
+    from praf.io.store import score_records
+
+    activities, stages, *_, scores = shard = _shard(random_answers, 5)
+    cube = PortfolioCube()
+    cube.add_records(score_records(scores, activities, stages, 40.0, 70.0))
+    assert cube == _cube(shard)
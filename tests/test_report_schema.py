@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from praf.cli.report import context_from_payload
+from praf.config.defaults import Defaults
+from praf.domain import INDICATOR_LIBRARY, compile_library
+from praf.io.loaders import load_report
+from praf.io.reports import REPORT_SCHEMA_V2, build_report, build_report_v2, expand_report, library_snapshot
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+
+
+def _reports(defaults=None):
+    payload = json.loads(EXAMPLE.read_text(encoding="utf-8"))
+    payload["responses"].pop("I005")  # missing answers must survive the round trip
+    args = (
+        context_from_payload(payload),
+        payload["responses"],
+        payload["likelihood"],
+        payload["impact"],
+        payload["detectability"],
+    )
+    d = defaults or Defaults()
+    return build_report(*args, defaults=d), build_report_v2(*args, defaults=d)
+
+
+def test_v2_expands_to_v1(tmp_path):
+    v1, v2 = _reports(Defaults(low_threshold=30.0, high_threshold=60.0))
+    assert v2["schema"] == REPORT_SCHEMA_V2
+    assert "audit_trail" not in v2
+
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(v2), encoding="utf-8")
+    assert json.loads(json.dumps(load_report(str(path)))) == json.loads(json.dumps(v1))
+
+
+def test_v2_is_much_smaller():
+    v1, v2 = _reports()
+    assert len(json.dumps(v2)) * 3 < len(json.dumps(v1))
+
+
+def test_expand_rejects_other_library():
+    _, v2 = _reports()
+    other = compile_library({k: v for k, v in INDICATOR_LIBRARY.items() if k != "I012"})
+    with pytest.raises(ValueError):
+        expand_report(v2, library=other)
+
+
+def test_library_snapshot_carries_fingerprint():
+    _, v2 = _reports()
+    snapshot = library_snapshot()
+    assert snapshot["fingerprint"] == v2["library"]["fingerprint"]
+    assert [i["indicator_id"] for i in snapshot["indicators"]] == list(INDICATOR_LIBRARY)
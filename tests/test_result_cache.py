@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from praf.cli.main import main
+from praf.config.defaults import Defaults
+from praf.domain import INDICATOR_LIBRARY, compile_library
+from praf.io.cache import DirectoryTier, ResultCache, SQLiteTier, assessment_key, cached_report_json
+from praf.io.loaders import load_assessment
+from praf.io.reports import build_report
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+
+
+def _args():
+    loaded = load_assessment(EXAMPLE)
+    return (loaded.context, *loaded.sections())
+
+
+def test_key_is_normalised_and_covers_inputs():
+    ctx, responses, likelihood, impact, detectability = _args()
+    d = Defaults()
+    key = assessment_key(ctx, responses, likelihood, impact, detectability, d)
+
+    shuffled = dict(reversed(list(responses.items())), UNKNOWN="yes")
+    assert assessment_key(ctx, shuffled, likelihood, impact, detectability, d) == key
+
+    changed = dict(impact, **{next(iter(INDICATOR_LIBRARY)): 1 if impact.get(next(iter(INDICATOR_LIBRARY))) != 1 else 2})
+    assert assessment_key(ctx, responses, likelihood, changed, detectability, d) != key
+    assert assessment_key(ctx, responses, likelihood, impact, detectability, Defaults(high_threshold=80.0)) != key
+    assert assessment_key(ctx, responses, likelihood, impact, detectability, d, schema="v2") != key
+    other = compile_library(dict(list(INDICATOR_LIBRARY.items())[:-1]))
+    assert assessment_key(ctx, responses, likelihood, impact, detectability, d, library=other) != key
+
+
+def test_hits_return_the_built_report():
+    args = _args()
+    cache = ResultCache()
+    first = cached_report_json(cache, *args, Defaults())
+    second = cached_report_json(cache, *args, Defaults())
+    assert first == second
+    assert json.loads(first) == json.loads(json.dumps(build_report(*args, Defaults())))
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.size_bytes == len(first.encode("utf-8"))
+
+
+def test_lru_evicts_by_size():
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"  # "a" is now most recent
+    cache.put("c", b"1234")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put("huge", b"x" * 11)  # larger than the whole cache: not kept in memory
+    assert cache.get("huge") is None
+    stats = cache.stats
+    assert stats.evictions == 1 and stats.size_bytes == 8
+
+
+@pytest.mark.parametrize("tier", [lambda p: DirectoryTier(str(p / "dir")), lambda p: SQLiteTier(str(p / "c.sqlite"))])
+def test_disk_tier_survives_restart(tmp_path, tier):
+    ResultCache(disk=tier(tmp_path)).put("k", b"report")
+    cache = ResultCache(disk=tier(tmp_path))
+    assert cache.get("k") == b"report"
+    assert cache.get("k") == b"report"
+    assert cache.stats.disk_hits == 1 and cache.stats.hits == 2
+    assert cache.get("missing") is None and cache.stats.misses == 1
+
+
+def test_batch_cache_output_is_unchanged(tmp_path, capsys):
+    src = tmp_path / "in.jsonl"
+    line = json.dumps(json.loads(EXAMPLE.read_text(encoding="utf-8")))
+    src.write_text(line + "\n" + line + "\n", encoding="utf-8")
+
+    assert main(["batch", str(src)]) == 0
+    plain = capsys.readouterr().out
+    cache = str(tmp_path / "cache.db")
+    assert main(["batch", str(src), "--cache", cache]) == 0
+    captured = capsys.readouterr()
+    assert captured.out == plain
+    assert "cache 1 hit(s) / 1 miss(es)" in captured.err
+    # Counters belong to one run, not to the process.
+    assert main(["batch", str(src), "--cache", cache]) == 0
+    assert "cache 2 hit(s) / 0 miss(es)" in capsys.readouterr().err
+
+
+def test_batch_cache_counts_worker_lookups(tmp_path, capsys):
+    src = tmp_path / "in.jsonl"
+    line = json.dumps(json.loads(EXAMPLE.read_text(encoding="utf-8")))
+    src.write_text((line + "\n") * 4, encoding="utf-8")
+    cache = str(tmp_path / "cache")
+    assert main(["batch", str(src), "--cache", cache]) == 0
+    capsys.readouterr()
+    assert main(["batch", str(src), "--cache", cache, "--workers", "2", "--chunk-size", "1"]) == 0
+    assert "cache 4 hit(s) / 0 miss(es)" in capsys.readouterr().err
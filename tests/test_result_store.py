@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pytest
+
+from praf.config.defaults import Defaults
+from praf.domain import INDICATOR_LIBRARY, Activity, Context, ProjectStage, compile_library
+from praf.domain.domains import activity_domain_weights
+from praf.engine.rules import Decision
+from praf.engine.scorer import build_batch_inputs, score_indicators_batch
+from praf.io.reports import build_report
+from praf.io.store import ResultStore, score_records
+
+
+def _records(responses, lid, activity, stage):
+    scores = score_indicators_batch(*build_batch_inputs(responses, lid, lid, lid), activity_domain_weights(activity))
+    d = Defaults()
+    n = len(responses)
+    return score_records(scores, [activity] * n, [stage] * n, d.low_threshold, d.high_threshold)
+
+
+def test_round_trip_matches_reports(tmp_path, random_answers):
+    activity, stage = list(Activity)[-1], list(ProjectStage)[-1]
+    responses, lid = random_answers(12, 4)
+    store = ResultStore.create(str(tmp_path / "store"))
+    assert len(store) == 0 and len(store.records) == 0
+
+    store.append(_records(responses[:5], lid[:5], activity, stage))
+    store.append(_records(responses[5:], lid[5:], activity, stage))
+
+    reopened = ResultStore.open(str(tmp_path / "store"))
+    assert len(reopened) == len(responses)
+    assert isinstance(reopened.records, np.memmap)
+    ctx = Context(activity=activity, stage=stage)
+    for row in range(len(responses)):
+        report = build_report(ctx, responses[row], lid[row], lid[row], lid[row], Defaults())
+        assert reopened.context(row) == ctx
+        j = {d.value: i for i, d in enumerate(reopened.domains)}
+        for domain, entry in report["domain_scores"].items():
+            assert reopened.records[row]["domain_scores"][j[domain]] == entry["score"]
+        for domain, top in report["top_contributors_by_domain"].items():
+            got = reopened.top_for(row, reopened.domains[j[domain]])
+            assert [tuple(x) for x in json.loads(json.dumps(got))] == [tuple(x) for x in json.loads(json.dumps(top))]
+        assert tuple(Decision)[reopened.records[row]["decision"]].value == report["overall_decision"]
+
+
+def test_records_view_is_read_only_and_grows(tmp_path, random_answers):
+    responses, lid = random_answers(4, 4)
+    store = ResultStore.create(str(tmp_path / "s"))
+    store.append(_records(responses, lid, list(Activity)[0], list(ProjectStage)[0]))
+    view = store.records
+    with pytest.raises(ValueError):
+        view["decision"][0] = 2
+    store.append(_records(responses, lid, list(Activity)[0], list(ProjectStage)[0]))
+    assert len(view) == 4 and len(store.records) == 8
+
+
+def test_torn_append_is_cut_off(tmp_path, random_answers):
+    responses, lid = random_answers(3, 4)
+    records = _records(responses, lid, list(Activity)[0], list(ProjectStage)[0])
+    store = ResultStore.create(str(tmp_path / "s"))
+    store.append(records[:2])
+    with open(str(tmp_path / "s" / "records.bin"), "ab") as f:
+        f.write(records[2:].tobytes()[:7])  # an append interrupted mid-record
+    reopened = ResultStore.open(str(tmp_path / "s"))
+    assert len(reopened) == 2
+    reopened.append(records[2:])
+    assert len(reopened) == 3
+    assert reopened.records.tobytes() == records.tobytes()
+
+
+def test_guards(tmp_path):
+    path = str(tmp_path / "s")
+    store = ResultStore.create(path)
+    with pytest.raises(FileExistsError):
+        ResultStore.create(path)
+    with pytest.raises(ValueError):
+        store.append(np.zeros(3))
+    other = compile_library(dict(list(INDICATOR_LIBRARY.items())[:-1]))
+    with pytest.raises(ValueError, match="library"):
+        ResultStore.open(path, library=other)
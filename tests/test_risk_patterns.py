@@ -0,0 +1,53 @@
+import random
+
+from praf.domain.risk_patterns import (
+    PATTERN_KEYWORDS,
+    PatternSuggestion,
+    RiskPattern,
+    suggest_pattern_from_text,
+    suggest_patterns,
+)
+
+
+def _reference(text):
+    # The original nine ordered any(...) checks.
+    t = (text or "").strip().lower()
+    for pattern, keywords in PATTERN_KEYWORDS:
+        if any(k in t for k in keywords):
+            return pattern
+    return RiskPattern.OTHER
+
+
+def _texts(n, seed=0):
+    rng = random.Random(seed)
+    keywords = [k for _, ks in PATTERN_KEYWORDS for k in ks]
+    filler = ["the", "late", "DATA", "Team", "supervisor", "  ", "set", "plan", "test", "risk"]
+    texts = [None, "", "   ", "Single Source  ", "manufacturing dataset"]
+    for _ in range(n):
+        words = [rng.choice(filler) for _ in range(rng.randint(0, 8))]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords).upper() if rng.random() < 0.2 else rng.choice(keywords))
+        texts.append(rng.choice([" ", ""]).join(words))
+    return texts
+
+
+def test_precedence_unchanged():
+    assert suggest_pattern_from_text("Vendor data drift") == RiskPattern.SUPPLIER_RELIABILITY
+    assert suggest_pattern_from_text("dataset size") == RiskPattern.DATA_INTEGRITY
+    assert suggest_pattern_from_text("ISO submission") == RiskPattern.REGULATORY_READINESS
+    assert suggest_pattern_from_text(None) == RiskPattern.OTHER
+    for text in _texts(500):
+        assert suggest_pattern_from_text(text) == _reference(text)
+
+
+def test_batch_matches_single_text():
+    texts = _texts(2000, seed=1)
+    assert suggest_patterns(texts) == [_reference(t) for t in texts]
+    assert suggest_patterns([]) == []
+
+
+def test_batch_reports_all_keywords():
+    results = suggest_patterns(["Supplier dataset drift", "nothing here", "traceability"], with_keywords=True)
+    assert results[0] == PatternSuggestion(RiskPattern.SUPPLIER_RELIABILITY, ("supplier", "drift", "data", "dataset"))
+    assert results[1] == PatternSuggestion(RiskPattern.OTHER, ())
+    assert results[2].keywords == ("trace", "traceability")
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from praf.config.defaults import Defaults
+from praf.domain import INDICATOR_LIBRARY
+from praf.domain.activities import Activity
+from praf.domain.domains import activity_domain_weights
+from praf.engine.aggregator import aggregate_scores
+from praf.engine.classifier import classify_domains
+from praf.engine.rules import decide
+from praf.engine.sensitivity import INPUTS, sensitivity
+from praf.engine.scorer import score_indicators
+
+
+RAW_ANSWERS = {
+    "yes_no": {1.0: "no", 5.0: "yes"},
+    "low_med_high": {1.0: "low", 3.0: "medium", 5.0: "high"},
+    "scale_1_5": {v: v for v in (1.0, 2.0, 3.0, 4.0, 5.0)},
+}
+
+
+def _pipeline(sections, dw, d):
+    scored = score_indicators(*sections, dw)
+    agg = aggregate_scores(scored.indicator_details, scored.local_scores)
+    cls = classify_domains(agg.domain_scores, d.low_threshold, d.high_threshold)
+    return agg, cls, decide(cls)
+
+
+def test_sensitivity_matches_rerunning_pipeline():
+    d = Defaults()
+    dw = activity_domain_weights(Activity.SUPPLIER_SELECTION)
+    sections = (
+        {"I001": "no", "I004": "medium", "I008": "yes", "I009": "no"},
+        {"I008": 4, "I009": 3},
+        {"I008": 4, "I001": 5},
+        {"I009": 4},
+    )
+    result = sensitivity(*sections, dw, d.low_threshold, d.high_threshold)
+    agg, _, _ = _pipeline(sections, dw, d)
+
+    for k, indicator_id in enumerate(result.indicator_ids):
+        answer_type = INDICATOR_LIBRARY[indicator_id].answer_type.value
+        for s, name in enumerate(INPUTS):
+            for v, value in enumerate(result.values):
+                if not result.admissible[k, s, v]:
+                    assert s == 0 and value not in RAW_ANSWERS[answer_type]
+                    continue
+                changed = [dict(x) for x in sections]
+                changed[s][indicator_id] = RAW_ANSWERS[answer_type][value] if s == 0 else value
+                new_agg, new_cls, new_decision = _pipeline(changed, dw, d)
+                domain = result.domains[k]
+                assert result.domain_index[k, s, v] == pytest.approx(new_agg.domain_scores[domain])
+                assert result.delta[k, s, v] == pytest.approx(new_agg.domain_scores[domain] - agg.domain_scores[domain])
+                assert list(type(new_cls[domain].level)).index(new_cls[domain].level) == result.level[k, s, v]
+                assert list(type(new_decision.overall)).index(new_decision.overall) == result.overall[k, s, v]
+
+
+def test_flips_lists_level_changes_only():
+    d = Defaults()
+    ids = list(INDICATOR_LIBRARY)
+    result = sensitivity({i: "yes" for i in ids}, {}, {}, {}, {}, d.low_threshold, d.high_threshold)
+    flips = result.flips()
+    assert flips
+    assert len(flips) == int(result.level_changed.sum())
+    assert np.all(np.isnan(result.delta[~result.admissible]))
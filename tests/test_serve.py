@@ -0,0 +1,171 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+
+from praf.config.defaults import Defaults
+from praf.domain import INDICATOR_LIBRARY, Activity, ProjectStage
+from praf.domain.activities import Context
+from praf.domain.risk_patterns import RiskPattern, UserRisk, suggest_pattern_from_text
+from praf.engine.guidance import generate_guidance
+from praf.cli.serve import MicroBatcher, ScoringService
+from praf.io.loaders import load_assessment
+from praf.io.reports import build_report
+
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "data" / "examples" / "example_inputs.json"
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    data = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    return int(status_line.split()[1]), json.loads(data)
+
+
+def _assessments(n, seed=3):
+    rng = np.random.default_rng(seed)
+    activities, stages = list(Activity), list(ProjectStage)
+    return [
+        {
+            "context": {"activity": activities[k % len(activities)].value, "stage": stages[k % len(stages)].value},
+            "responses": {i: str(rng.choice(["yes", "no", "low", "high", "3"])) for i in INDICATOR_LIBRARY},
+            "likelihood": {i: int(rng.integers(1, 6)) for i in INDICATOR_LIBRARY},
+            "impact": {i: int(rng.integers(1, 6)) for i in list(INDICATOR_LIBRARY)[::2]},
+        }
+        for k in range(n)
+    ]
+
+
+def _run(scenario, **kwargs):
+    async def main():
+        service = ScoringService(port=0, **kwargs)
+        port = await service.start()
+        try:
+            return await scenario(service, port)
+        finally:
+            await service.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_scores_are_batched_and_match_reports():
+    payloads = _assessments(24)
+
+    async def scenario(service, port):
+        return await asyncio.gather(*(_request(port, "POST", "/score", p) for p in payloads)), service.stats()
+
+    responses, stats = _run(scenario, max_batch=8, max_wait=0.05)
+    for payload, (status, summary) in zip(payloads, responses):
+        assert status == 200
+        loaded = load_assessment(json.dumps(payload).encode("utf-8"))
+        report = json.loads(json.dumps(build_report(loaded.context, *loaded.sections(), Defaults())))
+        report.pop("audit_trail")
+        assert summary == report
+    score = stats["endpoints"]["/score"]
+    assert score["requests"] == 24 and score["items"] == 24
+    assert score["batches"] < 24 and score["max_batch"] <= 8
+    assert 0 < score["p50_ms"] <= score["p99_ms"]
+
+
+def test_guidance_and_pattern_endpoints_match_the_library():
+    rng = random.Random(5)
+    registers = [
+        [
+            {"risk_id": f"R{g}-{k}", "likelihood": rng.randint(1, 5), "impact": rng.randint(1, 5),
+             "detectability": rng.randint(1, 5), "pattern": rng.choice([p.value for p in RiskPattern] + [None])}
+            for k in range(rng.randint(0, 8))
+        ]
+        for g in range(10)
+    ]
+    stages = list(ProjectStage)
+    texts = ["Single source supplier", "Sensor drift over temperature", "", "nothing to see"]
+
+    async def scenario(service, port):
+        guidance = await asyncio.gather(
+            *(
+                _request(port, "POST", "/guidance", {"context": {"stage": stages[g % len(stages)].value}, "risks": reg})
+                for g, reg in enumerate(registers)
+            )
+        )
+        single = await _request(port, "POST", "/suggest-pattern", {"text": texts[0]})
+        many = await _request(port, "POST", "/suggest-pattern", {"texts": texts})
+        return guidance, single, many
+
+    guidance, single, many = _run(scenario, max_wait=0.02)
+    for g, (reg, (status, got)) in enumerate(zip(registers, guidance)):
+        assert status == 200
+        ctx = Context(Activity.PRODUCT_DESIGN, stages[g % len(stages)])
+        expected = generate_guidance(
+            ctx, [UserRisk(r["risk_id"], "", "", r["likelihood"], r["impact"], r["detectability"],
+                           RiskPattern(r["pattern"]) if r["pattern"] else None) for r in reg]
+        )
+        assert got["overall_gate_guidance"] == expected.overall_gate_guidance.value
+        assert got["rationale"] == expected.rationale
+        assert [(i["risk_id"], i["priority"], i["gate_guidance"], i["why"], i["recommended_actions"]) for i in got["items"]] == [
+            (i.risk_id, i.priority, i.gate_guidance.value, i.why, i.recommended_actions) for i in expected.items
+        ]
+    assert single[1]["pattern"] == suggest_pattern_from_text(texts[0]).value
+    assert [s["pattern"] for s in many[1]["suggestions"]] == [suggest_pattern_from_text(t).value for t in texts]
+
+
+def test_bad_requests_fail_alone():
+    async def scenario(service, port):
+        return await asyncio.gather(
+            _request(port, "POST", "/score", {"context": {"activity": "bogus"}}),
+            _request(port, "POST", "/score", _assessments(1)[0]),
+            _request(port, "POST", "/guidance", {"risks": [{"likelihood": 3}]}),
+            _request(port, "GET", "/score"),
+            _request(port, "GET", "/nope"),
+            _request(port, "POST", "/suggest-pattern", {"texts": ["supplier", 5]}),
+            _request(port, "POST", "/suggest-pattern", {"text": "vendor delay"}),
+        )
+
+    results = _run(scenario, max_wait=0.02)
+    assert [status for status, _ in results] == [400, 200, 400, 405, 404, 400, 200]
+
+
+def test_micro_batcher_respects_max_batch():
+    seen = []
+
+    def double(items):
+        seen.append(len(items))
+        return [2 * x for x in items]
+
+    async def main():
+        batcher = MicroBatcher(double, max_batch=4, max_wait=0.05)
+        try:
+            return await asyncio.gather(*(batcher.submit(x) for x in range(10)))
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(main()) == [2 * x for x in range(10)]
+    assert sum(seen) == 10 and max(seen) <= 4 and len(seen) == 3
+
+
+def test_micro_batcher_isolates_failing_items():
+    def invert(items):
+        return [1 / x for x in items]
+
+    async def main():
+        batcher = MicroBatcher(invert, max_batch=8, max_wait=0.05)
+        try:
+            return await asyncio.gather(*(batcher.submit(x) for x in (1, 0, 4)), return_exceptions=True)
+        finally:
+            await batcher.close()
+
+    one, zero, four = asyncio.run(main())
+    assert (one, four) == (1.0, 0.25) and isinstance(zero, ZeroDivisionError)
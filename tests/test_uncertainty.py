@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from praf.config.defaults import Defaults
+from praf.domain import RiskDomain
+from praf.domain.activities import Activity
+from praf.domain.domains import activity_domain_weights
+from praf.engine.aggregator import aggregate_scores, aggregate_scores_batch
+from praf.engine.classifier import RiskLevel, classify_batch, classify_domains
+from praf.engine.rules import decide
+from praf.engine.scorer import build_batch_inputs, score_indicators, score_indicators_batch
+from praf.engine.uncertainty import Discrete, Triangular, monte_carlo
+
+
+def test_aggregate_batch_matches_scalar_exactly(random_answers):
+    d = Defaults()
+    dw = activity_domain_weights(Activity.MANUFACTURING_SCALE_UP)
+    responses, lid = random_answers(20, 1)
+    batch = aggregate_scores_batch(score_indicators_batch(*build_batch_inputs(responses, lid, lid, lid), dw))
+    levels = classify_batch(batch.domain_scores, d.low_threshold, d.high_threshold)
+
+    for n in range(20):
+        scored = score_indicators(responses[n], lid[n], lid[n], lid[n], dw)
+        agg = aggregate_scores(scored.indicator_details, scored.local_scores)
+        cls = classify_domains(agg.domain_scores, d.low_threshold, d.high_threshold)
+        for j, domain in enumerate(batch.domains):
+            assert batch.domain_scores[n, j] == agg.domain_scores[domain]
+            assert list(RiskLevel)[levels[n, j]] == cls[domain].level
+        for j, category in enumerate(batch.categories):
+            if category in agg.category_scores:
+                assert batch.category_scores[n, j] == agg.category_scores[category]
+            else:
+                assert np.isnan(batch.category_scores[n, j])
+
+
+def test_point_estimates_match_deterministic_pipeline():
+    d = Defaults()
+    responses = {"I008": "yes", "I009": "no"}
+    lid = {"I008": 3, "I009": 3}
+    dw = activity_domain_weights(Activity.SUPPLIER_SELECTION)
+    result = monte_carlo(responses, lid, lid, lid, dw, d.low_threshold, d.high_threshold, n_samples=10, seed=0)
+
+    scored = score_indicators(responses, lid, lid, lid, dw)
+    cls = classify_domains(aggregate_scores(scored.indicator_details, scored.local_scores).domain_scores, 40.0, 70.0)
+    j = result.domains.index(RiskDomain.SUPPLY_CHAIN)
+    assert np.all(result.index_samples[:, j] == cls[RiskDomain.SUPPLY_CHAIN].score)
+    assert result.level_probability(RiskDomain.SUPPLY_CHAIN, cls[RiskDomain.SUPPLY_CHAIN].level) == 1.0
+    assert result.decision_probability(decide(cls).overall) == 1.0
+
+
+def test_distributions_are_seeded_and_probabilities_sum_to_one():
+    d = Defaults()
+    likelihood = {"I008": Triangular(1, 3, 5), "I009": Discrete((0.1, 0.2, 0.4, 0.2, 0.1))}
+    impact = {"I008": Discrete((0, 0, 0, 0.5, 0.5))}
+    args = ({"I008": "yes"}, likelihood, impact, {}, {}, d.low_threshold, d.high_threshold)
+
+    a = monte_carlo(*args, n_samples=5_000, seed=42)
+    b = monte_carlo(*args, n_samples=5_000, seed=42)
+    assert np.array_equal(a.index_samples, b.index_samples)
+
+    j = a.domains.index(RiskDomain.SUPPLY_CHAIN)
+    assert np.ptp(a.index_samples[:, j]) > 0
+    assert a.level_probabilities[j].sum() == pytest.approx(1.0)
+    assert a.decision_probabilities.sum() == pytest.approx(1.0)
+    q = a.quantiles([0.05, 0.5, 0.95])
+    assert q[0, j] <= q[1, j] <= q[2, j]
+
+
+def test_discrete_sampling_frequencies():
+    probs = (0.1, 0.0, 0.6, 0.0, 0.3)
+    result = monte_carlo({}, {"I001": Discrete(probs)}, {}, {}, {}, 40.0, 70.0, n_samples=20_000, seed=3)
+    j = result.domains.index(RiskDomain.DESIGN_MATURITY)
+    values, counts = np.unique(result.index_samples[:, j], return_counts=True)
+    assert len(values) == 3
+    assert counts / counts.sum() == pytest.approx(probs[::2], abs=0.02)
+
+
+def test_invalid_distributions_rejected():
+    with pytest.raises(ValueError):
+        Triangular(4, 2, 5)
+    with pytest.raises(ValueError):
+        Discrete((0.5, 0.5, 0.5, 0, 0))